@@ -1,5 +1,6 @@
 # Apps module
 from .base import App, AppManager, IconMenu
+from .async_manager import AsyncAppManager
 from .clock import ClockApp
 from .settings import SettingsApp
 from .calculator import CalculatorApp
@@ -14,12 +15,13 @@ from .w_brightness import WBrightnessApp
 from .todos import TodoApp
 from .timezone_selector import TimezoneSelectorApp
 from .sysinfo import SystemInfoApp
+from .search import SearchApp
 
 __all__ = [
-    'App', 'AppManager', 'IconMenu',
+    'App', 'AppManager', 'AsyncAppManager', 'IconMenu',
     'ClockApp', 'SettingsApp', 'CalculatorApp', 'CalendarApp',
     'ContactsApp', 'MemosApp', 'GamesApp', 'SetTimeApp', 'MoonPhaseApp',
     'ThemeChooserApp', 'WBrightnessApp', 'TodoApp', 'TimezoneSelectorApp',
-    'SystemInfoApp'
+    'SystemInfoApp', 'SearchApp'
 ]
 
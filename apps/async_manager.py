@@ -0,0 +1,176 @@
+# Async App Manager (uasyncio on the Pico, asyncio in the simulator)
+
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+from apps.base import AppManager
+from core.input import read_key
+
+# Input polling: fast right after a key, slower once the keyboard is idle
+POLL_FAST_MS = 5
+POLL_IDLE_MS = 20
+IDLE_AFTER_MS = 2000
+
+
+class AsyncAppManager(AppManager):
+    """AppManager whose input, rendering and background jobs are tasks
+    
+    Apps are used unchanged (draw, handle_key, tick_ms, invalidate,
+    next_redraw). An app may also define `async def tick(self, ctx)`: it is
+    awaited over and over while the app is on top, and the app is redrawn
+    after each call. Long jobs (WiFi, NTP) go through spawn() and run while
+    the UI keeps responding, as long as they await instead of sleeping.
+    
+    Keys are polled every few ms only while a job or an async tick needs
+    the event loop. Otherwise nothing else can run before the app on top
+    is due, so the input task blocks in hal_input.wait() until a key or
+    that deadline, like AppManager.run(), and the idle loop sleeps.
+    
+    An exception in the input or tick task (a key handler or an async
+    tick failing) ends main() with it, as it would end AppManager.run(),
+    instead of leaving a screen that no longer reacts to keys.
+    """
+    
+    def __init__(self, ctx, home_app):
+        super().__init__(ctx, home_app)
+        self._redraw = None  # events are created in main(), inside the loop
+        self._top_changed = None
+        self._jobs = []
+        self._active = 0  # background jobs running
+        self._running = False
+        self._error = None  # raised by the render task, see _fail()
+    
+    def push(self, app):
+        super().push(app)
+        if self._running:
+            self._top_changed.set()
+    
+    def pop(self):
+        super().pop()
+        if self._running:
+            self._top_changed.set()
+    
+    def wake(self):
+        """Redraw the app on top as soon as possible (safe from any task)"""
+        self.stack[-1].invalidate()
+        if self._running:
+            self._redraw.set()
+    
+    def spawn(self, coro):
+        """Run a coroutine as a background job, redrawing when it ends"""
+        if self._running:
+            self._start(coro)
+        else:
+            self._jobs.append(coro)
+    
+    def _start(self, coro):
+        self._active += 1  # counted now, so the input task stops blocking
+        asyncio.create_task(self._job(coro))
+    
+    async def _job(self, coro):
+        try:
+            await coro
+        except Exception as e:
+            print("Background job error:", e)
+        finally:
+            self._active -= 1  # also when cancelled
+        self.wake()
+    
+    def _can_block(self):
+        """True if no other task needs the loop before the next redraw"""
+        return not self._active and getattr(self.stack[-1], "tick", None) is None
+    
+    def _fail(self, e):
+        """Hand an exception of another task to the render task"""
+        self._error = e
+        self._redraw.set()
+    
+    async def _input(self):
+        try:
+            await self._read_keys()
+        except Exception as e:
+            self._fail(e)
+    
+    async def _read_keys(self):
+        ctx = self.ctx
+        clock = ctx.hal_clock
+        last_key = clock.ticks_ms()
+        while True:
+            blocking = self._can_block()
+            timeout = 0
+            if blocking:
+                timeout = self._timeout(self.stack[-1], clock.ticks_ms())
+            if ctx.hal_input.wait(timeout):
+                app = self.stack[-1]
+                k = read_key(ctx)
+                if k is None:
+                    # Window event rather than a key: redraw so the
+                    # display gets to handle it
+                    app.invalidate()
+                else:
+                    self._key(app, k)
+                    last_key = clock.ticks_ms()
+                self._redraw.set()
+                await asyncio.sleep(0)  # let the render task draw first
+                continue
+            if blocking:
+                await asyncio.sleep(0)  # the app is due: let it draw
+            elif clock.ticks_diff(clock.ticks_ms(), last_key) < IDLE_AFTER_MS:
+                await asyncio.sleep(POLL_FAST_MS / 1000)
+            else:
+                await asyncio.sleep(POLL_IDLE_MS / 1000)
+    
+    async def _render(self):
+        clock = self.ctx.hal_clock
+        while True:
+            if self._error is not None:
+                raise self._error
+            app = self.stack[-1]
+            now = clock.ticks_ms()
+            self._count_wakeup(now)
+            self._flush_store(now)
+            if self._due(app, now):
+                self._draw(app, now)
+                await asyncio.sleep(0)
+                continue
+            timeout = self._timeout(app, clock.ticks_ms())
+            self._redraw.clear()
+            try:
+                await asyncio.wait_for(self._redraw.wait(), timeout / 1000)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _ticks(self):
+        try:
+            await self._run_ticks()
+        except Exception as e:
+            self._fail(e)
+    
+    async def _run_ticks(self):
+        while True:
+            app = self.stack[-1]
+            tick = getattr(app, "tick", None)
+            if tick is None:
+                self._top_changed.clear()
+                await self._top_changed.wait()
+                continue
+            await tick(self.ctx)
+            if app is self.stack[-1]:
+                self.wake()
+    
+    async def main(self):
+        """Start the input, tick and job tasks, then render forever"""
+        self._redraw = asyncio.Event()
+        self._top_changed = asyncio.Event()
+        self._running = True
+        asyncio.create_task(self._input())
+        asyncio.create_task(self._ticks())
+        for coro in self._jobs:
+            self._start(coro)
+        self._jobs = []
+        await self._render()
+    
+    def run(self):
+        asyncio.run(self.main())
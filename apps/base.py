@@ -5,58 +5,178 @@ from core.input import read_key
 
 
 class App:
+    """Base class for apps
+
+    Apps redraw every `tick_ms` and whenever they are invalidated (after a
+    key, when shown, or by calling invalidate() themselves). Apps that set
+    `tick_ms = None` are otherwise only redrawn when the deadline returned
+    by next_redraw() has passed.
+    """
     title = "App"
-    tick_ms = 200  # refresco recomendado
+    tick_ms = 200  # refresco recomendado, None = solo cuando haga falta
+    needs_redraw = True
     
     def draw(self, ctx):
         pass
     
     def handle_key(self, ctx, k):
         return None  # devolver "pop", ("push", nuevaApp), None
+    
+    def invalidate(self):
+        """Ask AppManager to redraw this app on the next loop iteration"""
+        self.needs_redraw = True
+    
+    def next_redraw(self, ctx, now):
+        """ticks_ms deadline of the next periodic redraw (tick_ms = None apps)
+        
+        Called after every draw; None means "only when invalidated".
+        """
+        return None
+
+
+# Longest the main loop sleeps with nothing scheduled
+MAX_SLEEP_MS = 1000
 
 
 class AppManager:
+    """App stack and main loop
+    
+    The loop sleeps in ctx.hal_input.wait() until a key arrives or the app
+    on top is due for a redraw, instead of polling on a fixed interval.
+    """
+    
     def __init__(self, ctx, home_app):
         self.ctx = ctx
         self.stack = [home_app]
         self._last = ctx.hal_clock.ticks_ms()
+        self._deadline = None
+        
+        # Loop statistics (see stats())
+        self.wakeups = 0
+        self.draws = 0
+        self.wakeups_per_sec = 0
+        self._window_start = self._last
+        self._window_wakeups = 0
     
     def push(self, app):
         self.stack.append(app)
+        app.invalidate()
     
     def pop(self):
         if len(self.stack) > 1:
             self.stack.pop()
+            self.stack[-1].invalidate()
+            # Leaving an app writes its pending changes (e.g. settings) now
+            ds = getattr(self.ctx, "ds", None)
+            if ds is not None:
+                ds.flush()
+    
+    def _due(self, app, now):
+        """Whether the app on top has to be drawn now"""
+        clock = self.ctx.hal_clock
+        if app.needs_redraw:
+            return True
+        if app.tick_ms is not None:
+            return clock.ticks_diff(now, self._last) >= app.tick_ms
+        return self._deadline is not None and clock.ticks_diff(now, self._deadline) >= 0
+    
+    def _timeout(self, app, now):
+        """Milliseconds the loop may sleep before the app on top is due"""
+        clock = self.ctx.hal_clock
+        if app.needs_redraw:
+            ms = 0
+        elif app.tick_ms is not None:
+            ms = app.tick_ms - clock.ticks_diff(now, self._last)
+        elif self._deadline is None:
+            ms = MAX_SLEEP_MS
+        else:
+            ms = clock.ticks_diff(self._deadline, now)
+        ds = getattr(self.ctx, "ds", None)
+        flush_at = ds.next_flush() if ds is not None else None
+        if flush_at is not None:
+            ms = min(ms, clock.ticks_diff(flush_at, now))
+        return max(0, min(ms, MAX_SLEEP_MS))
+    
+    def _flush_store(self, now):
+        """Write pending DataStore changes once their quiet period is over"""
+        ds = getattr(self.ctx, "ds", None)
+        if ds is not None:
+            ds.flush_if_due(now)
+    
+    def _count_wakeup(self, now):
+        self.wakeups += 1
+        self._window_wakeups += 1
+        elapsed = self.ctx.hal_clock.ticks_diff(now, self._window_start)
+        if elapsed >= 1000:
+            self.wakeups_per_sec = self._window_wakeups * 1000 // elapsed
+            self._window_start = now
+            self._window_wakeups = 0
+    
+    def stats(self):
+        """Main loop statistics since start (wakeups_per_sec: last second)"""
+        return {
+            "wakeups": self.wakeups,
+            "draws": self.draws,
+            "wakeups_per_sec": self.wakeups_per_sec,
+        }
+    
+    def _draw(self, app, now):
+        """Draw the app on top; False if draw() asked to close it"""
+        ctx = self.ctx
+        app.needs_redraw = False
+        app.draw(ctx)
+        ctx.d.update()
+        self.draws += 1
+        # allow draw() to request closing
+        if getattr(app, "_should_pop", False):
+            try:
+                delattr(app, "_should_pop")
+            except:
+                pass
+            self.pop()
+            return False
+        self._last = now
+        self._deadline = app.next_redraw(ctx, now)
+        return True
+    
+    def _key(self, app, k):
+        """Pass a key to the app on top and apply the returned action"""
+        act = app.handle_key(self.ctx, k)
+        app.invalidate()
+        if act == "pop":
+            self.pop()
+        elif isinstance(act, tuple) and act[0] == "push":
+            self.push(act[1])
     
     def run(self):
         ctx = self.ctx
+        woken = False
         while True:
             app = self.stack[-1]
             now = ctx.hal_clock.ticks_ms()
-            if ctx.hal_clock.ticks_diff(now, self._last) >= app.tick_ms:
-                app.draw(ctx)
-                ctx.d.update()
-                # allow draw() to request closing
-                if getattr(app, "_should_pop", False):
-                    try:
-                        delattr(app, "_should_pop")
-                    except:
-                        pass
-                    self.pop()
-                    continue
-                self._last = now
+            self._count_wakeup(now)
+            self._flush_store(now)
+            if self._due(app, now) and not self._draw(app, now):
+                continue
             k = read_key(ctx)
             if k is not None:
-                act = app.handle_key(ctx, k)
-                if act == "pop":
-                    self.pop()
-                elif isinstance(act, tuple) and act[0] == "push":
-                    self.push(act[1])
-            ctx.hal_clock.sleep_ms(5)
+                woken = False
+                self._key(app, k)
+                continue  # redraw right away, then look for more keys
+            if woken:
+                # Woken by a window event rather than a key: redraw so the
+                # display gets to handle it
+                woken = False
+                app.invalidate()
+                continue
+            timeout = self._timeout(app, ctx.hal_clock.ticks_ms())
+            if timeout:
+                woken = ctx.hal_input.wait(timeout)
 
 
 class IconMenu(App):
     title = "Menu"
+    tick_ms = None  # static, redrawn on keys only
     
     def __init__(self, entries):
         self.entries = entries
@@ -2,11 +2,30 @@
 
 from apps.base import App
 from core.ui import cls, header, use_font
+from hal.bitmap import pack_rows
 
 
 class CalculatorApp(App):
     title = "Calc"
     tick_ms = 100
+    icon = pack_rows([
+        0b0000000000000000,
+        0b0000111111110000,
+        0b0001000000001000,
+        0b0001001111001000,
+        0b0001010000101000,
+        0b0001010000101000,
+        0b0001001111001000,
+        0b0001000000001000,
+        0b0001010101001000,
+        0b0001000000001000,
+        0b0001010101001000,
+        0b0001000000001000,
+        0b0001010101101000,
+        0b0001000000001000,
+        0b0000111111110000,
+        0b0000000000000000,
+    ], 16)
     
     def __init__(self):
         self.expr = ""
@@ -14,31 +33,9 @@ class CalculatorApp(App):
         self.allowed = set("0123456789+-*/(). ")
     
     def draw_icon(self, ctx, x, y, w, h):
-        icon = [
-            0b0000000000000000,
-            0b0000111111110000,
-            0b0001000000001000,
-            0b0001001111001000,
-            0b0001010000101000,
-            0b0001010000101000,
-            0b0001001111001000,
-            0b0001000000001000,
-            0b0001010101001000,
-            0b0001000000001000,
-            0b0001010101001000,
-            0b0001000000001000,
-            0b0001010101101000,
-            0b0001000000001000,
-            0b0000111111110000,
-            0b0000000000000000,
-        ]
         start_x = x + (w - 16) // 2  # center horizontally
         start_y = y + (h - 12) // 2  # center vertically (usually 0 since h=16)
-    
-        for row, bits in enumerate(icon):
-            for col in range(16):
-                if bits & (1 << (15 - col)):  # check if bit is set
-                    ctx.d.pixel(start_x + col, start_y + row)
+        ctx.d.blit_bitmap(start_x, start_y, self.icon, 16, 16)
     
     def draw(self, ctx):
         cls(ctx)
@@ -4,11 +4,30 @@
 import time
 from apps.base import App
 from core.ui import cls, header, use_font
+from hal.bitmap import pack_rows
 
 
 class CalendarApp(App):
     title = "Cal"
     tick_ms = 200
+    icon = pack_rows([
+        0b0111111111111110,
+        0b1111111111111111,
+        0b1111011011011011,
+        0b1111010101001011,
+        0b1111010001010011,
+        0b1100010101011011,
+        0b1111111111111111,
+        0b1000000000000001,
+        0b1001111001111001,
+        0b1001001001001001,
+        0b1000010001111001,
+        0b1000100001001001,
+        0b1001000001001001,
+        0b1001111001111001,
+        0b1000000000000001,
+        0b0111111111111110,
+    ], 16)
     
     def __init__(self):
         tm = time.localtime()
@@ -16,52 +35,48 @@ class CalendarApp(App):
         self.mode = 'calendar'  # 'calendar' or 'day_view'
         self.selected_day = tm[2]  # Currently selected day
         self.scroll_offset = 0
+        self._index = None  # see todo_index()
+        self._index_version = None
     
     def draw_icon(self, ctx, x, y, w, h):
-        icon = [
-            0b0111111111111110,
-            0b1111111111111111,
-            0b1111011011011011,
-            0b1111010101001011,
-            0b1111010001010011,
-            0b1100010101011011,
-            0b1111111111111111,
-            0b1000000000000001,
-            0b1001111001111001,
-            0b1001001001001001,
-            0b1000010001111001,
-            0b1000100001001001,
-            0b1001000001001001,
-            0b1001111001111001,
-            0b1000000000000001,
-            0b0111111111111110,
-        ]
         start_x = x + (w - 16) // 2  # center horizontally
         start_y = y + (h - 12) // 2  # center vertically (usually 0 since h=16)
-    
-        for row, bits in enumerate(icon):
-            for col in range(16):
-                if bits & (1 << (15 - col)):  # check if bit is set
-                    ctx.d.pixel(start_x + col, start_y + row)
+        ctx.d.blit_bitmap(start_x, start_y, self.icon, 16, 16)
 
+    def todo_index(self, ctx):
+        """Todos by due date: {(year, month): {day: [todos, completed]}}
+        
+        Built in one pass over the todos and kept until the collection
+        changes, so drawing a month does not depend on the number of todos.
+        """
+        version = ctx.ds.version('todos')
+        if self._index is None or self._index_version != version:
+            index = {}
+            for todo in ctx.ds.load_todos():
+                due_date = todo.get('due_date')
+                if due_date:
+                    due_time = time.localtime(due_date)
+                    days = index.setdefault((due_time[0], due_time[1]), {})
+                    entry = days.setdefault(due_time[2], [[], 0])
+                    entry[0].append(todo)
+                    if todo.get('completed'):
+                        entry[1] += 1
+            self._index = index
+            self._index_version = version
+        return self._index
+    
+    def month_todos(self, ctx, year, month):
+        """{day: [todos, completed]} for one month"""
+        return self.todo_index(ctx).get((year, month), {})
+    
     def get_todos_for_date(self, ctx, year, month, day):
         """Get todos due on a specific date"""
-        db = ctx.ds.load()
-        todos = db.get('todos', [])
-        
-        matching_todos = []
-        for todo in todos:
-            due_date = todo.get('due_date')
-            if due_date:
-                due_time = time.localtime(due_date)
-                if due_time[0] == year and due_time[1] == month and due_time[2] == day:
-                    matching_todos.append(todo)
-        
-        return matching_todos
+        entry = self.month_todos(ctx, year, month).get(day)
+        return entry[0] if entry else []
     
     def has_todos_on_date(self, ctx, year, month, day):
         """Check if a date has any todos"""
-        return len(self.get_todos_for_date(ctx, year, month, day)) > 0
+        return day in self.month_todos(ctx, year, month)
     
     def draw_calendar(self, ctx):
         """Draw calendar view with todo indicators"""
@@ -93,6 +108,8 @@ class CalendarApp(App):
         today_year, today_month, today_day = tm_now[0], tm_now[1], tm_now[2]
         is_current_month = (self.y == today_year and self.m == today_month)
         
+        month_todos = self.month_todos(ctx, self.y, self.m)
+        
         # Draw each day at fixed tile positions
         day = 1
         day_start_y = 18  # Start higher since no header
@@ -109,7 +126,7 @@ class CalendarApp(App):
                 y = day_start_y + week * row_height
                 
                 # Check if this date has todos
-                has_todos = self.has_todos_on_date(ctx, self.y, self.m, day)
+                has_todos = day in month_todos
                 
                 # Highlight today's date
                 if is_current_month and day == today_day:
@@ -3,18 +3,55 @@
 import time
 import math
 from apps.base import App
-from core.ui import cls, header, use_font, draw_ring, rect_frame
+from core.ui import cls, header, use_font, rect_frame
+from hal.bitmap import pack_rows
+from hal.fonts import text_extent
+from hal.layer import Layer
 
 
 def two(n):
     return "{:02d}".format(n)
 
 
+# Clock face geometry
+FACE_X, FACE_Y = 98, 30
+FACE_R = 28
+
+# Unit vectors for the 60 minute positions, 0 = 12 o'clock
+_COS60 = [math.cos(math.radians(i * 6 - 90)) for i in range(60)]
+_SIN60 = [math.sin(math.radians(i * 6 - 90)) for i in range(60)]
+
+
+def hand_end(r, pos):
+    """End point of a hand of length r at minute position pos (0-59)"""
+    pos %= 60
+    return int(FACE_X + _COS60[pos] * r), int(FACE_Y + _SIN60[pos] * r)
+
+
 class ClockApp(App):
     title = "Reloj"
-    tick_ms = 200
+    tick_ms = None  # redrawn when the seconds change, see next_redraw()
+    icon = pack_rows([
+        0b0000011111100000,
+        0b0001100110011000,
+        0b0010000000000100,
+        0b0100000000001010,
+        0b0100000000010010,
+        0b1000010000100001,
+        0b1000001001000001,
+        0b1100000110000011,
+        0b1100000110000011,
+        0b1000000000000001,
+        0b1000000000000001,
+        0b0100000000000010,
+        0b0100000000000010,
+        0b0010000000000100,
+        0b0001100110011000,
+        0b0000011111100000,
+    ], 16)
     quotes = []
     show_quote_popup = False
+    face = None  # static face Layer, built on first draw
     
     @classmethod
     def load_quotes(cls):
@@ -154,31 +191,9 @@ class ClockApp(App):
         # ctx.d.text(close_text, popup_x + padding + 2, close_y, ctx.W, 1)
     
     def draw_icon(self, ctx, x, y, w, h):
-        icon = [
-            0b0000011111100000,
-            0b0001100110011000,
-            0b0010000000000100,
-            0b0100000000001010,
-            0b0100000000010010,
-            0b1000010000100001,
-            0b1000001001000001,
-            0b1100000110000011,
-            0b1100000110000011,
-            0b1000000000000001,
-            0b1000000000000001,
-            0b0100000000000010,
-            0b0100000000000010,
-            0b0010000000000100,
-            0b0001100110011000,
-            0b0000011111100000,
-        ]
         start_x = x + (w - 16) // 2  # center horizontally
         start_y = y + (h - 12) // 2  # center vertically (usually 0 since h=16)
-    
-        for row, bits in enumerate(icon):
-            for col in range(16):
-                if bits & (1 << (15 - col)):  # check if bit is set
-                    ctx.d.pixel(start_x + col, start_y + row)
+        ctx.d.blit_bitmap(start_x, start_y, self.icon, 16, 16)
     
     def fmt(self, ctx, tm):
         if ctx.settings.get("clock_24h", True):
@@ -193,14 +208,39 @@ class ClockApp(App):
                   "JUL", "AGO", "SEP", "OCT", "NOV", "DIC"]
         return months[m - 1]
     
+    @classmethod
+    def build_face(cls):
+        """Rasterize ring, hour markers and numerals into a 1-bpp layer"""
+        size = 2 * FACE_R + 1
+        face = Layer(size, size)
+        # Layer coordinates: face center at (FACE_R, FACE_R)
+        ox, oy = FACE_X - FACE_R, FACE_Y - FACE_R
+        
+        face.circle(FACE_R, FACE_R, FACE_R)
+        face.set_pen(0)
+        face.circle(FACE_R, FACE_R, FACE_R - 2)
+        face.set_pen(1)
+        
+        for i in range(12):
+            pos = (i + 1) * 5
+            # Cardinal hours (12, 3, 6, 9) get 4px markers, others a dot
+            marker_length = 4 if i in (11, 2, 5, 8) else 0
+            x1, y1 = hand_end(FACE_R, pos)
+            x2, y2 = hand_end(FACE_R - marker_length, pos)
+            face.line(x1 - ox, y1 - oy, x2 - ox, y2 - oy)
+        
+        face.set_font("bitmap6")
+        for i in range(12):
+            x, y = hand_end(FACE_R - 8, (i + 1) * 5)
+            num_str = str(i + 1)
+            # Center the numeral on its spot (measured in the layer's font)
+            text_w, text_h = text_extent(num_str, "bitmap6")
+            face.text(num_str, x - text_w // 2 - ox, y - text_h // 2 - oy, size, 1)
+        return face
+    
     def draw(self, ctx):
         tm = time.localtime()
         cls(ctx)
-        def endpoint(r, ang_deg):
-            rad = math.radians(ang_deg - 90)
-            cx, cy = x_center, y_center
-            return int(cx + math.cos(rad) * r), int(cy + math.sin(rad) * r)
-        
         
         # Time Format: HH:MM:SS
         use_font(ctx, "6")
@@ -214,47 +254,37 @@ class ClockApp(App):
         # Hints at bottom
         use_font(ctx, "6")
         ctx.d.text("k=quote  s=set time", 2, ctx.H - 6, ctx.W, 1)
-        # clock hands
-        h, m, s = tm[3], tm[4], tm[5]
-        ha = (h % 12 + m / 60) * 30
-        ma = m * 6 + s / 10
-        sa = s * 6
 
-        # clock face
-        x_center, y_center = 98, 30
-        radius = 28
-        draw_ring(ctx, x_center, y_center, radius, 2)
-        
-        # Draw hour markers
-        for i in range(12):
-            angle = (i * 30) + 30
-            # Cardinal hours (12, 3, 6, 9) get 3px markers, others get 2px
-            # i=11→12, i=2→3, i=5→6, i=8→9
-            marker_length = 4 if i in (11, 2, 5, 8) else 0
-            x1, y1 = endpoint(radius, angle)
-            x2, y2 = endpoint(radius - marker_length, angle)
-            ctx.d.line(x1, y1, x2, y2)
-        
-        for i in range(12):
-            x, y = endpoint(radius - 8, (i * 30) + 30)
-            num_str = str(i+1)
-            # Center the text: offset by ~half character width and height
-            # Font "6" is about 3-4px wide per digit, 6px tall
-            text_w = len(num_str) * 3  # approximate width
-            text_h = 6
-            ctx.d.text(num_str, x - text_w // 2, y - text_h // 2, ctx.W, 1)
+        # clock face: clear the disc, then composite the cached layer
+        if ClockApp.face is None:
+            ClockApp.face = self.build_face()
+        face = ClockApp.face
+        ctx.d.set_pen(ctx.BG)
+        ctx.d.circle(FACE_X, FACE_Y, FACE_R)
+        ctx.d.set_pen(ctx.INK)
+        ctx.d.blit_bitmap(FACE_X - FACE_R, FACE_Y - FACE_R, face.rows, face.width, face.height)
 
-        x, y = endpoint(14, ha)
-        ctx.d.line(x, y, x_center, y_center)
-        x, y = endpoint(20, ma)
-        ctx.d.line(x, y, x_center, y_center)
-        x, y = endpoint(23, sa)
-        ctx.d.line(x, y, x_center, y_center)
+        # clock hands
+        h, m, s = tm[3], tm[4], tm[5]
+        x, y = hand_end(14, (h % 12) * 5 + m // 12)
+        ctx.d.line(x, y, FACE_X, FACE_Y)
+        x, y = hand_end(20, m)
+        ctx.d.line(x, y, FACE_X, FACE_Y)
+        x, y = hand_end(23, s)
+        ctx.d.line(x, y, FACE_X, FACE_Y)
         
         # Draw quote popup on top if active
         if self.show_quote_popup:
             self.draw_quote_popup(ctx)
     
+    def next_redraw(self, ctx, now):
+        """Redraw right after the next second boundary"""
+        try:
+            ms = (time.time_ns() // 1000000) % 1000
+        except AttributeError:
+            ms = 0  # no sub-second clock, at worst one second late
+        return now + 1001 - ms
+    
     def handle_key(self, ctx, k):
         if k == ord('q'):
             return "pop"
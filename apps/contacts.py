@@ -3,12 +3,32 @@
 import time
 from apps.base import App
 from core.ui import cls, header, use_font
+from core.views import letter_range, table_letters, contact_order
+from hal.bitmap import pack_rows
 from core.input import read_key
 
 
 class ContactsApp(App):
     title = "TEL"
     tick_ms = 200
+    icon = pack_rows([
+        0b0011111111111110,
+        0b0100000000000001,
+        0b0100110000111001,
+        0b0101001101000101,
+        0b0101001000111001,
+        0b0101001100000001,
+        0b0101001001010101,
+        0b0101001100000001,
+        0b0101001001010101,
+        0b0101001100000001,
+        0b0101111001010101,
+        0b0100010000000001,
+        0b0100010000111001,
+        0b0100010000000001,
+        0b0011111111111110,
+        0b0001110000000000,
+    ], 16)
     
     def __init__(self):
         self.current_letter = 'A'
@@ -17,6 +37,8 @@ class ContactsApp(App):
         self.selected_contact = None
         self.edit_field = None  # 'name' or 'phone'
         self.edit_buffer = []
+        self.search = None  # type-ahead prefix (list of chars) while searching
+        self.search_miss = False
         
         # Alphabet bitmap: 128x8 pixels, each letter 4px wide + 1px separator in sprite
         # First column (bit 0) is empty space, letters start at bit 1
@@ -29,85 +51,72 @@ class ContactsApp(App):
             0b01111010010100001001010000100001011010010010000001010100100001001010110100101000010010100100001000100100101001001100001000100000,
             0b01001010010100101001010000100001001010010010000001010010100001001010010100101000001100100100001000100100101111010010001001000000,
             0b01001011110111001110011110100000111010010111101111010010111101001010010111101000000010100101111000100111101111010010001001111000,]
+        
+        # Letters are sliced out of the sprite once and drawn with blit_bitmap
+        self.letter_bitmaps = [self.slice_letter(i) for i in range(26)]
     
     def draw_icon(self, ctx, x, y, w, h):
-        icon = [
-            0b0011111111111110,
-            0b0100000000000001,
-            0b0100110000111001,
-            0b0101001101000101,
-            0b0101001000111001,
-            0b0101001100000001,
-            0b0101001001010101,
-            0b0101001100000001,
-            0b0101001001010101,
-            0b0101001100000001,
-            0b0101111001010101,
-            0b0100010000000001,
-            0b0100010000111001,
-            0b0100010000000001,
-            0b0011111111111110,
-            0b0001110000000000,
-        ]
         start_x = x + (w - 16) // 2
         start_y = y + (h - 12) // 2
-        
-        for row, bits in enumerate(icon):
-            for col in range(16):
-                if bits & (1 << (15 - col)):
-                    ctx.d.pixel(start_x + col, start_y + row)
+        ctx.d.blit_bitmap(start_x, start_y, self.icon, 16, 16)
     
-    def get_contacts_by_letter(self, ctx):
-        """Group contacts alphabetically by first letter"""
-        contacts = ctx.ds.load_contacts()
-        grouped = {}
-        
-        for contact in contacts:
-            name = contact.get('name', '').strip().upper()
-            if not name:
-                continue
-            letter = name[0] if name[0].isalpha() else '#'
-            if letter not in grouped:
-                grouped[letter] = []
-            grouped[letter].append(contact)
-        
-        # Sort contacts within each letter
-        for letter in grouped:
-            grouped[letter].sort(key=lambda c: c.get('name', '').lower())
-        
-        return grouped
+    def letter_range(self, ctx, letter):
+        """(start, end) list positions of the contacts under letter
+        
+        Contacts are sorted by name; DataStore keeps where each letter
+        starts, so a letter is a table lookup and the screen reads only its
+        visible rows with ctx.ds.cursor().
+        """
+        return letter_range(ctx.ds.table('contacts'), letter)
     
-    def draw_letter_from_bitmap(self, ctx, letter_index, x, y, invert=False):
-        """Draw a single letter from the alphabet bitmap"""
+    def get_contact(self, ctx, i):
+        """The stored contact at list position i, ready to change"""
+        return ctx.ds.live('contacts', ctx.ds.cursor('contacts', None, i, 1)[0])
+    
+    def select(self, ctx, i):
+        """Move the selection to list position i"""
+        letter = contact_order(ctx.ds.cursor('contacts', None, i, 1)[0])[:1].upper()
+        start, end = self.letter_range(ctx, letter)
+        if start <= i < end:
+            self.current_letter = letter
+            self.selected_index = i - start
+    
+    def jump_to_prefix(self, ctx):
+        """Select the first contact whose name starts with the search text"""
+        prefix = "".join(self.search).strip().lower()
+        i = ctx.ds.seek('contacts', prefix)
+        self.search_miss = not (i < ctx.ds.count('contacts') and contact_order(
+            ctx.ds.cursor('contacts', None, i, 1)[0]).startswith(prefix))
+        if not self.search_miss:
+            self.select(ctx, i)
+    
+    def slice_letter(self, letter_index):
+        """Cut a single 4x8 letter out of the alphabet bitmap (packed 1-bpp)"""
         # Bitmap is 128 bits wide, letters start at bit 1 (bit 0 is empty space)
         # Each letter is 4 pixels wide + 1 pixel separator = 5 pixels per letter in sprite
         start_bit = 1 + (letter_index * 5)  # Starting position in bitmap
         bitmap_width = 128  # Total bitmap width
         
-        for row in range(8):
-            bitmap_row = self.alphabet_bitmap[row]
+        rows = []
+        for bitmap_row in self.alphabet_bitmap:
+            bits = 0
             for col in range(4):  # Each letter is 4 pixels wide
                 bit_pos = start_bit + col
+                bits <<= 1
                 # Safety check to prevent overflow
-                if bit_pos >= bitmap_width:
-                    continue
-                # Access from MSB (left) to LSB (right)
-                # For a 128-bit number, leftmost bit is at position 127 (when counting from right)
-                if bitmap_row & (1 << (bitmap_width - 1 - bit_pos)):
-                    # Letter pixel is set
-                    if not invert:
-                        # Normal: draw letter in current pen color
-                        ctx.d.pixel(x + col, y + row)
-                    else:
-                        # Inverted: draw letter (will be light on dark background)
-                        pass
-                else:
-                    # Letter pixel is not set (background)
-                    if not invert:
-                        # Normal: don't draw (transparent background)
-                        pass
+                if bit_pos < bitmap_width and bitmap_row & (1 << (bitmap_width - 1 - bit_pos)):
+                    bits |= 1
+            rows.append(bits)
+        return pack_rows(rows, 4)
+    
+    def draw_letter_from_bitmap(self, ctx, letter_index, x, y, invert=False):
+        """Draw a single letter from the alphabet bitmap"""
+        if invert:
+            # Inverted: letter sits on a filled box, leave it blank
+            return
+        ctx.d.blit_bitmap(x, y, self.letter_bitmaps[letter_index], 4, 8)
     
-    def draw_alphabet_bar(self, ctx, grouped):
+    def draw_alphabet_bar(self, ctx, letters_used):
         """Draw alphabet navigation bar at bottom using bitmap with horizontal scrolling"""
         # Single line at y=56 (near bottom of 64px display)
         y = 56
@@ -152,7 +161,7 @@ class ContactsApp(App):
                 #ctx.d.set_pen(ctx.BG)
                 self.draw_letter_from_bitmap(ctx, i, x, y, invert=True)
                 #ctx.d.set_pen(ctx.INK)
-            elif letter in grouped:
+            elif letter in letters_used:
                 # Letter with contacts - draw frame
                 if x - 1 >= 0 and x + 5 <= display_width:
                     ctx.d.rectangle(x - 1, y - 1, 6, 10)
@@ -166,16 +175,21 @@ class ContactsApp(App):
         cls(ctx)
         # No header to save space
         
-        grouped = self.get_contacts_by_letter(ctx)
-        contacts_in_letter = grouped.get(self.current_letter, [])
+        table = ctx.ds.table('contacts')
+        start, end = letter_range(table, self.current_letter)
+        count = end - start
         
         use_font(ctx, "6")
-        # Display current letter and count at top
-        letter_info = "{}: {} contact{}".format(
-            self.current_letter, 
-            len(contacts_in_letter),
-            's' if len(contacts_in_letter) != 1 else ''
-        )
+        if self.search is not None:
+            # Type-ahead search text
+            letter_info = "/{}{}".format("".join(self.search), "  no match" if self.search_miss else "_")
+        else:
+            # Display current letter and count at top
+            letter_info = "{}: {} contact{}".format(
+                self.current_letter, 
+                count,
+                's' if count != 1 else ''
+            )
         ctx.d.text(letter_info, 2, 2, ctx.W, 1)
         
         # Display contacts - limited area to avoid alphabet bar
@@ -184,12 +198,13 @@ class ContactsApp(App):
         max_y = 40  # Stop before help text and alphabet bar (now at y=56)
         
         # Ensure selected index is valid
-        if self.selected_index >= len(contacts_in_letter):
-            self.selected_index = max(0, len(contacts_in_letter) - 1)
+        if self.selected_index >= count:
+            self.selected_index = max(0, count - 1)
         
         # Calculate visible range
         start_idx = max(0, self.selected_index - 1)
-        visible_contacts = contacts_in_letter[start_idx:start_idx + max_visible]
+        visible_contacts = ctx.ds.cursor('contacts', None, start + start_idx,
+                                         min(end - start - start_idx, max_visible))
         
         for i, contact in enumerate(visible_contacts):
             actual_idx = start_idx + i
@@ -221,10 +236,13 @@ class ContactsApp(App):
         
         # Help text above alphabet bar
         use_font(ctx, "6")
-        ctx.d.text("n=new  Enter=view  q=quit", 2, 48, ctx.W, 1)
+        if self.search is not None:
+            ctx.d.text("Enter=view  Esc=cancel", 2, 48, ctx.W, 1)
+        else:
+            ctx.d.text("n=new  /=find  q=quit", 2, 48, ctx.W, 1)
         
         # Draw alphabet bar
-        self.draw_alphabet_bar(ctx, grouped)
+        self.draw_alphabet_bar(ctx, table_letters(table))
     
     def draw_detail(self, ctx):
         """Draw contact detail view"""
@@ -356,15 +374,19 @@ class ContactsApp(App):
     
     def handle_list_key(self, ctx, k):
         """Handle keys in list mode"""
+        if self.search is not None:
+            return self.handle_search_key(ctx, k)
+        
         if k in (ord('q'), 27):
             return "pop"
         
-        grouped = self.get_contacts_by_letter(ctx)
-        contacts_in_letter = grouped.get(self.current_letter, [])
+        table = ctx.ds.table('contacts')
+        start, end = letter_range(table, self.current_letter)
+        count = end - start
         
         # Left/Right: Navigate letters
         if k in (0xB4, ord('h')):  # Left arrow or 'h'
-            letters = sorted([l for l in grouped.keys() if l.isalpha()])
+            letters = table_letters(table)
             if letters:
                 try:
                     idx = letters.index(self.current_letter)
@@ -376,7 +398,7 @@ class ContactsApp(App):
                     self.selected_index = 0
         
         elif k in (0xB7, ord('l')):  # Right arrow or 'l'
-            letters = sorted([l for l in grouped.keys() if l.isalpha()])
+            letters = table_letters(table)
             if letters:
                 try:
                     idx = letters.index(self.current_letter)
@@ -389,19 +411,24 @@ class ContactsApp(App):
         
         # Up/Down: Navigate contacts
         elif k in (0xB5, ord('k')):  # Up arrow or 'k'
-            if contacts_in_letter:
+            if count:
                 self.selected_index = max(0, self.selected_index - 1)
         
         elif k in (0xB6, ord('j')):  # Down arrow or 'j'
-            if contacts_in_letter:
-                self.selected_index = min(len(contacts_in_letter) - 1, self.selected_index + 1)
+            if count:
+                self.selected_index = min(count - 1, self.selected_index + 1)
         
         # Enter: View details
         elif k == 13:
-            if contacts_in_letter and self.selected_index < len(contacts_in_letter):
-                self.selected_contact = contacts_in_letter[self.selected_index]
+            if count and self.selected_index < count:
+                self.selected_contact = self.get_contact(ctx, start + self.selected_index)
                 self.mode = 'detail'
         
+        # /: Type-ahead search
+        elif k == ord('/'):
+            self.search = []
+            self.search_miss = False
+        
         # N: New contact
         elif k in (ord('n'), ord('N')):
             self.mode = 'new'
@@ -412,6 +439,27 @@ class ContactsApp(App):
         
         return None
     
+    def handle_search_key(self, ctx, k):
+        """Handle keys while typing a search prefix"""
+        if k == 27:  # Esc - stop searching
+            self.search = None
+        
+        elif k == 13:  # Enter - view the match
+            self.search = None
+            if not self.search_miss:
+                return self.handle_list_key(ctx, 13)
+        
+        elif k in (8, 127):  # Backspace
+            if self.search:
+                self.search.pop()
+                self.jump_to_prefix(ctx)
+        
+        elif 32 <= k < 127 and len(self.search) < 24:
+            self.search.append(chr(k))
+            self.jump_to_prefix(ctx)
+        
+        return None
+    
     def handle_detail_key(self, ctx, k):
         """Handle keys in detail mode"""
         if k in (ord('q'), 27):  # Back to list
@@ -423,14 +471,7 @@ class ContactsApp(App):
             self.edit_field = None
         
         elif k in (ord('d'), ord('D')) and self.selected_contact:  # Delete
-            contacts = ctx.ds.load_contacts()
-            # Find and remove the contact
-            for i, c in enumerate(contacts):
-                if (c.get('name') == self.selected_contact.get('name') and 
-                    c.get('phone') == self.selected_contact.get('phone')):
-                    contacts.pop(i)
-                    break
-            ctx.ds.save_contacts(contacts)
+            ctx.ds.remove_record('contacts', self.selected_contact)
             self.mode = 'list'
             self.selected_contact = None
         
@@ -441,19 +482,9 @@ class ContactsApp(App):
         if self.edit_field and self.selected_contact:
             # Editing a field
             if k == 13:  # Enter - save
-                if self.edit_field == 'name':
-                    self.selected_contact['name'] = "".join(self.edit_buffer).strip()
-                elif self.edit_field == 'phone':
-                    self.selected_contact['phone'] = "".join(self.edit_buffer).strip()
-                
-                # Save to storage
-                contacts = ctx.ds.load_contacts()
-                # Find the original contact and update it
-                for i, c in enumerate(contacts):
-                    if id(c) == id(self.selected_contact):
-                        contacts[i] = self.selected_contact
-                        break
-                ctx.ds.save_contacts(contacts)
+                # Save to storage (keeps the name index in order)
+                ctx.ds.update_record('contacts', self.selected_contact,
+                                     {self.edit_field: "".join(self.edit_buffer).strip()})
                 
                 self.edit_field = None
                 self.edit_buffer = []
@@ -505,18 +536,15 @@ class ContactsApp(App):
                 elif self.edit_field == 'phone':
                     self._new_phone = "".join(self.edit_buffer).strip()
                     # Save new contact
-                    contacts = ctx.ds.load_contacts()
-                    contacts.append({"name": self._new_name, "phone": self._new_phone})
-                    ctx.ds.save_contacts(contacts)
+                    contact = {"name": self._new_name, "phone": self._new_phone}
+                    ctx.ds.add_record('contacts', contact)
                     
                     # Return to list
                     self.mode = 'list'
                     self.edit_field = None
                     self.edit_buffer = []
-                    # Jump to the letter of new contact
-                    if self._new_name:
-                        self.current_letter = self._new_name[0].upper()
-                        self.selected_index = 0
+                    # Select the new contact
+                    self.select(ctx, ctx.ds.view('contacts').index(contact))
             
             elif k == 27:  # Esc - cancel
                 self.mode = 'list'
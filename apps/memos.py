@@ -3,12 +3,36 @@
 import time
 from apps.base import App
 from core.ui import cls, header, use_font
+from hal.bitmap import pack_rows
 from core.input import read_key
+from core import textpack
+
+# Long texts are stored compressed (core/textpack.py). Firmware without a
+# deflate compressor keeps the old limit, as memos then stay plain.
+MAX_CHARS = 2048 if textpack.available() else 256
 
 
 class MemosApp(App):
     title = "Memos"
     tick_ms = 200
+    icon = pack_rows([
+        0b0000001100000000,
+        0b0000010010000000,
+        0b0000100001000000,
+        0b0001001000100000,
+        0b0010010100010000,
+        0b0100001000001000,
+        0b1000010011000100,
+        0b1000101100100010,
+        0b0100001010010001,
+        0b0010111111111010,
+        0b0001001011001111,
+        0b0000100100001111,
+        0b0000010011111111,
+        0b0000001000101111,
+        0b0000000101000000,
+        0b0000000010000000,
+    ], 16)
     
     def __init__(self):
         self.mode = 'list'  # 'list', 'view', 'edit', 'new'
@@ -16,9 +40,12 @@ class MemosApp(App):
         self.selected_memo = None
         self.edit_buffer = []
         self.scroll_offset = 0
+        self._lines_of = None  # memo the wrapped lines below belong to
+        self._text = ''
+        self._lines = []
         
         # Memo bullet icon (16x16)
-        self.memo_bullet = [
+        self.memo_bullet = pack_rows([
             0b0000000000000000,
             0b0000101010100000,
             0b0011111111111100,
@@ -35,76 +62,49 @@ class MemosApp(App):
             0b0010000000001100,
             0b0011111111111000,
             0b0000000000000000,
-        ]
+        ], 16)
     
     def draw_icon(self, ctx, x, y, w, h):
-        icon = [
-            0b0000001100000000,
-            0b0000010010000000,
-            0b0000100001000000,
-            0b0001001000100000,
-            0b0010010100010000,
-            0b0100001000001000,
-            0b1000010011000100,
-            0b1000101100100010,
-            0b0100001010010001,
-            0b0010111111111010,
-            0b0001001011001111,
-            0b0000100100001111,
-            0b0000010011111111,
-            0b0000001000101111,
-            0b0000000101000000,
-            0b0000000010000000,
-        ]
         start_x = x + (w - 16) // 2
         start_y = y + (h - 12) // 2
+        ctx.d.blit_bitmap(start_x, start_y, self.icon, 16, 16)
+    
+    def get_memo(self, ctx, i):
+        """The stored memo at list position i (newest first), ready to change
         
-        for row, bits in enumerate(icon):
-            for col in range(16):
-                if bits & (1 << (15 - col)):
-                    ctx.d.pixel(start_x + col, start_y + row)
+        The list screen reads only its visible rows with ctx.ds.cursor().
+        """
+        return ctx.ds.live('memos', ctx.ds.cursor('memos', None, i, 1)[0])
     
-    def get_sorted_memos(self, ctx):
-        """Get memos sorted by creation date (newest first)"""
-        memos = ctx.ds.load_memos()
-        
-        # Migrate old format to new format
-        migrated = []
-        for m in memos:
-            # Handle old formats
-            if isinstance(m, str):
-                # Old format: just a string
-                migrated.append({
-                    'text': m,
-                    'timestamp': 0  # Unknown date
-                })
-            elif isinstance(m, dict):
-                if 'text' not in m and 'title' in m:
-                    # Old format: title + text
-                    migrated.append({
-                        'text': m.get('title', '') + ': ' + m.get('text', ''),
-                        'timestamp': 0
-                    })
-                elif 'timestamp' not in m:
-                    # Old format: dict without timestamp
-                    migrated.append({
-                        'text': m.get('text', str(m)),
-                        'timestamp': 0
-                    })
-                else:
-                    # New format: already has timestamp
-                    migrated.append(m)
-            else:
-                # Unknown format, convert to string
-                migrated.append({
-                    'text': str(m),
-                    'timestamp': 0
-                })
+    def memo_lines(self):
+        """(text, wrapped lines) of the selected memo
+        
+        A compressed text is inflated once, when the memo is opened, not
+        on every frame.
+        """
+        if self._lines_of is not self.selected_memo:
+            self._text = textpack.text(self.selected_memo)
+            self._lines = self.wrap(self._text)
+            self._lines_of = self.selected_memo
+        return self._text, self._lines
+    
+    def wrap(self, text, chars_per_line=20):
+        """Word-wrapped lines of text"""
+        words = text.split(' ')
+        lines = []
+        current_line = ''
         
-        # Sort by timestamp, newest first (0 timestamp goes to end)
-        migrated.sort(key=lambda m: m.get('timestamp', 0) if m.get('timestamp', 0) != 0 else -float('inf'), reverse=True)
+        for word in words:
+            if len(current_line) + len(word) + 1 <= chars_per_line:
+                current_line += (' ' if current_line else '') + word
+            else:
+                if current_line:
+                    lines.append(current_line)
+                current_line = word
         
-        return migrated
+        if current_line:
+            lines.append(current_line)
+        return lines
     
     def format_date(self, timestamp):
         """Format timestamp to readable date"""
@@ -117,32 +117,29 @@ class MemosApp(App):
     
     def draw_memo_bullet(self, ctx, x, y):
         """Draw the memo bullet icon at given position"""
-        for row, bits in enumerate(self.memo_bullet):
-            for col in range(16):
-                if bits & (1 << (15 - col)):
-                    ctx.d.pixel(x + col, y + row)
+        ctx.d.blit_bitmap(x, y, self.memo_bullet, 16, 16)
     
     def draw_list(self, ctx):
         """Draw memos list view"""
         cls(ctx)
         # No header to save space
         
-        memos = self.get_sorted_memos(ctx)
+        count = ctx.ds.count('memos')
         
         use_font(ctx, "6")
-        if not memos:
+        if not count:
             ctx.d.text("No memos yet", 2, 8, ctx.W, 1)
             ctx.d.text("Press 'n' to create one", 2, 16, ctx.W, 1)
         else:
             # Ensure valid selection
-            if self.selected_index >= len(memos):
-                self.selected_index = max(0, len(memos) - 1)
+            if self.selected_index >= count:
+                self.selected_index = max(0, count - 1)
             
             # Display memos (3 visible at a time)
             # Limit rendering area to prevent overlap with help text
             max_visible = 3
             start_idx = max(0, self.selected_index - 1)
-            visible_memos = memos[start_idx:start_idx + max_visible]
+            visible_memos = ctx.ds.cursor('memos', None, start_idx, max_visible)
             
             y = 2
             max_y = 55  # Limit rendering to leave space for help text
@@ -154,7 +151,7 @@ class MemosApp(App):
                 if y + 14 > max_y:
                     break
                 
-                text = memo.get('text', '')
+                text = textpack.preview(memo)
                 date = self.format_date(memo.get('timestamp', 0))
                 
                 # Preview: first 16 chars (reduced to make room for icon)
@@ -190,7 +187,7 @@ class MemosApp(App):
         cls(ctx)
         header(ctx, "View Memo")
         
-        text = self.selected_memo.get('text', '')
+        text, lines = self.memo_lines()
         date = self.format_date(self.selected_memo.get('timestamp', 0))
         
         use_font(ctx, "6")
@@ -200,25 +197,8 @@ class MemosApp(App):
         # Show text with scrolling
         y = 20
         line_height = 7
-        chars_per_line = 20
         max_lines = 4
         
-        # Word wrap text
-        words = text.split(' ')
-        lines = []
-        current_line = ''
-        
-        for word in words:
-            if len(current_line) + len(word) + 1 <= chars_per_line:
-                current_line += (' ' if current_line else '') + word
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-        
-        if current_line:
-            lines.append(current_line)
-        
         # Display visible lines with scroll
         visible_lines = lines[self.scroll_offset:self.scroll_offset + max_lines]
         for line in visible_lines:
@@ -232,7 +212,7 @@ class MemosApp(App):
             ctx.d.text("[{}/{}]".format(current_page, total_pages), ctx.W - 30, y + 2, ctx.W, 1)
         
         # Character count
-        char_info = "{}/256 chars".format(len(text))
+        char_info = "{}/{} chars".format(len(text), MAX_CHARS)
         ctx.d.text(char_info, 2, ctx.H - 14, ctx.W, 1)
         
         # Help
@@ -286,12 +266,12 @@ class MemosApp(App):
         
         # Character count with limit indicator
         char_count = len(text)
-        if char_count >= 256:
+        if char_count >= MAX_CHARS:
             ctx.d.set_pen(ctx.INK)
             ctx.d.rectangle(0, ctx.H - 15, ctx.W, 8)
             ctx.d.set_pen(ctx.BG)
         
-        char_info = "{}/256 chars".format(char_count)
+        char_info = "{}/{} chars".format(char_count, MAX_CHARS)
         ctx.d.text(char_info, 2, ctx.H - 14, ctx.W, 1)
         ctx.d.set_pen(ctx.INK)
         
@@ -347,12 +327,12 @@ class MemosApp(App):
         
         # Character count
         char_count = len(text)
-        if char_count >= 256:
+        if char_count >= MAX_CHARS:
             ctx.d.set_pen(ctx.INK)
             ctx.d.rectangle(0, ctx.H - 15, ctx.W, 8)
             ctx.d.set_pen(ctx.BG)
         
-        char_info = "{}/256 chars".format(char_count)
+        char_info = "{}/{} chars".format(char_count, MAX_CHARS)
         ctx.d.text(char_info, 2, ctx.H - 14, ctx.W, 1)
         ctx.d.set_pen(ctx.INK)
         
@@ -384,21 +364,21 @@ class MemosApp(App):
         if k in (ord('q'), 27):
             return "pop"
         
-        memos = self.get_sorted_memos(ctx)
+        count = ctx.ds.count('memos')
         
         # Up/Down: Navigate memos
         if k in (0xB5, ord('k')):  # Up
-            if memos:
+            if count:
                 self.selected_index = max(0, self.selected_index - 1)
         
         elif k in (0xB6, ord('j')):  # Down
-            if memos:
-                self.selected_index = min(len(memos) - 1, self.selected_index + 1)
+            if count:
+                self.selected_index = min(count - 1, self.selected_index + 1)
         
         # Enter: View memo
         elif k == 13:
-            if memos and self.selected_index < len(memos):
-                self.selected_memo = memos[self.selected_index]
+            if self.selected_index < count:
+                self.selected_memo = self.get_memo(ctx, self.selected_index)
                 self.mode = 'view'
                 self.scroll_offset = 0
         
@@ -419,40 +399,19 @@ class MemosApp(App):
         
         elif k in (ord('e'), ord('E')) and self.selected_memo:  # Edit
             self.mode = 'edit'
-            self.edit_buffer = list(self.selected_memo.get('text', ''))
+            self.edit_buffer = list(self.memo_lines()[0])
             self.scroll_offset = 0
         
         elif k in (ord('d'), ord('D')) and self.selected_memo:  # Delete
-            memos = ctx.ds.load_memos()
-            # Find and remove the memo
-            for i, m in enumerate(memos):
-                if (m.get('text') == self.selected_memo.get('text') and 
-                    m.get('timestamp') == self.selected_memo.get('timestamp')):
-                    memos.pop(i)
-                    break
-            ctx.ds.save_memos(memos)
+            ctx.ds.remove_record('memos', self.selected_memo)
             self.mode = 'list'
             self.selected_memo = None
             self.scroll_offset = 0
         
         # Scroll
         elif k in (0xB6, ord('j')) and self.selected_memo:  # Down
-            text = self.selected_memo.get('text', '')
-            chars_per_line = 20
+            lines = self.memo_lines()[1]
             max_lines = 4
-            words = text.split(' ')
-            lines = []
-            current_line = ''
-            for word in words:
-                if len(current_line) + len(word) + 1 <= chars_per_line:
-                    current_line += (' ' if current_line else '') + word
-                else:
-                    if current_line:
-                        lines.append(current_line)
-                    current_line = word
-            if current_line:
-                lines.append(current_line)
-            
             max_scroll = max(0, len(lines) - max_lines)
             self.scroll_offset = min(self.scroll_offset + 1, max_scroll)
         
@@ -466,16 +425,9 @@ class MemosApp(App):
         if k == 13:  # Enter - save
             new_text = "".join(self.edit_buffer).strip()
             if new_text and self.selected_memo:
-                self.selected_memo['text'] = new_text
                 # Don't update timestamp on edit, keep original
-                
-                # Save to storage
-                memos = ctx.ds.load_memos()
-                for i, m in enumerate(memos):
-                    if id(m) == id(self.selected_memo):
-                        memos[i] = self.selected_memo
-                        break
-                ctx.ds.save_memos(memos)
+                ctx.ds.update_record('memos', self.selected_memo, {'text': new_text})
+                self._lines_of = None
             
             self.mode = 'view'
             self.edit_buffer = []
@@ -497,8 +449,8 @@ class MemosApp(App):
                     self.scroll_offset = max(0, self.scroll_offset - 1)
         
         else:
-            # Add character (limit to 256)
-            if len(self.edit_buffer) < 256:
+            # Add character (up to MAX_CHARS)
+            if len(self.edit_buffer) < MAX_CHARS:
                 try:
                     ch = chr(k)
                     if ch:
@@ -520,12 +472,10 @@ class MemosApp(App):
         if k == 13:  # Enter - save
             new_text = "".join(self.edit_buffer).strip()
             if new_text:
-                memos = ctx.ds.load_memos()
-                memos.append({
+                ctx.ds.add_record('memos', {
                     "text": new_text,
                     "timestamp": time.time()
                 })
-                ctx.ds.save_memos(memos)
             
             self.mode = 'list'
             self.edit_buffer = []
@@ -548,8 +498,8 @@ class MemosApp(App):
                     self.scroll_offset = max(0, self.scroll_offset - 1)
         
         else:
-            # Add character (limit to 256)
-            if len(self.edit_buffer) < 256:
+            # Add character (up to MAX_CHARS)
+            if len(self.edit_buffer) < MAX_CHARS:
                 try:
                     ch = chr(k)
                     if ch:
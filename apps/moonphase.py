@@ -3,11 +3,30 @@
 import time
 from apps.base import App
 from core.ui import cls, header, use_font
+from hal.bitmap import pack_rows
 
 
 class MoonPhaseApp(App):
     title = "Moon"
-    tick_ms = 1000  # update every second
+    tick_ms = None  # redrawn on keys, plus once a minute for the date
+    icon = pack_rows([
+        0b0000000000000000,
+        0b0000011111100000,
+        0b0000111100010000,
+        0b0001111110001000,
+        0b0011111111000100,
+        0b0111111111000010,
+        0b0111101111100010,
+        0b0111111111100010,
+        0b0111011011100010,
+        0b0111111111100010,
+        0b0111101111100010,
+        0b0011111111000100,
+        0b0011111111001000,
+        0b0001111110010000,
+        0b0000111111100000,
+        0b0000000000000000,
+    ], 16)
     
     def __init__(self):
         self.day_offset = 0  # Days offset from today (negative = past, positive = future)
@@ -23,7 +42,7 @@ class MoonPhaseApp(App):
         ]
         
         # Custom 32x32 pixel art moon phase icons
-        self.new_moon_icon = [
+        self.new_moon_icon = pack_rows([
             0b00000000000000000000000000000000,
             0b00000000000000000000000000000000,
             0b00000000001111111111110000000000,
@@ -56,8 +75,8 @@ class MoonPhaseApp(App):
             0b00000000001111111111110000000000,
             0b00000000000000000000000000000000,
             0b00000000000000000000000000000000,
-        ]
-        self.waxing_crescent_icon = [
+        ], 32)
+        self.waxing_crescent_icon = pack_rows([
             0b00000000000000000000000000000000,
             0b00000000000000000000000000000000,
             0b00000000001111111111110000000000,
@@ -90,7 +109,7 @@ class MoonPhaseApp(App):
             0b00000000001111111111110000000000,
             0b00000000000000000000000000000000,
             0b00000000000000000000000000000000,
-        ]
+        ], 32)
         
         # Placeholder icons (reuse existing ones until you create them)
         # TODO: Create custom icons for these phases
@@ -114,31 +133,9 @@ class MoonPhaseApp(App):
         ]
     
     def draw_icon(self, ctx, x, y, w, h):
-        icon = [
-            0b0000000000000000,
-            0b0000011111100000,
-            0b0000111100010000,
-            0b0001111110001000,
-            0b0011111111000100,
-            0b0111111111000010,
-            0b0111101111100010,
-            0b0111111111100010,
-            0b0111011011100010,
-            0b0111111111100010,
-            0b0111101111100010,
-            0b0011111111000100,
-            0b0011111111001000,
-            0b0001111110010000,
-            0b0000111111100000,
-            0b0000000000000000,
-        ]
         start_x = x + (w - 16) // 2
         start_y = y + (h - 12) // 2
-        
-        for row, bits in enumerate(icon):
-            for col in range(16):
-                if bits & (1 << (15 - col)):
-                    ctx.d.pixel(start_x + col, start_y + row)
+        ctx.d.blit_bitmap(start_x, start_y, self.icon, 16, 16)
     
     def calculate_moon_phase(self, day_offset=0):
         """Calculate moon phase for a given day offset (0.0 = new moon, 0.5 = full moon, 1.0 = new moon)"""
@@ -225,11 +222,7 @@ class MoonPhaseApp(App):
         moon_icon = self.moon_icons[phase_idx]
         icon_x = ctx.W - 38  # Position icon on the right side (6px from right edge)
         icon_y = 16
-        
-        for row, bits in enumerate(moon_icon):
-            for col in range(32):
-                if bits & (1 << (31 - col)):
-                    ctx.d.pixel(icon_x + col, icon_y + row)
+        ctx.d.blit_bitmap(icon_x, icon_y, moon_icon, 32, 32)
         
         # Display phase name on the left side
         use_font(ctx, "8")
@@ -251,6 +244,9 @@ class MoonPhaseApp(App):
         use_font(ctx, "6")
         ctx.d.text("< > nav  q=quit", 2, ctx.H - 6, ctx.W, 1)
     
+    def next_redraw(self, ctx, now):
+        return now + 60000
+    
     def handle_key(self, ctx, k):
         if k in (ord('q'), 27):  # q or ESC
             return "pop"
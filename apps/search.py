@@ -0,0 +1,142 @@
+# Search App
+
+from apps.base import App
+from apps.todos import TodoApp
+from apps.memos import MemosApp
+from apps.contacts import ContactsApp
+from core.ui import cls, use_font
+from core import textpack
+from hal.bitmap import pack_rows
+
+
+class SearchApp(App):
+    title = "Find"
+    tick_ms = 200
+    icon = pack_rows([
+        0b0000000000000000,
+        0b0000111100000000,
+        0b0011000011000000,
+        0b0010000001000000,
+        0b0100000000100000,
+        0b0100000000100000,
+        0b0100000000100000,
+        0b0100000000100000,
+        0b0010000001000000,
+        0b0011000011100000,
+        0b0000111100110000,
+        0b0000000000011000,
+        0b0000000000001100,
+        0b0000000000000110,
+        0b0000000000000010,
+        0b0000000000000000,
+    ], 16)
+    
+    KINDS = {"todos": "Todo", "memos": "Memo", "contacts": "Tel"}
+    
+    def __init__(self):
+        self.query = []
+        self.results = []  # [(collection, record)], newest first
+        self.selected_index = 0
+        self._stamp = None  # collection versions the results were found at
+    
+    def draw_icon(self, ctx, x, y, w, h):
+        start_x = x + (w - 16) // 2
+        start_y = y + (h - 12) // 2
+        ctx.d.blit_bitmap(start_x, start_y, self.icon, 16, 16)
+    
+    def run_query(self, ctx):
+        """Search again for the typed text (DataStore.search, prefix words)"""
+        text = "".join(self.query)
+        self.results = ctx.ds.search(text) if text.strip() else []
+        self.selected_index = min(self.selected_index, max(0, len(self.results) - 1))
+        self._stamp = self.stamp(ctx)
+    
+    def stamp(self, ctx):
+        return (ctx.ds.version('todos'), ctx.ds.version('memos'), ctx.ds.version('contacts'))
+    
+    def preview(self, name, record):
+        """One-line text of a result"""
+        if name == "contacts":
+            return record.get('name', '')
+        return textpack.preview(record)
+    
+    def draw(self, ctx):
+        # Results opened from here may have been edited or deleted
+        if self.query and self._stamp != self.stamp(ctx):
+            self.run_query(ctx)
+        
+        cls(ctx)
+        use_font(ctx, "6")
+        
+        # Query line
+        ctx.d.text("?" + "".join(self.query)[-19:] + "_", 2, 2, ctx.W, 1)
+        
+        if not self.results:
+            msg = "No matches" if self.query else "Type to search"
+            ctx.d.text(msg, 2, 14, ctx.W, 1)
+        else:
+            # 3 results visible, two lines each
+            start_idx = max(0, self.selected_index - 1)
+            y = 11
+            for i, (name, record) in enumerate(self.results[start_idx:start_idx + 3]):
+                text = self.preview(name, record)
+                text = text[:18] + ".." if len(text) > 18 else text
+                if start_idx + i == self.selected_index:
+                    ctx.d.set_pen(ctx.INK)
+                    ctx.d.rectangle(0, y - 1, ctx.W, 15)
+                    ctx.d.set_pen(ctx.BG)
+                ctx.d.text(self.KINDS[name], 2, y, ctx.W, 1)
+                ctx.d.text(text, 2, y + 7, ctx.W, 1)
+                if start_idx + i == self.selected_index:
+                    ctx.d.set_pen(ctx.INK)
+                y += 15
+        
+        ctx.d.text("Enter=open  Esc=back", 2, 57, ctx.W, 1)
+    
+    def open_result(self, name, record):
+        """The app showing one search result"""
+        if name == "todos":
+            app = TodoApp()
+            app.selected_todo = record
+            app.mode = 'view'
+        elif name == "memos":
+            app = MemosApp()
+            app.selected_memo = record
+            app.mode = 'view'
+        else:
+            app = ContactsApp()
+            app.selected_contact = record
+            app.mode = 'detail'
+        return app
+    
+    def handle_key(self, ctx, k):
+        if k == 27:  # Esc: clear the query, or leave
+            if not self.query:
+                return "pop"
+            self.query = []
+            self.selected_index = 0
+            self.run_query(ctx)
+        
+        elif k == 0xB5:  # Up
+            self.selected_index = max(0, self.selected_index - 1)
+        
+        elif k == 0xB6:  # Down
+            self.selected_index = min(max(0, len(self.results) - 1), self.selected_index + 1)
+        
+        elif k == 13:  # Enter: open the selected result
+            if self.results:
+                name, record = self.results[self.selected_index]
+                return ("push", self.open_result(name, record))
+        
+        elif k in (8, 127):  # Backspace
+            if self.query:
+                self.query.pop()
+                self.selected_index = 0
+                self.run_query(ctx)
+        
+        elif 32 <= k < 127 and len(self.query) < 32:
+            self.query.append(chr(k))
+            self.selected_index = 0
+            self.run_query(ctx)
+        
+        return None
@@ -3,6 +3,7 @@
 
 from apps.base import App
 from core.ui import cls, header
+from hal.bitmap import pack_rows
 from core.context import THEMES
 from apps.theme_chooser import ThemeChooserApp
 from apps.w_brightness import WBrightnessApp
@@ -13,6 +14,24 @@ from apps.sysinfo import SystemInfoApp
 class SettingsApp(App):
     title = "Config"
     tick_ms = 300
+    icon = pack_rows([
+        0b0000001111000000,
+        0b0001101001011000,
+        0b0010011001100100,
+        0b0100000000000010,
+        0b0100000000000010,
+        0b0010000000000100,
+        0b1110000110000111,
+        0b1000001001000001,
+        0b1000001001000001,
+        0b1110000110000111,
+        0b0010000000000100,
+        0b0100000000000010,
+        0b0100000000000010,
+        0b0010011001100100,
+        0b0001101001011000,
+        0b0000001111000000,
+    ], 16)
     
     def __init__(self):
         self.idx = 0
@@ -21,31 +40,9 @@ class SettingsApp(App):
         self.tidx = 0
     
     def draw_icon(self, ctx, x,y,w,h):
-        icon = [
-            0b0000001111000000,
-            0b0001101001011000,
-            0b0010011001100100,
-            0b0100000000000010,
-            0b0100000000000010,
-            0b0010000000000100,
-            0b1110000110000111,
-            0b1000001001000001,
-            0b1000001001000001,
-            0b1110000110000111,
-            0b0010000000000100,
-            0b0100000000000010,
-            0b0100000000000010,
-            0b0010011001100100,
-            0b0001101001011000,
-            0b0000001111000000,
-        ]
         start_x = x + (w - 16) // 2  # center horizontally
         start_y = y + (h - 12) // 2  # center vertically (usually 0 since h=16)
-    
-        for row, bits in enumerate(icon):
-            for col in range(16):
-                if bits & (1 << (15 - col)):  # check if bit is set
-                    ctx.d.pixel(start_x + col, start_y + row)
+        ctx.d.blit_bitmap(start_x, start_y, self.icon, 16, 16)
     
     def draw(self, ctx):
         cls(ctx); header(ctx,"Config")
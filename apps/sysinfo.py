@@ -2,6 +2,7 @@
 
 from apps.base import App
 from core.ui import cls, header
+from hal.bitmap import pack_rows
 
 try:
     import gc
@@ -21,6 +22,24 @@ class SystemInfoApp(App):
     
     title = "Sys Info"
     tick_ms = 1000  # Update every second
+    icon = pack_rows([
+        0b0000111111110000,
+        0b0001000000001000,
+        0b1101000000001011,
+        0b0101111111101010,
+        0b0101000000101010,
+        0b0101011110101010,
+        0b0101010010101010,
+        0b0101011110101010,
+        0b0101000000101010,
+        0b0101111111101010,
+        0b1101000000001011,
+        0b0001000000001000,
+        0b0000111111110000,
+        0b0000000000000000,
+        0b0000000000000000,
+        0b0000000000000000,
+    ], 16)
     
     def __init__(self):
         self.auto_collect = True  # Enable by default to prevent saw-tooth pattern
@@ -29,31 +48,9 @@ class SystemInfoApp(App):
     
     def draw_icon(self, ctx, x, y, w, h):
         """Draw a chip/processor icon"""
-        icon = [
-            0b0000111111110000,
-            0b0001000000001000,
-            0b1101000000001011,
-            0b0101111111101010,
-            0b0101000000101010,
-            0b0101011110101010,
-            0b0101010010101010,
-            0b0101011110101010,
-            0b0101000000101010,
-            0b0101111111101010,
-            0b1101000000001011,
-            0b0001000000001000,
-            0b0000111111110000,
-            0b0000000000000000,
-            0b0000000000000000,
-            0b0000000000000000,
-        ]
         start_x = x + (w - 16) // 2
         start_y = y + (h - 16) // 2
-        
-        for row, bits in enumerate(icon):
-            for col in range(16):
-                if bits & (1 << (15 - col)):
-                    ctx.d.pixel(start_x + col, start_y + row)
+        ctx.d.blit_bitmap(start_x, start_y, self.icon, 16, 16)
     
     def draw(self, ctx):
         # ALWAYS collect at start of draw for accurate readings
@@ -18,8 +18,7 @@ class ThemeChooserApp(App):
         if k==ord('j') and self.idx< len(self.names)-1: self.idx+=1
         elif k==ord('k') and self.idx>0: self.idx-=1
         elif k==13:
-            ctx.settings["theme"]=self.names[self.idx]
-            ctx.ds.update_settings({"theme":ctx.settings["theme"]})
+            ctx.ds.update_settings({"theme":self.names[self.idx]})
             ctx.theme.apply()
             return "pop"
 
@@ -9,7 +9,7 @@ class TimezoneSelectorApp(App):
     """App for selecting timezone"""
     
     title = "Timezone"
-    tick_ms = 300
+    tick_ms = None  # static list, redrawn on keys only
     
     def __init__(self):
         self.idx = 0
@@ -113,8 +113,6 @@ class TimezoneSelectorApp(App):
                     "timezone": selected_tz_key,
                     "local_offset_min": selected_tz_info["std_offset"]  # Update fallback offset
                 })
-                ctx.settings["timezone"] = selected_tz_key
-                ctx.settings["local_offset_min"] = selected_tz_info["std_offset"]
                 
                 # Update timezone manager
                 if hasattr(ctx, 'timezone_mgr'):
@@ -3,12 +3,31 @@
 import time
 from apps.base import App
 from core.ui import cls, header, use_font
+from hal.bitmap import pack_rows
 from core.input import read_key
 
 
 class TodoApp(App):
     title = "Todos"
     tick_ms = 200
+    icon = pack_rows([
+        0b0000000000000000,
+        0b0011111000000000,
+        0b0011010000000000,
+        0b0010110011111110,
+        0b0011110000000000,
+        0b0000000000000000,
+        0b0011111000000000,
+        0b0011010000000000,
+        0b0010110011111110,
+        0b0011110000000000,
+        0b0000000000000000,
+        0b0011110000000000,
+        0b0010010000000000,
+        0b0010010011111110,
+        0b0011110000000000,
+        0b0000000000000000,
+    ], 16)
     
     def __init__(self):
         self.mode = 'list'  # 'list', 'view', 'edit', 'new', 'set_date'
@@ -21,7 +40,7 @@ class TodoApp(App):
         self.alarm_enabled = False  # temp value for alarm setting
         
         # Todo checkbox icons (16x16)
-        self.checkbox_empty = [
+        self.checkbox_empty = pack_rows([
             0b0000000000000000,
             0b0000000000000000,
             0b0011111111111100,
@@ -38,9 +57,9 @@ class TodoApp(App):
             0b0011111111111100,
             0b0000000000000000,
             0b0000000000000000,
-        ]
+        ], 16)
         
-        self.checkbox_checked = [
+        self.checkbox_checked = pack_rows([
             0b0000000000000000,
             0b0000000000000000,
             0b0011111111111100,
@@ -57,9 +76,9 @@ class TodoApp(App):
             0b0011111111111100,
             0b0000000000000000,
             0b0000000000000000,
-        ]
+        ], 16)
         
-        self.alarm_icon = [
+        self.alarm_icon = pack_rows([
             0b0000000000000000,
             0b0000000110000000,
             0b0000000110000000,
@@ -76,94 +95,30 @@ class TodoApp(App):
             0b0000000110000000,
             0b0000000000000000,
             0b0000000000000000,
-        ]
+        ], 16)
     
     def draw_icon(self, ctx, x, y, w, h):
         """Draw app icon for menu"""
-        icon = [
-            0b0000000000000000,
-            0b0011111000000000,
-            0b0011010000000000,
-            0b0010110011111110,
-            0b0011110000000000,
-            0b0000000000000000,
-            0b0011111000000000,
-            0b0011010000000000,
-            0b0010110011111110,
-            0b0011110000000000,
-            0b0000000000000000,
-            0b0011110000000000,
-            0b0010010000000000,
-            0b0010010011111110,
-            0b0011110000000000,
-            0b0000000000000000,
-        ]
         start_x = x + (w - 16) // 2
         start_y = y + (h - 12) // 2
-        
-        for row, bits in enumerate(icon):
-            for col in range(16):
-                if bits & (1 << (15 - col)):
-                    ctx.d.pixel(start_x + col, start_y + row)
+        ctx.d.blit_bitmap(start_x, start_y, self.icon, 16, 16)
     
     def draw_checkbox(self, ctx, x, y, checked):
         """Draw checkbox icon"""
         icon = self.checkbox_checked if checked else self.checkbox_empty
-        for row, bits in enumerate(icon):
-            for col in range(16):
-                if bits & (1 << (15 - col)):
-                    ctx.d.pixel(x + col, y + row)
+        ctx.d.blit_bitmap(x, y, icon, 16, 16)
     
     def draw_alarm_icon(self, ctx, x, y):
         """Draw alarm icon"""
-        for row, bits in enumerate(self.alarm_icon):
-            for col in range(16):
-                if bits & (1 << (15 - col)):
-                    ctx.d.pixel(x + col, y + row)
+        ctx.d.blit_bitmap(x, y, self.alarm_icon, 16, 16)
     
-    def get_sorted_todos(self, ctx):
-        """Get todos sorted by due date and completion status"""
-        todos = ctx.ds.load().get('todos', [])
-        
-        # Migrate old format if needed
-        migrated = []
-        for t in todos:
-            if isinstance(t, str):
-                migrated.append({
-                    'text': t,
-                    'completed': False,
-                    'due_date': None,
-                    'alarm': False,
-                    'timestamp': 0
-                })
-            elif isinstance(t, dict):
-                if 'completed' not in t:
-                    t['completed'] = False
-                if 'due_date' not in t:
-                    t['due_date'] = None
-                if 'alarm' not in t:
-                    t['alarm'] = False
-                if 'timestamp' not in t:
-                    t['timestamp'] = 0
-                migrated.append(t)
-        
-        # Sort: incomplete first, then by due date (soonest first), then by creation
-        def sort_key(t):
-            if t.get('completed'):
-                return (1, float('inf'), 0)  # Completed items at end
-            due = t.get('due_date', 0) or 0
-            if due == 0:
-                return (0, float('inf'), -t.get('timestamp', 0))  # No due date
-            return (0, due, -t.get('timestamp', 0))  # Has due date
-        
-        migrated.sort(key=sort_key)
-        return migrated
-    
-    def save_todos(self, ctx, todos):
-        """Save todos to storage"""
-        db = ctx.ds.load()
-        db['todos'] = todos
-        ctx.ds.save(db)
+    def get_todo(self, ctx, i):
+        """The stored todo at list position i, ready to change
+        
+        The list is sorted by completion status and due date; the screen
+        reads only its visible rows with ctx.ds.cursor().
+        """
+        return ctx.ds.live('todos', ctx.ds.cursor('todos', None, i, 1)[0])
     
     def format_date(self, timestamp):
         """Format timestamp to readable date"""
@@ -200,22 +155,22 @@ class TodoApp(App):
         cls(ctx)
         # No header to save space
         
-        todos = self.get_sorted_todos(ctx)
+        count = ctx.ds.count('todos')
         
         use_font(ctx, "6")
-        if not todos:
+        if not count:
             ctx.d.text("No todos yet", 2, 8, ctx.W, 1)
             ctx.d.text("Press 'n' to create one", 2, 16, ctx.W, 1)
         else:
             # Ensure valid selection
-            if self.selected_index >= len(todos):
-                self.selected_index = max(0, len(todos) - 1)
+            if self.selected_index >= count:
+                self.selected_index = max(0, count - 1)
             
             # Display todos (3 visible to avoid overlap with help text)
             # Maximum rendering area: 55px to leave space for help text
             max_visible = 3
             start_idx = max(0, self.selected_index - 1)
-            visible_todos = todos[start_idx:start_idx + max_visible]
+            visible_todos = ctx.ds.cursor('todos', None, start_idx, max_visible)
             
             y = 2
             max_y = 55  # Limit rendering to this y-coordinate
@@ -509,29 +464,29 @@ class TodoApp(App):
         if k in (ord('q'), 27):
             return "pop"
         
-        todos = self.get_sorted_todos(ctx)
+        count = ctx.ds.count('todos')
         
         # Up/Down: Navigate todos
         if k in (0xB5, ord('k')):  # Up
-            if todos:
+            if count:
                 self.selected_index = max(0, self.selected_index - 1)
         
         elif k in (0xB6, ord('j')):  # Down
-            if todos:
-                self.selected_index = min(len(todos) - 1, self.selected_index + 1)
+            if count:
+                self.selected_index = min(count - 1, self.selected_index + 1)
         
         # Enter: View todo
         elif k == 13:
-            if todos and self.selected_index < len(todos):
-                self.selected_todo = todos[self.selected_index]
+            if self.selected_index < count:
+                self.selected_todo = self.get_todo(ctx, self.selected_index)
                 self.mode = 'view'
                 self.scroll_offset = 0
         
         # Space: Toggle completion
         elif k == ord(' '):
-            if todos and self.selected_index < len(todos):
-                todos[self.selected_index]['completed'] = not todos[self.selected_index].get('completed', False)
-                self.save_todos(ctx, todos)
+            if self.selected_index < count:
+                todo = self.get_todo(ctx, self.selected_index)
+                ctx.ds.update_record('todos', todo, {'completed': not todo['completed']})
         
         # N: New todo
         elif k in (ord('n'), ord('N')):
@@ -553,33 +508,17 @@ class TodoApp(App):
             self.edit_buffer = list(self.selected_todo.get('text', ''))
         
         elif k in (ord('d'), ord('D')) and self.selected_todo:  # Delete
-            todos = self.get_sorted_todos(ctx)
-            for i, t in enumerate(todos):
-                if (t.get('text') == self.selected_todo.get('text') and 
-                    t.get('timestamp') == self.selected_todo.get('timestamp')):
-                    todos.pop(i)
-                    break
-            self.save_todos(ctx, todos)
+            ctx.ds.remove_record('todos', self.selected_todo)
             self.mode = 'list'
             self.selected_todo = None
         
         elif k == ord(' ') and self.selected_todo:  # Toggle completion
-            self.selected_todo['completed'] = not self.selected_todo.get('completed', False)
-            todos = self.get_sorted_todos(ctx)
-            for i, t in enumerate(todos):
-                if id(t) == id(self.selected_todo):
-                    todos[i] = self.selected_todo
-                    break
-            self.save_todos(ctx, todos)
+            ctx.ds.update_record('todos', self.selected_todo,
+                                 {'completed': not self.selected_todo['completed']})
         
         elif k in (ord('a'), ord('A')) and self.selected_todo:  # Toggle alarm
-            self.selected_todo['alarm'] = not self.selected_todo.get('alarm', False)
-            todos = self.get_sorted_todos(ctx)
-            for i, t in enumerate(todos):
-                if id(t) == id(self.selected_todo):
-                    todos[i] = self.selected_todo
-                    break
-            self.save_todos(ctx, todos)
+            ctx.ds.update_record('todos', self.selected_todo,
+                                 {'alarm': not self.selected_todo['alarm']})
         
         return None
     
@@ -588,13 +527,7 @@ class TodoApp(App):
         if k == 13 and self.selected_todo:  # Save
             new_text = "".join(self.edit_buffer).strip()
             if new_text:
-                self.selected_todo['text'] = new_text
-                todos = self.get_sorted_todos(ctx)
-                for i, t in enumerate(todos):
-                    if id(t) == id(self.selected_todo):
-                        todos[i] = self.selected_todo
-                        break
-                self.save_todos(ctx, todos)
+                ctx.ds.update_record('todos', self.selected_todo, {'text': new_text})
             self.mode = 'view'
             self.edit_buffer = []
         
@@ -672,28 +605,24 @@ class TodoApp(App):
                 # Fallback: use a simple calculation
                 due_timestamp = time.time() + 3600  # 1 hour from now as fallback
             
-            todos = self.get_sorted_todos(ctx)
-            todos.append({
+            ctx.ds.add_record('todos', {
                 'text': self._new_text,
                 'completed': False,
                 'due_date': due_timestamp,
                 'alarm': self.alarm_enabled,
                 'timestamp': time.time()
             })
-            self.save_todos(ctx, todos)
             self.mode = 'list'
             self.selected_index = 0
         
         elif k == 27:  # Skip date, save without due date
-            todos = self.get_sorted_todos(ctx)
-            todos.append({
+            ctx.ds.add_record('todos', {
                 'text': self._new_text,
                 'completed': False,
                 'due_date': None,
                 'alarm': False,
                 'timestamp': time.time()
             })
-            self.save_todos(ctx, todos)
             self.mode = 'list'
             self.selected_index = 0
         
@@ -15,7 +15,7 @@ class WBrightnessApp(App):
         val = ctx.settings.get("w_brightness",64)
         if k==ord('h'): val=max(0,val-8)
         if k==ord('l'): val=min(255,val+8)
-        if val!=ctx.settings.get("w_brightness"):
-            ctx.settings["w_brightness"]=val
-            ctx.ds.update_settings({"w_brightness":val})
+        # ctx.settings is the stored dict: update_settings() changes it and
+        # writes once the key is released
+        if ctx.ds.update_settings({"w_brightness":val}):
             ctx.theme.apply()
\ No newline at end of file
@@ -1,6 +1,5 @@
 # Core Context and Configuration
 
-import os
 import sys
 from hal import get_platform, is_simulator
 
@@ -12,12 +11,22 @@ if not _IS_SIMULATOR:
     from machine import I2C, Pin, RTC
     from gfx_pack import GfxPack  # type: ignore
 
-try:
-    import ujson as json
-except:
-    import json
+from core.storage import ShardedFiles, default_storage
+from core.journal import JournalFile
+from core.views import SortedView, ContactIndex, _bisect_left
+from core.views import todo_order, memo_order, contact_order
+from core.search import SearchIndex, SEARCHED, NAMES, tokens, record_matches
+from core import textpack
 
 
+# DataStore engine: False keeps one file per collection (core/storage.py),
+# True appends the edits to agenda.json.log instead (core/journal.py)
+USE_JOURNAL = False
+
+# List collections the default engine stores in the compact binary record
+# format of core/records.py (agenda/<name>.bin) rather than as JSON
+BINARY_COLLECTIONS = ()
+
 # Theme definitions
 THEMES = {
     "amber": dict(r=64, g=32, b=0, w=20),
@@ -28,66 +37,517 @@ THEMES = {
 }
 
 
+# Schema migrations: MIGRATIONS[name][n] upgrades collection `name` from
+# version n to n + 1. DataStore runs the missing steps once, when the
+# collection is first loaded, and stores the versions in "schema".
+def _todos_v1(todos):
+    """Plain strings and partial dicts -> full todo records"""
+    out = []
+    for t in todos:
+        if isinstance(t, str):
+            t = {'text': t}
+        elif not isinstance(t, dict):
+            continue
+        t.setdefault('completed', False)
+        t.setdefault('due_date', None)
+        t.setdefault('alarm', False)
+        t.setdefault('timestamp', 0)
+        out.append(t)
+    return out
+
+
+def _memos_v1(memos):
+    """Plain strings, title + text and undated dicts -> {text, timestamp}"""
+    out = []
+    for m in memos:
+        if not isinstance(m, dict):
+            m = {'text': str(m), 'timestamp': 0}
+        elif 'text' not in m and 'title' in m:
+            m = {'text': m.get('title', '') + ': ' + m.get('text', ''), 'timestamp': 0}
+        elif 'timestamp' not in m:
+            m = {'text': m.get('text', str(m)), 'timestamp': 0}
+        out.append(m)
+    return out
+
+
+def _ids_v(records):
+    """Stable record ids (search index postings refer to them)"""
+    last = 0
+    for r in records:
+        last = max(last, r.get('id', 0))
+    for r in records:
+        if 'id' not in r:
+            last += 1
+            r['id'] = last
+    return records
+
+
+def _pack_v(records):
+    """Long texts compressed (core/textpack.py)"""
+    for r in records:
+        textpack.pack(r)
+    return records
+
+
+MIGRATIONS = {
+    "todos": [_todos_v1, _ids_v],
+    "memos": [_memos_v1, _ids_v, _pack_v],
+    "contacts": [_ids_v],
+}
+
+# Sort orders of the list collections, by name (DataStore.cursor())
+ORDERS = {
+    "todos": {"due": todo_order},
+    "memos": {"newest": memo_order},
+    "contacts": {"name": contact_order},
+}
+
+# Collections whose long "text" DataStore stores compressed, as a preview
+# in "p" and the deflated text in "z" (no "text"): read the whole text
+# with core.textpack.text(record), the preview with textpack.preview()
+PACKED = ("memos",)
+
+# DataStore.view() per collection: its order and view class
+VIEWS = {
+    "todos": ("due", SortedView),
+    "memos": ("newest", SortedView),
+    "contacts": ("name", ContactIndex),
+}
+
+
 class DataStore:
-    def __init__(self, path):
+    """Agenda database with a write-back cache
+    
+    Each collection (settings, contacts, memos, todos) is parsed the first
+    time it is used and then served from memory; the save_*() calls only
+    mark collections dirty. Dirty data is written by flush(), either
+    explicitly or `flush_delay_ms` after the last change (AppManager calls
+    flush_if_due()). Without a clock every save is written through at once.
+    
+    Stored records are upgraded to the current schema (MIGRATIONS) when
+    their collection is loaded, so callers can rely on every field.
+    
+    load() and load_*() return the cached objects: change them only
+    together with the matching save_*() call, or through add_record(),
+    update_record() and remove_record(), which also keep view() in order.
+    
+    Those also compress long memo texts (PACKED): the record then has a
+    preview in "p" and no "text"; core.textpack.text(record) gives the
+    whole text.
+    """
+    
+    def __init__(self, path, clock=None, flush_delay_ms=2000, engine=None, storage=None):
+        """
+        Args:
+            path: Database file
+            clock: hal ClockInterface for the flush timer (None = write-through)
+            flush_delay_ms: Quiet period before dirty data is written
+            engine: File format (core.storage ShardedFiles, the default,
+                JsonFile, or core.journal JournalFile)
+            storage: hal StorageInterface of the default engine and the
+                search index (the platform's filesystem if None)
+        """
         self.path = path
+        self._clock = clock
+        self.flush_delay_ms = flush_delay_ms
+        self.storage = storage or (engine.storage if engine is not None else default_storage())
+        self.engine = engine if engine is not None else ShardedFiles(path, self.storage)
+        self._db = {}  # loaded collections
+        self._dirty = set()
+        self._dirty_at = None
+        self._versions = {}
+        self._views = {}
+        self._last_ids = {}
+        self._search = None
+        self._search_checked = False
+        self._by_id = {}
+        
+        # Stats
+        self.writes = 0
+        self.collection_writes = {}  # name -> times written
+    
+    def collection(self, name, default):
+        """A collection, loaded on first use (default when it does not exist)"""
+        value = self._db.get(name)
+        if value is None:
+            value = self.engine.load(name)
+            if value is None:
+                value = default
+            elif name in MIGRATIONS:
+                value = self._migrate(name, value)
+            self._db[name] = value
+        return value
+    
+    def _migrate(self, name, value):
+        """Bring a stored collection up to the current schema, once"""
+        steps = MIGRATIONS[name]
+        version = self.collection("schema", {}).get(name, 0)
+        if version < len(steps):
+            for step in steps[version:]:
+                value = step(value)
+            self._db[name] = value
+            self._mark(name)
+        return value
     
     def load(self):
-        try:
-            with open(self.path, "r") as f:
-                return json.load(f)
-        except:
-            return {"contacts": [], "memos": [], "settings": {}}
+        """The whole database (loads every collection)"""
+        for name in self.engine.names():
+            self.collection(name, None)
+        return self._db
+    
+    def _mark(self, *names):
+        """Mark collections dirty and (re)start the flush timer"""
+        for name in names:
+            self._dirty.add(name)
+            self._versions[name] = self._versions.get(name, 0) + 1
+            if name in MIGRATIONS:
+                # Written in the current format from now on
+                schema = self.collection("schema", {})
+                if schema.get(name) != len(MIGRATIONS[name]):
+                    schema[name] = len(MIGRATIONS[name])
+                    self._dirty.add("schema")
+        self._schedule_flush()
+    
+    def _schedule_flush(self):
+        if self._clock is None:
+            self.flush()
+        else:
+            self._dirty_at = self._clock.ticks_ms()
     
     def save(self, db):
-        tmp = self.path + ".tmp"
-        with open(tmp, "w") as f:
-            json.dump(db, f)
-        try:
-            if not _IS_SIMULATOR:
-                import os as uos
-                if self.path in uos.listdir():
-                    uos.remove(self.path)
-                uos.rename(tmp, self.path)
+        """Replace the collections in db"""
+        self._db.update(db)
+        for name in db:
+            self._replaced(name)
+    
+    def version(self, name):
+        """Change counter of a collection, for caches derived from it"""
+        return self._versions.get(name, 0)
+    
+    def view(self, name):
+        """Sorted view of a collection (see VIEWS)
+        
+        Kept up to date by the *_record() calls; any other save rebuilds it
+        on the next call.
+        """
+        view = self._views.get(name)
+        if view is None or view.version != self.version(name):
+            order, view_class = VIEWS[name]
+            view = view_class(self.collection(name, []), ORDERS[name][order])
+            view.version = self.version(name)
+            self._views[name] = view
+        return view
+    
+    def _ordered(self, name, order):
+        """view(name), or a sorted copy for another order (rebuilt on edits)"""
+        if order == VIEWS[name][0]:
+            return self.view(name)
+        view = self._views.get((name, order))
+        if view is None or view.version != self.version(name):
+            view = SortedView(self.collection(name, []), ORDERS[name][order])
+            view.version = self.version(name)
+            self._views[(name, order)] = view
+        return view
+    
+    def _page(self, name, order, start, count):
+        """(header, records) from the engine's offset index, or None
+        
+        None when the collection is in RAM, or the engine keeps no index
+        (JsonFile, JournalFile) or has none up to date. A missing index of
+        a stored list is written by the next flush.
+        """
+        if name in self._db or not hasattr(self.engine, "read_order"):
+            return None
+        page = self.engine.read_order(name, order, start, count)
+        if page is not None and page[0].get("schema") == len(MIGRATIONS.get(name, ())):
+            return page
+        if self.collection(name, []):
+            self._dirty.add(name)
+            self._schedule_flush()
+        return None
+    
+    def cursor(self, name, order=None, start=0, count=1):
+        """Records start .. start + count - 1 of a list collection, sorted
+        
+        order is a name from ORDERS (default: the order of view(name)).
+        A collection that is not in RAM is read from the engine's offset
+        index, only the records asked for, so list screens stay as cheap
+        with 30k records as with 30; those records are copies: pass one
+        to live() before changing it. Once loaded, the stored records are
+        returned.
+        """
+        order = order or VIEWS[name][0]
+        page = self._page(name, order, start, count)
+        if page is not None:
+            return page[1]
+        return self._ordered(name, order)[start:start + count]
+    
+    def count(self, name):
+        """Number of records of a list collection (see cursor())"""
+        page = self._page(name, VIEWS[name][0], 0, 0)
+        if page is not None:
+            return page[0]["count"]
+        return len(self.collection(name, []))
+    
+    def table(self, name):
+        """Letter table of a ContactIndex view (see core.views.letter_range)"""
+        page = self._page(name, VIEWS[name][0], 0, 0)
+        if page is not None:
+            return page[0]["table"]
+        return self.view(name).table()
+    
+    def seek(self, name, key, order=None):
+        """Position of the first record whose sort key is >= key"""
+        order = order or VIEWS[name][0]
+        if self._page(name, order, 0, 0) is None:
+            return _bisect_left(self._ordered(name, order).keys, key)
+        # Binary search reading one record per step
+        sort_key = ORDERS[name][order]
+        lo, hi = 0, self.count(name)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if sort_key(self.cursor(name, order, mid, 1)[0]) < key:
+                lo = mid + 1
             else:
-                if os.path.exists(self.path):
-                    os.remove(self.path)
-                os.rename(tmp, self.path)
-        except:
-            pass
+                hi = mid
+        return lo
+    
+    def live(self, name, record):
+        """The stored record a cursor() copy stands for (loads the collection)"""
+        if self.view(name).index(record) >= 0:
+            return record
+        return self._records_by_id(name).get(record.get('id'), record)
+    
+    def _live_view(self, name):
+        view = self._views.get(name)
+        if view is not None and view.version == self.version(name):
+            return view
+        return None
+    
+    def _record_changed(self, name, view):
+        self._mark(name)
+        if view is not None:
+            view.version = self.version(name)
+    
+    def add_record(self, name, record):
+        """Append a record to a list collection"""
+        if name in PACKED:
+            textpack.pack(record)
+        view = self._live_view(name)
+        self.collection(name, []).append(record)
+        if view is not None:
+            view.insert(record)
+        if name in SEARCHED:
+            if 'id' not in record:
+                record['id'] = self._new_id(name)
+            self.search_index().add(name, record)
+        self._record_changed(name, view)
+    
+    def update_record(self, name, record, patch):
+        """Apply patch (a dict of fields) to a stored record"""
+        view = self._live_view(name)
+        if view is not None:
+            view.remove(record)
+        if name in SEARCHED:
+            self.search_index().remove(name, record)
+        record.update(patch)
+        if name in PACKED:
+            textpack.pack(record)
+        if view is not None:
+            view.insert(record)
+        if name in SEARCHED:
+            self.search_index().add(name, record)
+        self._record_changed(name, view)
+    
+    def remove_record(self, name, record):
+        """Delete a stored record (matched by identity)"""
+        view = self._live_view(name)
+        records = self.collection(name, [])
+        for i in range(len(records)):
+            if records[i] is record:
+                records.pop(i)
+                break
+        if view is not None:
+            view.remove(record)
+        if name in SEARCHED:
+            self.search_index().remove(name, record)
+        self._record_changed(name, view)
+    
+    def _new_id(self, name):
+        last = self._last_ids.get(name)
+        if last is None:
+            last = 0
+            for r in self.collection(name, []):
+                last = max(last, r.get('id', 0))
+        self._last_ids[name] = last + 1
+        return last + 1
+    
+    def _replaced(self, name):
+        """A whole collection was saved: give new records ids, reindex"""
+        if name in PACKED:
+            for r in self._db[name]:
+                textpack.pack(r)
+        if name in SEARCHED:
+            self._last_ids.pop(name, None)
+            for r in self._db[name]:
+                if 'id' not in r:
+                    r['id'] = self._new_id(name)
+            self.search_index().clear()
+            self._search_checked = False
+        self._mark(name)
+    
+    def search_index(self):
+        """The SearchIndex (core/search.py), next to the database file"""
+        if self._search is None:
+            base = self.path[:-5] if self.path.endswith(".json") else self.path
+            self._search = SearchIndex(base + ".idx", storage=self.storage)
+        return self._search
+    
+    def _records_by_id(self, name):
+        cached = self._by_id.get(name)
+        if cached is None or cached[0] != self.version(name):
+            records = {}
+            for r in self.collection(name, []):
+                records[r['id']] = r
+            cached = (self.version(name), records)
+            self._by_id[name] = cached
+        return cached[1]
+    
+    def search(self, query, limit=20):
+        """[(collection, record)] matching every word of query, newest first
+        
+        Words match as prefixes: "mee" finds "Meeting". Searches the todos,
+        memos and contacts (see core.search.SEARCHED).
+        """
+        index = self.search_index()
+        if not self._search_checked:
+            # The index file must account for every record (it may be
+            # missing, or older than the collections after a power cut)
+            self._search_checked = True
+            stale = index.stale()
+            for name in NAMES:
+                if stale:
+                    break
+                records = self.collection(name, [])
+                stale = index.docs[name] != [len(records), sum([r['id'] for r in records])]
+            if stale:
+                index.rebuild(self)
+        words = tokens(query)
+        hits = []
+        for key in index.search(query):
+            name = NAMES[key & 3]
+            record = self._records_by_id(name).get(key >> 2)
+            # Postings can be older than an edit lost in a power cut
+            if record is not None and record_matches(name, record, words):
+                hits.append((record.get('timestamp', 0), key, name, record))
+        hits.sort(reverse=True)
+        return [(h[2], h[3]) for h in hits[:limit]]
+    
+    def flush(self):
+        """Write dirty data to the file now"""
+        if self._dirty:
+            self.writes += 1
+            for name in self._dirty:
+                self.collection_writes[name] = self.collection_writes.get(name, 0) + 1
+            if self._search is not None:
+                self._search.mark_dirty()
+            self.engine.write(self._db, self._dirty)
+            if hasattr(self.engine, "write_order"):
+                for name in self._dirty:
+                    if name in ORDERS:
+                        self._write_orders(name)
+        if self._search is not None:
+            self._search.merge()
+        self._dirty = set()
+        self._dirty_at = None
+    
+    def _write_orders(self, name):
+        """Give the engine the sorted positions of a collection it wrote"""
+        stored = {}
+        records = self._db[name]
+        for i in range(len(records)):
+            stored[id(records[i])] = i
+        for order in ORDERS[name]:
+            view = self._ordered(name, order)
+            info = {"schema": len(MIGRATIONS.get(name, ()))}
+            if isinstance(view, ContactIndex):
+                info["table"] = view.table()
+            self.engine.write_order(name, order, [stored[id(r)] for r in view], info)
+    
+    def next_flush(self):
+        """ticks_ms deadline of the pending flush, or None"""
+        if self._dirty_at is None:
+            return None
+        return self._dirty_at + self.flush_delay_ms
+    
+    def flush_if_due(self, now):
+        """Flush if the quiet period after the last change is over"""
+        deadline = self.next_flush()
+        if deadline is not None and self._clock.ticks_diff(now, deadline) >= 0:
+            self.flush()
+    
+    def stats(self):
+        """Flushes since start, the dirty and loaded collections, engine counters"""
+        stats = {
+            "writes": self.writes,
+            "collection_writes": dict(self.collection_writes),
+            "dirty": sorted(self._dirty),
+            "loaded": sorted(self._db.keys()),
+        }
+        engine_stats = getattr(self.engine, "stats", None)
+        if engine_stats is not None:
+            stats.update(engine_stats())
+        return stats
     
     def load_settings(self, defaults):
-        db = self.load()
-        s = db.get("settings", {})
+        """The settings dict, defaults filled in (written only if one was missing)"""
+        s = self.collection("settings", {})
+        added = False
         for k, v in defaults.items():
-            s.setdefault(k, v)
-        db["settings"] = s
-        self.save(db)
+            if k not in s:
+                s[k] = v
+                added = True
+        if added:
+            self._mark("settings")
         return s
     
     def update_settings(self, patch):
-        db = self.load()
-        db.setdefault("settings", {}).update(patch)
-        self.save(db)
+        """Change settings; a burst of changes is written once, unchanged
+        values are not written at all"""
+        s = self.collection("settings", {})
+        changed = False
+        for k, v in patch.items():
+            if k not in s or s[k] != v:
+                s[k] = v
+                changed = True
+        if changed:
+            self._mark("settings")
+        return changed
     
     def load_contacts(self):
-        return self.load().get("contacts", [])
+        return self.collection("contacts", [])
     
     def load_memos(self):
-        return self.load().get("memos", [])
+        return self.collection("memos", [])
     
     def save_db(self):
-        self.save(self.load())
+        for name in list(self._db.keys()):
+            self._replaced(name)
     
     def save_contacts(self, contacts):
-        db = self.load()
-        db["contacts"] = contacts
-        self.save(db)
+        self._db["contacts"] = contacts
+        self._replaced("contacts")
     
     def save_memos(self, memos):
-        db = self.load()
-        db["memos"] = memos
-        self.save(db)
+        self._db["memos"] = memos
+        self._replaced("memos")
+    
+    def load_todos(self):
+        return self.collection("todos", [])
+    
+    def save_todos(self, todos):
+        self._db["todos"] = todos
+        self._replaced("todos")
 
 
 class ThemeManager:
@@ -139,7 +599,16 @@ class Context:
         self.INK, self.BG = 15, 0
         
         # Data storage
-        self.ds = DataStore("agenda.json")
+        if USE_JOURNAL:
+            engine = JournalFile("agenda.json", storage=self.hal_storage)
+        else:
+            engine = ShardedFiles("agenda.json", self.hal_storage, binary=BINARY_COLLECTIONS)
+        self.ds = DataStore("agenda.json", clock=self.hal_clock, engine=engine,
+                            storage=self.hal_storage)
+        if _IS_SIMULATOR:
+            # Closing the window exits from DisplaySim.update(): keep edits
+            import atexit
+            atexit.register(self.ds.flush)
         self.settings = self.ds.load_settings({
             "theme": "amber",
             "w_brightness": 64,
@@ -185,6 +654,9 @@ class MockWiFiManager:
     def connect(self, ssid, password):
         print(f"[SIM] Mock WiFi connect to {ssid}")
         return False
+    
+    async def connect_async(self, ssid, password):
+        return self.connect(ssid, password)
 
 
 class MockNTPSync:
@@ -193,3 +665,6 @@ class MockNTPSync:
     def sync_time(self):
         print("[SIM] Mock NTP sync")
         return False
+    
+    async def sync_time_async(self):
+        return self.sync_time()
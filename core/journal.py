@@ -0,0 +1,224 @@
+# Append-only journal storage for DataStore
+
+import binascii
+from core.storage import JsonFile, default_storage, _recover
+
+try:
+    import ujson as json
+except:
+    import json
+
+
+class JournalFile:
+    """Log-structured DataStore engine
+    
+    The database lives in a snapshot (`path`, same JSON as JsonFile plus a
+    "_seq" key) and a journal (`path` + ".log") of edits appended since.
+    Each flush appends one journal line, "<crc32> <json>", holding
+    [seq, [[op, collection, id, payload], ...]] so a flush is applied
+    entirely or not at all:
+    
+        splice  list collection: id = start, payload = [removed, records]
+        put/del dict collection (settings): id = key, payload = value
+        set     whole collection replaced: payload = value
+    
+    Loading replays the journal on top of the snapshot. A torn or corrupt
+    tail (power lost mid-append) is dropped and cut off the file. Once the
+    journal grows past `compact_bytes` the snapshot is rewritten and the
+    journal started again; records already in the snapshot are skipped by
+    sequence number, so a crash during compaction is harmless too.
+    """
+    
+    def __init__(self, path, compact_bytes=16384, storage=None):
+        """
+        Args:
+            path: Snapshot file (the journal is path + ".log")
+            compact_bytes: Journal size that triggers a new snapshot
+            storage: hal StorageInterface (default_storage() if None)
+        """
+        self.path = path
+        self.storage = storage or default_storage()
+        self.log_path = path + ".log"
+        self.compact_bytes = compact_bytes
+        self._seq = 0
+        self._all = None  # whole database, loaded on first use
+        self._shadow = {}  # collection -> JSON of each record as last written
+        
+        # Stats
+        self.appends = 0
+        self.compactions = 0
+        self.replayed = 0
+        self.dropped_bytes = 0
+        self.parses = 0
+    
+    def _load_all(self):
+        if self._all is None:
+            snapshot = JsonFile(self.path, self.storage)
+            db = {}
+            for name, value in snapshot.items():
+                db[name] = value
+            self.parses += snapshot.parses
+            self._seq = db.pop("_seq", 0)
+            self._replay(db)
+            self._shadow = {}
+            for name, value in db.items():
+                self._shadow[name] = self._encode(value)
+            self._all = db
+        return self._all
+    
+    def names(self):
+        return list(self._load_all().keys())
+    
+    def load(self, name):
+        return self._load_all().get(name)
+    
+    def _replay(self, db):
+        good = 0
+        try:
+            f = self.storage.open(self.log_path, "rb")
+        except OSError:
+            if not _recover(self.storage, self.log_path):
+                return
+            f = self.storage.open(self.log_path, "rb")
+        with f:
+            while True:
+                line = f.readline()
+                if not line:
+                    break
+                rec = self._parse(line)
+                if rec is None:
+                    break
+                good += len(line)
+                if rec[0] <= self._seq:
+                    continue  # already in the snapshot
+                self._apply(db, rec)
+                self._seq = rec[0]
+                self.replayed += 1
+        size = self.storage.size(self.log_path)
+        if good < size:
+            self.dropped_bytes += size - good
+            self._truncate(good)
+    
+    def _parse(self, line):
+        """[seq, ops] from a journal line, None if damaged"""
+        if not line.endswith(b"\n") or len(line) < 10 or line[8:9] != b" ":
+            return None
+        body = line[9:-1]
+        try:
+            if int(line[:8].decode(), 16) != binascii.crc32(body) & 0xFFFFFFFF:
+                return None
+            rec = json.loads(body.decode())
+        except (ValueError, UnicodeError):
+            return None
+        if not isinstance(rec, list) or len(rec) != 2:
+            return None
+        return rec
+    
+    def _apply(self, db, rec):
+        for op, name, key, data in rec[1]:
+            if op == "set":
+                db[name] = data
+            elif op == "splice":
+                items = db.setdefault(name, [])
+                items[key:key + data[0]] = data[1]
+            elif op == "put":
+                db.setdefault(name, {})[key] = data
+            elif op == "del":
+                db.get(name, {}).pop(key, None)
+    
+    def _truncate(self, size):
+        # MicroPython files have no truncate(): copy the good prefix
+        tmp = self.log_path + ".tmp"
+        with self.storage.open(self.log_path, "rb") as src, self.storage.open(tmp, "wb") as dst:
+            while size > 0:
+                chunk = src.read(min(size, 512))
+                if not chunk:
+                    break
+                dst.write(chunk)
+                size -= len(chunk)
+        self.storage.rename(tmp, self.log_path)
+    
+    def _encode(self, value):
+        """Per-record JSON used to diff a collection against the journal"""
+        if isinstance(value, list):
+            return [json.dumps(v) for v in value]
+        if isinstance(value, dict):
+            encoded = {}
+            for k, v in value.items():
+                encoded[k] = json.dumps(v)
+            return encoded
+        return json.dumps(value)
+    
+    def _diff(self, name, value, new):
+        """Journal ops turning the last written collection into `value`"""
+        old = self._shadow.get(name)
+        if isinstance(new, list) and isinstance(old, list):
+            start = 0
+            end = min(len(old), len(new))
+            while start < end and old[start] == new[start]:
+                start += 1
+            tail = 0
+            while tail < end - start and old[-1 - tail] == new[-1 - tail]:
+                tail += 1
+            if start == len(old) == len(new):
+                return []
+            return [("splice", start, [len(old) - start - tail, value[start:len(value) - tail]])]
+        if isinstance(new, dict) and isinstance(old, dict):
+            ops = []
+            for k, v in new.items():
+                if old.get(k) != v:
+                    ops.append(("put", k, value[k]))
+            for k in old:
+                if k not in new:
+                    ops.append(("del", k, None))
+            return ops
+        if old == new:
+            return []
+        return [("set", None, value)]
+    
+    def write(self, db, dirty):
+        all_ = self._load_all()
+        ops = []
+        for name in dirty:
+            if name not in db:
+                continue
+            value = db[name]
+            all_[name] = value
+            new = self._encode(value)
+            for op, key, data in self._diff(name, value, new):
+                ops.append([op, name, key, data])
+            self._shadow[name] = new
+        if ops:
+            self._seq += 1
+            body = json.dumps([self._seq, ops]).encode()
+            with self.storage.open(self.log_path, "ab") as f:
+                f.write(("%08x " % (binascii.crc32(body) & 0xFFFFFFFF)).encode() + body + b"\n")
+            self.appends += 1
+        if self.storage.size(self.log_path) > self.compact_bytes:
+            self.compact()
+    
+    def compact(self):
+        """Write a new snapshot and start an empty journal"""
+        db = self._load_all()
+        tmp = self.path + ".tmp"
+        db["_seq"] = self._seq
+        try:
+            with self.storage.open(tmp, "w") as f:
+                json.dump(db, f)
+        finally:
+            del db["_seq"]
+        self.storage.rename(tmp, self.path)
+        # A crash here leaves the old journal, whose records are all <= _seq
+        self.storage.remove(self.log_path)
+        self.compactions += 1
+    
+    def stats(self):
+        """Journal activity since start"""
+        return {
+            "appends": self.appends,
+            "compactions": self.compactions,
+            "parses": self.parses,
+            "replayed": self.replayed,
+            "dropped_bytes": self.dropped_bytes,
+            "journal_bytes": self.storage.size(self.log_path),
+        }
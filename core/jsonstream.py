@@ -0,0 +1,231 @@
+# Pull-style JSON reader: parses a file in small chunks, one record at a time
+
+try:
+    import ujson as json
+except:
+    import json
+
+CHUNK = 512  # bytes read from the file at a time
+
+_WS = b" \t\r\n"
+_OPEN = b"{["
+_CLOSE = b"}]"
+_END = b",]} \t\r\n"  # bytes ending a number, true, false or null
+_QUOTE = 34
+_MAX_KEYS = 64  # distinct record keys shared between records
+
+
+class JsonStream:
+    """Walks the JSON text of a binary file without reading all of it
+    
+    Only the current chunk and the text of the value being parsed are held,
+    so loading a list costs the records themselves plus one record of text,
+    not the whole file as a string next to the objects built from it.
+    Containers are walked with array() and object(); value() parses one
+    complete value (a record) with json.loads, skip() passes over one.
+    
+    Raises ValueError on malformed or truncated input.
+    """
+    
+    def __init__(self, f, chunk=CHUNK):
+        """
+        Args:
+            f: File opened in binary mode
+            chunk: Bytes read at a time
+        """
+        self.f = f
+        self.chunk = chunk
+        self.buf = b""
+        self.pos = 0
+        self._pending = False  # object() key yielded, value not read yet
+        self._keys = {}  # one string object per record key
+    
+    def _fill(self):
+        """Next chunk into the buffer, False at the end of the file"""
+        self.buf = self.f.read(self.chunk)
+        self.pos = 0
+        return len(self.buf) > 0
+    
+    def _peek(self):
+        """Next byte that is not whitespace, None at the end"""
+        while True:
+            buf = self.buf
+            i = self.pos
+            while i < len(buf) and buf[i] in _WS:
+                i += 1
+            self.pos = i
+            if i < len(buf):
+                return buf[i]
+            if not self._fill():
+                return None
+    
+    def _expect(self, byte):
+        if self._peek() != byte:
+            raise ValueError("JSON: expected " + chr(byte))
+        self.pos += 1
+    
+    def _scan(self, keep):
+        """Pass over one value, returning its text if keep"""
+        first = self._peek()
+        if first is None:
+            raise ValueError("JSON: unexpected end")
+        scalar = first not in _OPEN and first != _QUOTE
+        parts = []
+        depth = 0
+        in_str = False
+        over = 0  # bytes of this chunk an escape already covers
+        while True:
+            buf = self.buf
+            n = len(buf)
+            start = self.pos
+            i = start + over
+            end = -1
+            while i < n:
+                if in_str:
+                    # Jump to the closing quote, stepping over escapes
+                    q = buf.find(b'"', i)
+                    b = buf.find(b"\\", i, n if q < 0 else q)
+                    if b >= 0:
+                        i = b + 2
+                    elif q < 0:
+                        i = n
+                    else:
+                        i = q + 1
+                        in_str = False
+                        if depth == 0:
+                            end = i
+                            break
+                    continue
+                c = buf[i]
+                if scalar:
+                    if c in _END:
+                        end = i
+                        break
+                elif c == _QUOTE:
+                    in_str = True
+                elif c in _OPEN:
+                    depth += 1
+                elif c in _CLOSE:
+                    depth -= 1
+                    if depth == 0:
+                        end = i + 1
+                        break
+                i += 1
+            if end >= 0:
+                if keep:
+                    parts.append(buf[start:end])
+                self.pos = end
+                return b"".join(parts) if keep else None
+            # Value continues in the next chunk (an escape may straddle it)
+            if keep:
+                parts.append(buf[start:])
+            over = i - n
+            if not self._fill():
+                if scalar:
+                    return b"".join(parts) if keep else None
+                raise ValueError("JSON: unexpected end")
+    
+    def value(self):
+        """Parse the next value whole"""
+        self._pending = False
+        return json.loads(self._scan(True).decode())
+    
+    def skip(self):
+        """Pass over the next value without building it"""
+        self._pending = False
+        self._scan(False)
+    
+    def _share_keys(self, record):
+        """record with its keys replaced by the ones of earlier records
+        
+        Parsed one by one, every record would own a copy of "text",
+        "timestamp", ... (json.load shares them across the whole file).
+        """
+        keys = self._keys
+        shared = {}
+        for key, value in record.items():
+            key = keys.get(key, key)
+            if len(keys) < _MAX_KEYS:
+                keys[key] = key
+            shared[key] = value
+        return shared
+    
+    def array(self):
+        """Yield the elements of the next value, a list, one by one"""
+        self._pending = False
+        self._expect(ord("["))
+        if self._peek() == ord("]"):
+            self.pos += 1
+            return
+        while True:
+            item = self.value()
+            yield self._share_keys(item) if isinstance(item, dict) else item
+            c = self._peek()
+            self.pos += 1
+            if c == ord("]"):
+                return
+            if c != ord(","):
+                raise ValueError("JSON: expected , or ]")
+    
+    def object(self):
+        """Yield the keys of the next value, a dict
+        
+        Read each value (value(), load(), array(), object() or skip())
+        before asking for the next key; one left unread is skipped.
+        """
+        self._pending = False
+        self._expect(ord("{"))
+        if self._peek() == ord("}"):
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self._expect(ord(":"))
+            self._pending = True
+            yield key
+            if self._pending:
+                self.skip()
+            c = self._peek()
+            self.pos += 1
+            if c == ord("}"):
+                return
+            if c != ord(","):
+                raise ValueError("JSON: expected , or }")
+    
+    def load(self):
+        """Build the next value, reading lists and dicts an item at a time"""
+        c = self._peek()
+        if c == ord("["):
+            return [item for item in self.array()]
+        if c == ord("{"):
+            result = {}
+            for key in self.object():
+                result[key] = self.value()
+            return result
+        return self.value()
+
+
+def load(f, chunk=CHUNK):
+    """json.load() of a binary file, without the whole text in RAM"""
+    return JsonStream(f, chunk).load()
+
+
+def items(f, chunk=CHUNK):
+    """Yield (key, value) of a top-level dict, one value built at a time"""
+    stream = JsonStream(f, chunk)
+    for key in stream.object():
+        yield key, stream.load()
+
+
+def keys(f, chunk=CHUNK):
+    """Keys of a top-level dict; the values are skipped, not built"""
+    return [key for key in JsonStream(f, chunk).object()]
+
+
+def load_key(f, name, chunk=CHUNK):
+    """Value of one key of a top-level dict (None if missing)"""
+    stream = JsonStream(f, chunk)
+    for key in stream.object():
+        if key == name:
+            return stream.load()
+    return None
@@ -1,6 +1,10 @@
 # NTP Time Synchronization for MicroPython
 
 import time
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
 try:
     import socket
     import struct
@@ -32,6 +36,32 @@ class NTPSync:
         """Check if NTP sync is available"""
         return SOCKET_AVAILABLE
     
+    def _ntp_request(self, host):
+        """Send an NTP request, returns the socket to read the reply from"""
+        # Resolve hostname
+        addr_info = socket.getaddrinfo(host, 123)
+        addr = addr_info[0][-1]
+        
+        # Create socket
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        
+        # NTP request packet (48 bytes)
+        # LI=0, VN=3, Mode=3 (client)
+        ntp_packet = bytearray(48)
+        ntp_packet[0] = 0x1b  # 00 011 011
+        
+        # Send request
+        s.sendto(ntp_packet, addr)
+        return s
+    
+    def _ntp_unix_time(self, data):
+        """Unix timestamp from an NTP reply"""
+        # Extract transmit timestamp (bytes 40-47)
+        timestamp = struct.unpack('!I', data[40:44])[0]
+        
+        # Convert from NTP to Unix timestamp
+        return timestamp - self.NTP_DELTA
+    
     def get_ntp_time(self, host="pool.ntp.org", timeout=5):
         """
         Get time from NTP server
@@ -47,64 +77,49 @@ class NTPSync:
             return None
         
         try:
-            # Resolve hostname
-            addr_info = socket.getaddrinfo(host, 123)
-            addr = addr_info[0][-1]
-            
-            # Create socket
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            s = self._ntp_request(host)
             s.settimeout(timeout)
             
-            # NTP request packet (48 bytes)
-            # LI=0, VN=3, Mode=3 (client)
-            ntp_packet = bytearray(48)
-            ntp_packet[0] = 0x1b  # 00 011 011
-            
-            # Send request
-            s.sendto(ntp_packet, addr)
-            
             # Receive response
             data, address = s.recvfrom(48)
             s.close()
             
-            # Extract transmit timestamp (bytes 40-47)
-            timestamp = struct.unpack('!I', data[40:44])[0]
-            
-            # Convert from NTP to Unix timestamp
-            unix_time = timestamp - self.NTP_DELTA
-            
-            return unix_time
+            return self._ntp_unix_time(data)
             
         except Exception as e:
             print(f"NTP error ({host}): {e}")
             return None
     
-    def sync_time(self, offset_minutes=None):
-        """
-        Synchronize RTC with NTP server
-        
-        Args:
-            offset_minutes: Timezone offset in minutes (uses timezone manager if None)
-        
-        Returns:
-            True if sync successful, False otherwise
-        """
+    async def get_ntp_time_async(self, host="pool.ntp.org", timeout=5):
+        """get_ntp_time() that polls for the reply instead of blocking"""
         if not self.is_available():
-            print("NTP not available (no network support)")
-            return False
-        
-        # Try each NTP server until one works
-        unix_time = None
-        for server in self.NTP_SERVERS:
-            print(f"Trying NTP server: {server}")
-            unix_time = self.get_ntp_time(server)
-            if unix_time is not None:
-                break
-        
-        if unix_time is None:
-            print("Failed to get time from any NTP server")
-            return False
+            return None
         
+        try:
+            s = self._ntp_request(host)
+            s.setblocking(False)
+            start = time.time()
+            try:
+                while True:
+                    try:
+                        data, address = s.recvfrom(48)
+                        break
+                    except OSError:
+                        # No reply yet (EAGAIN)
+                        if time.time() - start > timeout:
+                            raise OSError("timed out")
+                        await asyncio.sleep(0.05)
+            finally:
+                s.close()
+            
+            return self._ntp_unix_time(data)
+            
+        except Exception as e:
+            print(f"NTP error ({host}): {e}")
+            return None
+    
+    def _set_rtc(self, unix_time, offset_minutes):
+        """Set the RTC from a Unix timestamp, returns True on success"""
         # Get timezone offset
         if offset_minutes is None:
             # Use timezone manager if available (handles DST automatically)
@@ -144,6 +159,54 @@ class NTPSync:
             print(f"Failed to set RTC: {e}")
             return False
     
+    def sync_time(self, offset_minutes=None):
+        """
+        Synchronize RTC with NTP server
+        
+        Args:
+            offset_minutes: Timezone offset in minutes (uses timezone manager if None)
+        
+        Returns:
+            True if sync successful, False otherwise
+        """
+        if not self.is_available():
+            print("NTP not available (no network support)")
+            return False
+        
+        # Try each NTP server until one works
+        unix_time = None
+        for server in self.NTP_SERVERS:
+            print(f"Trying NTP server: {server}")
+            unix_time = self.get_ntp_time(server)
+            if unix_time is not None:
+                break
+        
+        if unix_time is None:
+            print("Failed to get time from any NTP server")
+            return False
+        
+        return self._set_rtc(unix_time, offset_minutes)
+    
+    async def sync_time_async(self, offset_minutes=None):
+        """sync_time() for AsyncAppManager jobs: waits without blocking the UI"""
+        if not self.is_available():
+            print("NTP not available (no network support)")
+            return False
+        
+        # Try each NTP server until one works
+        unix_time = None
+        for server in self.NTP_SERVERS:
+            print(f"Trying NTP server: {server}")
+            unix_time = await self.get_ntp_time_async(server)
+            if unix_time is not None:
+                break
+        
+        if unix_time is None:
+            print("Failed to get time from any NTP server")
+            return False
+        
+        return self._set_rtc(unix_time, offset_minutes)
+    
     def auto_sync(self):
         """Automatically sync time if WiFi is available"""
         return self.sync_time()
@@ -0,0 +1,213 @@
+# Binary record format for list collections (todos, memos, contacts)
+
+import binascii
+import struct
+
+try:
+    import ujson as json
+except:
+    import json
+
+MAGIC = b"AGB1"
+
+# Fixed fields per collection: name and kind
+#   u32   unsigned 32-bit int (ids, timestamps)
+#   bool  True/False, in the state bits only
+#   str   UTF-8, up to 65535 bytes
+#   b64   base64 text kept as the bytes it encodes (compressed memo text)
+FIELDS = {
+    "todos": (("id", "u32"), ("timestamp", "u32"), ("due_date", "u32"),
+              ("completed", "bool"), ("alarm", "bool"), ("text", "str")),
+    "memos": (("id", "u32"), ("timestamp", "u32"), ("text", "str"), ("p", "str"),
+              ("z", "b64")),
+    "contacts": (("id", "u32"), ("name", "str"), ("phone", "str")),
+}
+
+# Two state bits per field
+_ABSENT = 0  # not in the record, or kept in the extras
+_VALUE = 1  # stored (False for a bool)
+_NONE = 2
+_TRUE = 3
+
+
+class RecordCodec:
+    """Packs records of one collection into bytes and back, losslessly
+    
+    A record is a u32 of state bits (two per field), a u32 per u32 field,
+    a u16 length and the bytes of each str and b64 field, then the fields
+    the layout cannot hold (unknown keys, floats, negative or huge ints,
+    over-long text) as a JSON object filling the rest of the record. A
+    todo with the usual fields therefore costs 16 bytes plus its text
+    instead of ~100 bytes of JSON with the keys spelled out.
+    """
+    
+    def __init__(self, fields):
+        """
+        Args:
+            fields: ((name, kind), ...), at most 16 (see FIELDS)
+        """
+        self.fields = tuple([tuple(f) for f in fields])
+        self._names = set([f[0] for f in self.fields])
+        ints = len([f for f in self.fields if f[1] == "u32"])
+        self._head = "<" + "I" * (1 + ints)
+        self._head_size = struct.calcsize(self._head)
+    
+    def _state(self, kind, value):
+        if value is None:
+            return _NONE
+        if kind == "bool":
+            if value is True:
+                return _TRUE
+            return _VALUE if value is False else _ABSENT
+        if kind == "u32":
+            ok = isinstance(value, int) and not isinstance(value, bool) and 0 <= value < 4294967296
+            return _VALUE if ok else _ABSENT
+        if kind == "b64":
+            return _VALUE if self._raw(value) is not None else _ABSENT
+        if isinstance(value, str) and len(value) < 16384:
+            return _VALUE  # under 64 KiB in UTF-8 for sure
+        return _ABSENT
+    
+    def _raw(self, value):
+        """Bytes of base64 text that encodes back to the same text, or None"""
+        if not isinstance(value, str) or len(value) > 87000:
+            return None
+        try:
+            raw = binascii.a2b_base64(value)
+        except ValueError:
+            return None
+        return raw if _b64(raw) == value else None
+    
+    def encode(self, record):
+        """bytes of a record (a dict)"""
+        states = 0
+        ints = []
+        texts = []
+        extras = None
+        for i, (name, kind) in enumerate(self.fields):
+            state = _ABSENT
+            if name in record:
+                value = record[name]
+                state = self._state(kind, value)
+                if state == _ABSENT:
+                    if extras is None:
+                        extras = {}
+                    extras[name] = value
+            states |= state << (2 * i)
+            if kind == "u32":
+                ints.append(value if state == _VALUE else 0)
+            elif state == _VALUE and kind != "bool":
+                data = value.encode() if kind == "str" else self._raw(value)
+                texts.append(struct.pack("<H", len(data)) + data)
+        for key in record:
+            if key not in self._names:
+                if extras is None:
+                    extras = {}
+                extras[key] = record[key]
+        parts = [struct.pack(self._head, states, *ints)]
+        parts.extend(texts)
+        if extras is not None:
+            parts.append(json.dumps(extras).encode())
+        return b"".join(parts)
+    
+    def decode(self, data):
+        """The record (a dict) of bytes made by encode()"""
+        head = struct.unpack_from(self._head, data, 0)
+        states = head[0]
+        pos = self._head_size
+        record = {}
+        n = 1
+        for i, (name, kind) in enumerate(self.fields):
+            state = (states >> (2 * i)) & 3
+            if kind == "u32":
+                if state == _VALUE:
+                    record[name] = head[n]
+                n += 1
+            elif state == _VALUE and kind != "bool":
+                size = struct.unpack_from("<H", data, pos)[0]
+                raw = bytes(data[pos + 2:pos + 2 + size])
+                record[name] = raw.decode() if kind == "str" else _b64(raw)
+                pos += 2 + size
+                continue
+            if state == _NONE:
+                record[name] = None
+            elif state == _TRUE:
+                record[name] = True
+            elif state == _VALUE and kind == "bool":
+                record[name] = False
+        if pos < len(data):
+            extras = json.loads(bytes(data[pos:]).decode())
+            for key in extras:
+                record[key] = extras[key]
+        return record
+
+
+def _b64(raw):
+    return binascii.b2a_base64(raw).decode().strip()
+
+
+CODECS = {}
+for _name in FIELDS:
+    CODECS[_name] = RecordCodec(FIELDS[_name])
+
+
+def header(codec):
+    """File header: magic, then the field layout as JSON"""
+    layout = json.dumps(codec.fields).encode()
+    return MAGIC + struct.pack("<H", len(layout)) + layout
+
+
+def frame(body):
+    """Length prefix + body of one record in a file"""
+    if len(body) < 0xFFFF:
+        return struct.pack("<H", len(body)) + body
+    return struct.pack("<HI", 0xFFFF, len(body)) + body
+
+
+def read_header(f):
+    """The RecordCodec of a file (positioned after the header)"""
+    head = f.read(6)
+    if len(head) < 6 or head[:4] != MAGIC:
+        raise ValueError("not a record file")
+    size = struct.unpack("<H", head[4:])[0]
+    return RecordCodec(json.loads(f.read(size).decode()))
+
+
+def records(f, chunk=512):
+    """Yield the records of a file, read in chunks"""
+    codec = read_header(f)
+    buf = b""
+    pos = 0
+    while True:
+        # Next length prefix, then the record if the buffer holds it all
+        avail = len(buf) - pos
+        size = -1
+        prefix = 2
+        if avail >= 2:
+            size = struct.unpack_from("<H", buf, pos)[0]
+            if size == 0xFFFF:
+                prefix = 6
+                size = struct.unpack_from("<I", buf, pos + 2)[0] if avail >= 6 else -1
+        if size >= 0 and avail >= prefix + size:
+            yield codec.decode(memoryview(buf)[pos + prefix:pos + prefix + size])
+            pos += prefix + size
+            continue
+        data = f.read(chunk if size < 0 else max(chunk, prefix + size - avail))
+        if not data:
+            if avail:
+                raise ValueError("truncated record file")
+            return
+        buf = buf[pos:] + data
+        pos = 0
+
+
+def dumps(name, items):
+    """bytes of a whole collection in the binary format"""
+    codec = CODECS[name]
+    return b"".join([header(codec)] + [frame(codec.encode(r)) for r in items])
+
+
+def loads(data):
+    """Records of bytes made by dumps() (the JSON list they came from)"""
+    import io
+    return [r for r in records(io.BytesIO(data))]
@@ -0,0 +1,324 @@
+# Full-text search index for DataStore
+
+from core.storage import default_storage
+from core import textpack
+from core.views import _bisect_right
+
+try:
+    import ujson as json
+except:
+    import json
+
+# Indexed collections: code (low 2 bits of a doc key) and text fields
+SEARCHED = {
+    "todos": (0, ("text",)),
+    "memos": (1, ("text",)),
+    "contacts": (2, ("name", "phone")),
+}
+NAMES = ("todos", "memos", "contacts")  # by code
+
+MAX_TOKEN = 12  # longer words are indexed by their first 12 characters
+
+
+def tokens(text):
+    """Lower-case words (runs of letters and digits) of text"""
+    words = []
+    start = -1
+    text = text.lower()
+    for i in range(len(text) + 1):
+        c = text[i] if i < len(text) else " "
+        if c.isalpha() or c.isdigit():
+            if start < 0:
+                start = i
+        elif start >= 0:
+            words.append(text[start:i])
+            start = -1
+    return words
+
+
+def field_text(record, field):
+    """Text of a searched field (a compressed memo text is inflated)"""
+    if field == "text":
+        return textpack.text(record)
+    return record.get(field, "")
+
+
+def record_tokens(name, record):
+    """Index terms of a record"""
+    terms = set()
+    for field in SEARCHED[name][1]:
+        for word in tokens(field_text(record, field)):
+            terms.add(word[:MAX_TOKEN])
+    return terms
+
+
+def record_matches(name, record, words):
+    """True if every word starts a word of the record (checks the index)"""
+    terms = []
+    for field in SEARCHED[name][1]:
+        terms.extend(tokens(field_text(record, field)))
+    for word in words:
+        for term in terms:
+            if term.startswith(word):
+                break
+        else:
+            return False
+    return True
+
+
+def _next(it):
+    """next(it), or None at the end"""
+    try:
+        return next(it)
+    except StopIteration:
+        return None
+
+
+def doc_key(name, record):
+    """Posting list entry of a record: id and collection code in one int"""
+    return record["id"] * 4 + SEARCHED[name][0]
+
+
+class SearchIndex:
+    """Inverted index, token -> doc keys, kept in its own file
+    
+    The file holds one line per token, "<token> <key>,<key>,...", sorted
+    by token after a JSON header with each collection's record count and
+    id sum, which DataStore compares with the collections to catch an
+    index that lost changes. RAM holds only:
+    
+    - a directory of every `step`-th token and its file offset, so a
+      prefix lookup reads one short run of lines
+    - the changes since the last merge: added postings, and the doc keys
+      whose postings in the file are out of date
+    
+    merge() folds the changes into a new file in one streaming pass. It
+    runs on DataStore.flush() and whenever more than `max_delta` changes
+    are pending.
+    """
+    
+    def __init__(self, path, max_delta=1024, step=16, storage=None):
+        """
+        Args:
+            path: Index file
+            max_delta: Pending postings that force a merge
+            step: File lines per directory entry
+            storage: hal StorageInterface (default_storage() if None)
+        """
+        self.path = path
+        self.storage = storage or default_storage()
+        self.max_delta = max_delta
+        self.step = step
+        self._delta = {}  # token -> doc keys added since the last merge
+        self._removed = set()  # doc keys with stale postings in the file
+        self._pending = 0
+        self._changed = False
+        self._dir_tokens = None  # directory, loaded on first lookup
+        self._dir_offsets = None
+        self.docs = self._read_header()  # name -> [records, sum of ids]
+        self.dirty_path = path + ".dirty"  # exists while the file lags the collections
+        self._marked = self.storage.exists(self.dirty_path)
+        
+        # Stats
+        self.merges = 0
+        self.lines_read = 0
+    
+    def _read_header(self):
+        docs = {}
+        try:
+            with self.storage.open(self.path, "rb") as f:
+                line = f.readline()
+            if line.startswith(b"#"):
+                docs = json.loads(line[1:].decode())
+        except (OSError, ValueError):
+            pass
+        for name in NAMES:
+            docs.setdefault(name, [0, 0])
+        return docs
+    
+    def _lines(self):
+        """(token, doc keys) of each file line, in order"""
+        try:
+            f = self.storage.open(self.path, "rb")
+        except OSError:
+            return
+        with f:
+            f.readline()  # header
+            for line in f:
+                self.lines_read += 1
+                token, keys = line.decode().rstrip("\n").split(" ")
+                yield token, [int(k) for k in keys.split(",")]
+    
+    def _load_directory(self):
+        if self._dir_tokens is None:
+            tokens_, offsets = [], []
+            try:
+                with self.storage.open(self.path, "rb") as f:
+                    offset = len(f.readline())
+                    n = 0
+                    for line in f:
+                        if n % self.step == 0:
+                            tokens_.append(line[:line.find(b" ")].decode())
+                            offsets.append(offset)
+                        offset += len(line)
+                        n += 1
+            except OSError:
+                pass
+            self._dir_tokens, self._dir_offsets = tokens_, offsets
+    
+    def add(self, name, record):
+        """Index a new or changed record"""
+        key = doc_key(name, record)
+        for token in record_tokens(name, record):
+            self._delta.setdefault(token, []).append(key)
+            self._pending += 1
+        self._changed = True
+        docs = self.docs[name]
+        docs[0] += 1
+        docs[1] += record["id"]
+        if self._pending > self.max_delta:
+            self.merge()
+    
+    def remove(self, name, record):
+        """Drop a record, indexed with its current fields"""
+        key = doc_key(name, record)
+        for token in record_tokens(name, record):
+            keys = self._delta.get(token)
+            if keys and key in keys:
+                keys.remove(key)
+                self._pending -= 1
+        if key not in self._removed:
+            self._removed.add(key)
+            self._pending += 1
+        self._changed = True
+        docs = self.docs[name]
+        docs[0] -= 1
+        docs[1] -= record["id"]
+        if self._pending > self.max_delta:
+            self.merge()
+    
+    def stale(self):
+        """True if a flush stopped between the collections and merge()
+        
+        An edit can keep the record count and id sum the header checks,
+        so only the marker written by mark_dirty() tells.
+        """
+        return self._marked
+    
+    def mark_dirty(self):
+        """Note on flash that the collections are about to be written
+        ahead of this file (before the flush that ends with merge())"""
+        if self._changed and not self._marked:
+            self.storage.write(self.dirty_path, b"")
+            self._marked = True
+    
+    def clear(self):
+        """Forget everything (the file too); rebuild() fills it again"""
+        self.storage.remove(self.path)
+        self._delta = {}
+        self._removed = set()
+        self._pending = 0
+        self._changed = False
+        self._dir_tokens = self._dir_offsets = None
+        self.docs = self._read_header()
+    
+    def rebuild(self, ds):
+        """Index every record of the searched collections again"""
+        self.clear()
+        for name in NAMES:
+            for record in ds.collection(name, []):
+                self.add(name, record)
+        self._changed = True  # write the header (and drop the marker) if empty
+        self.merge()
+    
+    def merge(self):
+        """Write the pending changes into the index file"""
+        if not self._changed:
+            return
+        pending = sorted(self._delta)
+        tmp = self.path + ".tmp"
+        dir_tokens, dir_offsets = [], []
+        i = written = 0
+        with self.storage.open(tmp, "wb") as out:
+            header = ("#" + json.dumps(self.docs) + "\n").encode()
+            out.write(header)
+            offset = len(header)
+            lines = self._lines()
+            line = _next(lines)
+            while line is not None or i < len(pending):
+                if line is not None and (i == len(pending) or line[0] <= pending[i]):
+                    token = line[0]
+                    keys = [k for k in line[1] if k not in self._removed]
+                    if i < len(pending) and pending[i] == token:
+                        keys.extend(self._delta[token])
+                        i += 1
+                    line = _next(lines)
+                else:
+                    token = pending[i]
+                    keys = self._delta[token]
+                    i += 1
+                if not keys:
+                    continue
+                if written % self.step == 0:
+                    dir_tokens.append(token)
+                    dir_offsets.append(offset)
+                data = (token + " " + ",".join([str(k) for k in keys]) + "\n").encode()
+                out.write(data)
+                offset += len(data)
+                written += 1
+        self.storage.rename(tmp, self.path)
+        if self._marked:
+            self.storage.remove(self.dirty_path)
+            self._marked = False
+        self._delta = {}
+        self._removed = set()
+        self._pending = 0
+        self._changed = False
+        self._dir_tokens, self._dir_offsets = dir_tokens, dir_offsets
+        self.merges += 1
+    
+    def prefix(self, word):
+        """Doc keys of every token starting with word"""
+        word = word[:MAX_TOKEN]
+        found = set()
+        self._load_directory()
+        i = _bisect_right(self._dir_tokens, word) - 1
+        if self._dir_offsets:
+            with self.storage.open(self.path, "rb") as f:
+                f.seek(self._dir_offsets[max(i, 0)])
+                for line in f:
+                    self.lines_read += 1
+                    token, keys = line.decode().rstrip("\n").split(" ")
+                    if token < word:
+                        continue
+                    if not token.startswith(word):
+                        break
+                    for k in keys.split(","):
+                        k = int(k)
+                        if k not in self._removed:
+                            found.add(k)
+        for token, keys in self._delta.items():
+            if token.startswith(word):
+                found.update(keys)
+        return found
+    
+    def search(self, query):
+        """Doc keys matching every word of query as a prefix"""
+        result = None
+        for word in tokens(query):
+            keys = self.prefix(word)
+            result = keys if result is None else result & keys
+            if not result:
+                break
+        return result or set()
+    
+    def stats(self):
+        """Index activity and size"""
+        size = self.storage.size(self.path)
+        return {
+            "merges": self.merges,
+            "lines_read": self.lines_read,
+            "pending": self._pending,
+            "directory": len(self._dir_tokens or ()),
+            "file_bytes": size,
+        }
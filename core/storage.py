@@ -0,0 +1,408 @@
+# DataStore file engines
+#
+# An engine loads one collection at a time (load(name) -> value or None)
+# and writes the collections DataStore marked dirty (write(db, dirty)).
+# core/journal.py adds a log-structured engine with the same interface.
+# All file access goes through a hal StorageInterface, and files are read
+# with core/jsonstream.py so a collection is built one record at a time.
+# ShardedFiles also keeps the record offset indexes behind
+# DataStore.cursor() (write_order() / read_order()), and can store list
+# collections in the binary record format of core/records.py.
+
+import binascii
+import struct
+from hal import get_platform
+from core import jsonstream
+from core import records as binrecords
+
+try:
+    import ujson as json
+except:
+    import json
+
+
+def default_storage():
+    """The platform's StorageInterface (the filesystem)"""
+    platform = get_platform()
+    return platform.storage or platform.init_storage()
+
+
+def _recover(storage, path):
+    """Finish a move over path cut off by a power loss
+
+    storage.rename() removes the old file first on FAT, so a crash can
+    leave only the new one, path + ".tmp", complete. (A .tmp next to an
+    existing path is a write that never finished and is ignored; one
+    cut short on the very first write fails to parse like a damaged file.)
+
+    Returns:
+        True if the .tmp was moved to path
+    """
+    tmp = path + ".tmp"
+    if storage.exists(path) or not storage.exists(tmp):
+        return False
+    storage.rename(tmp, path)
+    return True
+
+
+def _dump(storage, path, value):
+    """Write value as JSON to path + ".tmp", then move it over path
+
+    The old file stays whole until the move; see _recover() for FAT.
+    """
+    tmp = path + ".tmp"
+    with storage.open(tmp, "w") as f:
+        json.dump(value, f)
+    storage.rename(tmp, path)
+
+
+class JsonFile:
+    """The whole database as one JSON file, rewritten on every flush
+
+    load(name) and names() stream the file and build only what they
+    return; the whole database is loaded for the first write().
+    """
+
+    def __init__(self, path, storage=None):
+        """
+        Args:
+            path: Database file
+            storage: hal StorageInterface (default_storage() if None)
+        """
+        self.path = path
+        self.storage = storage or default_storage()
+        self._all = None  # parsed on first write()
+
+        # Stats
+        self.parses = 0
+        self.files_written = 0
+
+    def _load_all(self):
+        if self._all is None:
+            all_ = {}
+            for name, value in self.items():
+                all_[name] = value
+            self._all = all_
+        return self._all
+
+    def _stream(self, read, default):
+        """read(file) on the database file, default if missing or damaged"""
+        try:
+            f = self.storage.open(self.path, "rb")
+        except OSError:
+            if not _recover(self.storage, self.path):
+                return default
+            f = self.storage.open(self.path, "rb")
+        self.parses += 1
+        with f:
+            try:
+                return read(f)
+            except ValueError:
+                return default
+
+    def items(self):
+        """[(name, value)] of every collection"""
+        if self._all is not None:
+            return list(self._all.items())
+        return self._stream(lambda f: [item for item in jsonstream.items(f)], [])
+
+    def names(self):
+        if self._all is not None:
+            return list(self._all.keys())
+        return self._stream(jsonstream.keys, [])
+
+    def load(self, name):
+        if self._all is not None:
+            return self._all.get(name)
+        return self._stream(lambda f: jsonstream.load_key(f, name), None)
+
+    def write(self, db, dirty):
+        all_ = self._load_all()
+        for name in dirty:
+            if name in db:
+                all_[name] = db[name]
+        try:
+            _dump(self.storage, self.path, all_)
+            self.files_written += 1
+        except OSError:
+            pass
+
+    def stats(self):
+        return {"parses": self.parses, "files_written": self.files_written}
+
+
+class ShardedFiles:
+    """One JSON file per collection, parsed only when first used
+
+    "agenda.json" is stored as agenda/settings.json, agenda/todos.json, ...
+    so booting parses the settings only. A monolithic agenda.json left by
+    an older version is split once and kept as agenda.json.bak.
+
+    A list collection is written one record per line. For each sort order
+    DataStore asks for, agenda/<name>.<order>.idx holds a JSON header line
+    (the shard's CRC, the record count and DataStore's extras) followed by
+    an 8-byte (offset, length) entry per record in that order, so
+    read_order() can fetch a window of the sorted list without parsing
+    the shard. An index whose CRC does not match its shard is ignored.
+
+    The collections named in binary are written as agenda/<name>.bin
+    instead (core/records.py). Either file is read, so changing binary
+    converts a collection the next time it is written, or at once with
+    convert().
+    """
+
+    def __init__(self, path, storage=None, binary=()):
+        """
+        Args:
+            path: Monolithic database path the shard directory is named after
+            storage: hal StorageInterface (default_storage() if None)
+            binary: Names of list collections stored as records (todos,
+                memos and/or contacts, see core.records.FIELDS)
+        """
+        self.path = path
+        self.storage = storage or default_storage()
+        self.dir = path[:-5] if path.endswith(".json") else path + ".d"
+        self.binary = [n for n in binary if n in binrecords.CODECS]
+        self._migrated = False
+        self._paths = {}  # name -> shard file holding it
+        self._written = {}  # name -> (offsets, lengths) of the last write
+        self._crcs = {}  # name -> CRC of the shard file
+        self._headers = {}  # (name, order) -> (header, first entry offset)
+
+        # Stats
+        self.parses = 0
+        self.files_written = 0
+        self.records_read = 0
+
+    def _shard(self, name, binary=False):
+        return self.dir + "/" + name + (".bin" if binary else ".json")
+
+    def _stored(self, name):
+        """Path of the shard holding a collection, in either format"""
+        path = self._paths.get(name)
+        if path is None:
+            binary = name in self.binary
+            path = self._shard(name, binary)
+            if not self.storage.exists(path):
+                other = self._shard(name, not binary)
+                if self.storage.exists(other) or _recover(self.storage, other):
+                    path = other
+                else:
+                    _recover(self.storage, path)
+            self._paths[name] = path
+        return path
+
+    def _index(self, name, order):
+        return self.dir + "/" + name + "." + order + ".idx"
+
+    def _write_shard(self, name, value):
+        self.storage.mkdir(self.dir)
+        binary = isinstance(value, list) and name in self.binary
+        path = self._shard(name, binary)
+        if isinstance(value, list):
+            self._write_records(name, value, path, binary)
+        else:
+            _dump(self.storage, path, value)
+            self._crcs.pop(name, None)
+        # The other format's file is stale now
+        if self._paths.get(name) != path:
+            self.storage.remove(self._shard(name, not binary))
+            self._paths[name] = path
+        self.files_written += 1
+
+    def _write_records(self, name, records, path, binary):
+        """A list, one record per line or frame, noting where each record is"""
+        codec = binrecords.CODECS[name] if binary else None
+        tmp = path + ".tmp"
+        offsets, lengths = [], []
+        crc = 0
+        offset = 0
+        with self.storage.open(tmp, "wb") as f:
+            pending = []
+            size = 0
+            for i in range(len(records) + 2):
+                if i == 0:
+                    data = binrecords.header(codec) if binary else b"[\n"
+                elif i > len(records):
+                    data = b"" if binary else b"]\n"
+                elif binary:
+                    body = codec.encode(records[i - 1])
+                    data = binrecords.frame(body)
+                    offsets.append(offset + len(data) - len(body))
+                    lengths.append(len(body))
+                else:
+                    data = json.dumps(records[i - 1]).encode()
+                    offsets.append(offset)
+                    lengths.append(len(data))
+                    data += b",\n" if i < len(records) else b"\n"
+                pending.append(data)
+                offset += len(data)
+                size += len(data)
+                if size >= 512 or i > len(records):
+                    chunk = b"".join(pending)
+                    crc = binascii.crc32(chunk, crc)
+                    f.write(chunk)
+                    pending = []
+                    size = 0
+        self.storage.rename(tmp, path)
+        self._written[name] = (offsets, lengths)
+        self._crcs[name] = crc & 0xFFFFFFFF
+
+    def _crc(self, name):
+        """CRC of a shard, read once per boot (in chunks)"""
+        crc = self._crcs.get(name)
+        if crc is None:
+            crc = 0
+            try:
+                with self.storage.open(self._stored(name), "rb") as f:
+                    while True:
+                        chunk = f.read(512)
+                        if not chunk:
+                            break
+                        crc = binascii.crc32(chunk, crc)
+            except OSError:
+                pass
+            crc &= 0xFFFFFFFF
+            self._crcs[name] = crc
+        return crc
+
+    def _migrate(self):
+        """Split an old monolithic database into shards (once)"""
+        if self._migrated:
+            return
+        self._migrated = True
+        if not self.storage.exists(self.path):
+            return
+        # One collection in RAM at a time
+        self.parses += 1
+        with self.storage.open(self.path, "rb") as f:
+            try:
+                for name, value in jsonstream.items(f):
+                    self._write_shard(name, value)
+            except ValueError:
+                pass  # damaged: keep what was read, the .bak has the rest
+        # Shards are complete: a crash before this line just migrates again
+        self.storage.rename(self.path, self.path + ".bak")
+
+    def names(self):
+        self._migrate()
+        try:
+            files = self.storage.listdir(self.dir)
+        except OSError:
+            return []
+        names = []
+        for f in files:
+            if f.endswith(".tmp"):
+                f = f[:-4]  # a move load() finishes, see _recover()
+            name = f[:-5] if f.endswith(".json") else f[:-4] if f.endswith(".bin") else None
+            if name is not None and name not in names:
+                names.append(name)
+        return names
+
+    def load(self, name):
+        self._migrate()
+        path = self._stored(name)
+        try:
+            f = self.storage.open(path, "rb")
+        except OSError:
+            return None
+        self.parses += 1
+        with f:
+            try:
+                if path.endswith(".bin"):
+                    return [r for r in binrecords.records(f)]
+                return jsonstream.load(f)
+            except ValueError:
+                return None
+
+    def convert(self, name):
+        """Rewrite a stored collection in its format (see binary)
+
+        Returns:
+            False if the collection is missing or damaged
+        """
+        value = self.load(name)
+        if value is None:
+            return False
+        self._write_shard(name, value)
+        return True
+
+    def write(self, db, dirty):
+        self._migrate()
+        self._written = {}
+        for name in dirty:
+            if name in db:
+                self._write_shard(name, db[name])
+
+    def write_order(self, name, order, positions, info):
+        """Index the collection written by the last write() in an order
+
+        Args:
+            positions: Stored position of each record, in the order
+            info: Extra header fields (DataStore's schema version, ...)
+        """
+        written = self._written.get(name)
+        if written is None:
+            return
+        offsets, lengths = written
+        header = {}
+        for k in info:
+            header[k] = info[k]
+        header["crc"] = self._crcs[name]
+        header["count"] = len(positions)
+        line = ("#" + json.dumps(header) + "\n").encode()
+        path = self._index(name, order)
+        tmp = path + ".tmp"
+        with self.storage.open(tmp, "wb") as f:
+            f.write(line)
+            for start in range(0, len(positions), 64):
+                entries = bytearray()
+                for i in positions[start:start + 64]:
+                    entries += struct.pack("<II", offsets[i], lengths[i])
+                f.write(entries)
+        self.storage.rename(tmp, path)
+        self._headers[(name, order)] = (header, len(line))
+
+    def _order_header(self, name, order):
+        cached = self._headers.get((name, order))
+        if cached is None:
+            try:
+                with self.storage.open(self._index(name, order), "rb") as f:
+                    line = f.readline()
+                cached = (json.loads(line[1:].decode()), len(line))
+            except (OSError, ValueError):
+                return None
+            self._headers[(name, order)] = cached
+        return cached
+
+    def read_order(self, name, order, start, count):
+        """(header, records) of positions start.. of an order, or None
+
+        None when there is no up-to-date index: the caller loads the
+        collection instead. count 0 reads just the header.
+        """
+        self._migrate()
+        cached = self._order_header(name, order)
+        if cached is None or cached[0].get("crc") != self._crc(name):
+            return None
+        header, first = cached
+        count = max(0, min(count, header["count"] - start))
+        records = []
+        if count:
+            with self.storage.open(self._index(name, order), "rb") as f:
+                f.seek(first + 8 * start)
+                entries = f.read(8 * count)
+            path = self._stored(name)
+            with self.storage.open(path, "rb") as f:
+                codec = binrecords.read_header(f) if path.endswith(".bin") else None
+                for i in range(0, len(entries), 8):
+                    offset, length = struct.unpack("<II", entries[i:i + 8])
+                    f.seek(offset)
+                    data = f.read(length)
+                    records.append(codec.decode(data) if codec else json.loads(data.decode()))
+            self.records_read += count
+        return header, records
+
+    def stats(self):
+        return {"parses": self.parses, "files_written": self.files_written,
+                "records_read": self.records_read}
@@ -0,0 +1,91 @@
+# Deflate-compressed long text fields (memo text)
+#
+# A long memo is stored without "text": its first PREVIEW characters go
+# to "p", which the list screens and cursor() pages show as they are, and
+# the whole text compressed to "z" (zlib format, base64). So "text" is
+# always whole or missing, never cut short. text() inflates "z" only when
+# a memo is opened. MicroPython 1.21+ has the deflate module, CPython
+# zlib; with neither, text is stored plain. deflate can only compress if
+# the firmware is built with MICROPY_PY_DEFLATE_COMPRESS, which stock rp2
+# builds leave out: they inflate fine but store new text plain.
+
+import binascii
+
+try:
+    import deflate  # MicroPython
+    import io
+    zlib = None
+except ImportError:
+    deflate = None
+    try:
+        import zlib
+    except ImportError:
+        zlib = None
+
+PREVIEW = 32  # characters kept plain
+PACK_OVER = 160  # longer texts are compressed
+WBITS = 10  # 1 KiB window: the RAM inflating a memo costs on the Pico
+
+
+def available():
+    """True if texts can be compressed here"""
+    if deflate is not None:
+        return hasattr(deflate.DeflateIO, "write")
+    return zlib is not None
+
+
+def compress(data):
+    """zlib bytes of data"""
+    if deflate is not None:
+        buf = io.BytesIO()
+        f = deflate.DeflateIO(buf, deflate.ZLIB, WBITS)
+        f.write(data)
+        f.close()
+        return buf.getvalue()
+    c = zlib.compressobj(9, zlib.DEFLATED, WBITS)
+    return c.compress(data) + c.flush()
+
+
+def decompress(data):
+    """bytes of zlib data made by compress()"""
+    if deflate is not None:
+        return deflate.DeflateIO(io.BytesIO(data), deflate.ZLIB).read()
+    return zlib.decompress(data)
+
+
+def pack(record):
+    """Compress the text of a record in place if that saves space
+
+    A record given a new "text" (update_record) drops its old "p" and "z"
+    first. Short texts (or no compressor) stay in "text"; a record already
+    packed, with no "text", is left alone.
+    """
+    text = record.get("text")
+    if not isinstance(text, str):
+        return record
+    record.pop("p", None)
+    record.pop("z", None)
+    if len(text) <= PACK_OVER or not available():
+        return record
+    data = text.encode()
+    z = binascii.b2a_base64(compress(data)).decode().strip()
+    if len(z) + PREVIEW < len(data):
+        del record["text"]
+        record["p"] = text[:PREVIEW]
+        record["z"] = z
+    return record
+
+
+def text(record):
+    """Whole text of a record, inflated if it is compressed"""
+    z = record.get("z")
+    if z is None or "text" in record:
+        return record.get("text", "")
+    return decompress(binascii.a2b_base64(z)).decode()
+
+
+def preview(record):
+    """Start of the text of a record (at least PREVIEW characters), as stored"""
+    if "text" in record:
+        return record["text"]
+    return record.get("p", "")
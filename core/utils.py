@@ -28,15 +28,17 @@ class Utils:
                 buf.append(ch)
 class AppHelper:
     @staticmethod
-    def list_paginated(ctx, app, title, items, fmt_fn, add_fn):
+    def list_paginated(ctx, app, title, name, fmt_fn, add_fn):
+        # name: DataStore list collection, read a page at a time (cursor)
         page, size = 0, 6
         while True:
             cls(ctx); header(ctx, title)
-            if not items:
+            total = ctx.ds.count(name)
+            if not total:
                 ctx.d.text("(vacio) a=añadir, q=salir", 0, 16, ctx.W, 1)
             else:
                 start = page*size
-                chunk = items[start:start+size]
+                chunk = ctx.ds.cursor(name, None, start, size)
                 y = 12
                 for i, it in enumerate(chunk, start=1):
                     ctx.d.text("{:02d}. {}".format(i+start, fmt_fn(it)), 0, y, ctx.W, 1); y += 8
@@ -59,9 +61,9 @@ class AppHelper:
                 return
             if k == ord('a'):
                 add_fn(ctx)
-                # refresh and move to last page
-                items = ctx.ds.load_contacts() if title=="TEL" else ctx.ds.load_memos()
-                if items: page = max(0, (len(items)-1)//size)
+                # move to last page
+                total = ctx.ds.count(name)
+                if total: page = max(0, (total-1)//size)
                 continue
-            if k == ord('j') and (page+1)*size < len(items): page += 1
+            if k == ord('j') and (page+1)*size < total: page += 1
             if k == ord('k') and page>0: page -= 1
@@ -0,0 +1,157 @@
+# Sorted views over DataStore collections
+
+
+def _bisect_left(keys, key):
+    """First index whose key is >= key (MicroPython has no bisect)"""
+    lo, hi = 0, len(keys)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if keys[mid] < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _bisect_right(keys, key):
+    """First index whose key is > key"""
+    lo, hi = 0, len(keys)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if key < keys[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def todo_order(t):
+    """Incomplete first, then by due date (soonest first), then newest"""
+    if t['completed']:
+        return (1, float('inf'), 0)
+    return (0, t['due_date'] or float('inf'), -t['timestamp'])
+
+
+def memo_order(m):
+    """Newest first, undated (timestamp 0) last"""
+    return -m['timestamp'] if m['timestamp'] else float('inf')
+
+
+def contact_order(c):
+    """Normalized name: case and surrounding spaces ignored"""
+    return c.get('name', '').strip().lower()
+
+
+class SortedView:
+    """The records of a collection kept sorted by key(record)
+    
+    Sorted once when built, then kept in order by insert()/remove() with a
+    binary search, so a list screen reads its visible window with a slice.
+    Records with equal keys are kept in the order they were inserted.
+    Indexing and slicing return records; do not mutate a record's sort
+    fields without remove()/insert() around the change.
+    """
+    
+    def __init__(self, records, key):
+        self.key = key
+        keyed = [(key(r), i) for i, r in enumerate(records)]
+        keyed.sort()
+        self.keys = [k for k, i in keyed]
+        self.items = [records[i] for k, i in keyed]
+        self.version = None  # DataStore.version() the view matches
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def __getitem__(self, index):
+        return self.items[index]
+    
+    def index(self, record):
+        """Position of record (by identity), or -1"""
+        key = self.key(record)
+        i = _bisect_left(self.keys, key)
+        while i < len(self.items) and self.keys[i] == key:
+            if self.items[i] is record:
+                return i
+            i += 1
+        return -1
+    
+    def insert(self, record):
+        """Add record after any records with the same key"""
+        key = self.key(record)
+        i = _bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.items.insert(i, record)
+        return i
+    
+    def remove(self, record):
+        """Drop record, found by its current key"""
+        i = self.index(record)
+        if i >= 0:
+            self.keys.pop(i)
+            self.items.pop(i)
+        return i
+
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz{'  # '{' sorts right after 'z'
+
+
+def letter_range(table, letter):
+    """(start, end) positions of the names starting with letter
+    
+    table holds the position of the first name >= each of LETTERS
+    (ContactIndex.table(), or DataStore.table() for a list not in RAM).
+    """
+    i = LETTERS.find(letter.lower())
+    if i < 0 or i > 25:
+        return (0, 0)
+    return (table[i], table[i + 1])
+
+
+def table_letters(table):
+    """Upper-case letters that have names in a letter table, in order"""
+    return [LETTERS[i].upper() for i in range(26) if table[i] < table[i + 1]]
+
+
+class ContactIndex(SortedView):
+    """Contacts sorted by normalized name, with a letter offset table
+    
+    Each letter's contacts are a contiguous run of the view; the table of
+    run starts is rebuilt (27 binary searches) after an edit, on first use.
+    """
+    
+    LETTERS = LETTERS
+    
+    def __init__(self, records, key=contact_order):
+        super().__init__(records, key)
+        self._offsets = None
+    
+    def table(self):
+        """View position of the first name >= each of LETTERS"""
+        if self._offsets is None:
+            self._offsets = [_bisect_left(self.keys, l) for l in LETTERS]
+        return self._offsets
+    
+    def letter_range(self, letter):
+        """(start, end) view positions of the names starting with letter"""
+        return letter_range(self.table(), letter)
+    
+    def letters(self):
+        """Upper-case letters that have contacts, in order"""
+        return table_letters(self.table())
+    
+    def find_prefix(self, prefix):
+        """Position of the first name starting with prefix, or -1"""
+        prefix = prefix.strip().lower()
+        i = _bisect_left(self.keys, prefix)
+        if i < len(self.keys) and self.keys[i].startswith(prefix):
+            return i
+        return -1
+    
+    def insert(self, record):
+        self._offsets = None
+        return super().insert(record)
+    
+    def remove(self, record):
+        self._offsets = None
+        return super().remove(record)
@@ -3,6 +3,11 @@
 import time
 from secrets import secrets
 
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
 SSID = secrets.get("WIFI_SSID")
 PWD  = secrets.get("WIFI_PASSWORD")
 if not SSID or not PWD:
@@ -96,17 +101,11 @@ class WiFiManager:
             print("WiFi scan error:", e)
             return []
     
-    def connect(self, ssid=None, password=None, timeout=15):
-        """
-        Connect to WiFi network
+    def _connect_steps(self, ssid, password, timeout):
+        """Connection procedure shared by connect() and connect_async()
         
-        Args:
-            ssid: WiFi network name (uses stored setting if None)
-            password: WiFi password (uses stored setting if None)
-            timeout: Connection timeout in seconds
-        
-        Returns:
-            True if connected, False otherwise
+        Generator that yields the seconds to wait between steps; its return
+        value is the result (True if connected).
         """
         if not self.is_available():
             return False
@@ -130,7 +129,7 @@ class WiFiManager:
             # Disconnect if already connected
             if self.wlan.isconnected():
                 self.wlan.disconnect()
-                time.sleep(0.5)
+                yield 0.5
             
             # Connect to network
             print(f"Connecting to WiFi: {ssid}")
@@ -142,7 +141,7 @@ class WiFiManager:
                 if time.time() - start > timeout:
                     print("WiFi connection timeout")
                     return False
-                time.sleep(0.5)
+                yield 0.5
             
             self.connected = True
             ip = self.get_ip()
@@ -154,6 +153,34 @@ class WiFiManager:
             self.connected = False
             return False
     
+    def connect(self, ssid=None, password=None, timeout=15):
+        """
+        Connect to WiFi network
+        
+        Args:
+            ssid: WiFi network name (uses stored setting if None)
+            password: WiFi password (uses stored setting if None)
+            timeout: Connection timeout in seconds
+        
+        Returns:
+            True if connected, False otherwise
+        """
+        steps = self._connect_steps(ssid, password, timeout)
+        try:
+            while True:
+                time.sleep(next(steps))
+        except StopIteration as e:
+            return e.value
+    
+    async def connect_async(self, ssid=None, password=None, timeout=15):
+        """connect() for AsyncAppManager jobs: waits without blocking the UI"""
+        steps = self._connect_steps(ssid, password, timeout)
+        try:
+            while True:
+                await asyncio.sleep(next(steps))
+        except StopIteration as e:
+            return e.value
+    
     def disconnect(self):
         """Disconnect from WiFi"""
         if not self.is_available():
@@ -131,9 +131,14 @@ echo ""
 
 echo -e "${BLUE}--- Phase 2: Uploading HAL modules ---${NC}"
 upload_file "hal/__init__.py" "hal/__init__.py"
+upload_file "hal/bitmap.py" "hal/bitmap.py"
 upload_file "hal/color.py" "hal/color.py"
+upload_file "hal/damage.py" "hal/damage.py"
+upload_file "hal/fonts.py" "hal/fonts.py"
 upload_file "hal/interfaces.py" "hal/interfaces.py"
+upload_file "hal/layer.py" "hal/layer.py"
 upload_file "hal/platform.py" "hal/platform.py"
+upload_file "hal/text_cache.py" "hal/text_cache.py"
 upload_file "hal/real/__init__.py" "hal/real/__init__.py"
 upload_file "hal/real/backlight.py" "hal/real/backlight.py"
 upload_file "hal/real/clock.py" "hal/real/clock.py"
@@ -145,6 +150,13 @@ echo ""
 echo -e "${BLUE}--- Phase 3: Uploading core modules ---${NC}"
 upload_file "core/__init__.py" "core/__init__.py"
 upload_file "core/context.py" "core/context.py"
+upload_file "core/storage.py" "core/storage.py"
+upload_file "core/jsonstream.py" "core/jsonstream.py"
+upload_file "core/records.py" "core/records.py"
+upload_file "core/textpack.py" "core/textpack.py"
+upload_file "core/journal.py" "core/journal.py"
+upload_file "core/views.py" "core/views.py"
+upload_file "core/search.py" "core/search.py"
 upload_file "core/ui.py" "core/ui.py"
 upload_file "core/input.py" "core/input.py"
 upload_file "core/utils.py" "core/utils.py"
@@ -156,6 +168,7 @@ echo ""
 echo -e "${BLUE}--- Phase 4: Uploading app modules ---${NC}"
 upload_file "apps/__init__.py" "apps/__init__.py"
 upload_file "apps/base.py" "apps/base.py"
+upload_file "apps/async_manager.py" "apps/async_manager.py"
 upload_file "apps/clock.py" "apps/clock.py"
 upload_file "apps/calculator.py" "apps/calculator.py"
 upload_file "apps/settings.py" "apps/settings.py"
@@ -170,6 +183,7 @@ upload_file "apps/w_brightness.py" "apps/w_brightness.py"
 upload_file "apps/todos.py" "apps/todos.py"
 upload_file "apps/timezone_selector.py" "apps/timezone_selector.py"
 upload_file "apps/sysinfo.py" "apps/sysinfo.py"
+upload_file "apps/search.py" "apps/search.py"
 
 echo -e "${BLUE}--- Phase 5: Uploading assets ---${NC}"
 upload_file "assets/quotes.txt" "assets/quotes.txt"
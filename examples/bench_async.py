@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+UI responsiveness during a network operation
+
+A key is pressed every 100 ms while a 3 s WiFi-style connect runs (link
+polled every 0.5 s). Reports the key -> redrawn screen latency with the
+old blocking startup (connect, then AppManager) and with AsyncAppManager
+running the connect as a background job. Then counts how often each loop
+wakes up to look for input while the clock sits idle: AsyncAppManager
+polls only while a job runs, and otherwise blocks in hal_input.wait()
+like AppManager. Also checks that an exception in a key handler or an
+async tick ends AsyncAppManager.main() with it.
+
+    python examples/bench_async.py
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+# Headless simulator, no window needed
+os.environ.setdefault('HEADLESS', '1')
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hal import get_platform
+from apps.base import AppManager, IconMenu
+from apps.async_manager import AsyncAppManager
+from apps.clock import ClockApp
+
+NETWORK_S = 3.0
+RUN_S = 3.5
+KEY_EVERY_S = 0.1
+IDLE_S = 2.0
+
+
+class Stop(Exception):
+    pass
+
+
+class BenchContext:
+    """The few Context attributes the benchmarked apps use"""
+
+    def __init__(self, platform):
+        self.d = platform.init_display(width=128, height=64, scale=1)
+        self.hal_input = platform.init_input()
+        self.hal_clock = platform.init_clock()
+        self.W, self.H = 128, 64
+        self.INK, self.BG = 15, 0
+        self.settings = {"clock_24h": True}
+
+
+def network_steps():
+    """A WiFi connect: the link is polled every 0.5 s until it comes up"""
+    start = time.monotonic()
+    while time.monotonic() - start < NETWORK_S:
+        yield 0.5
+
+
+def blocking_connect():
+    for s in network_steps():
+        time.sleep(s)
+
+
+async def async_connect():
+    for s in network_steps():
+        await asyncio.sleep(s)
+
+
+class LatencyProbe:
+    """Presses keys from a thread and times them until the next draw"""
+
+    def __init__(self, ctx, menu):
+        self.ctx = ctx
+        self.fed = []       # press times, in order
+        self.handled = []   # press times of keys handled, not drawn yet
+        self.latencies = []
+        handle_key, draw = menu.handle_key, menu.draw
+
+        def timed_handle_key(ctx, k):
+            self.handled.append(self.fed.pop(0))
+            return handle_key(ctx, k)
+
+        def timed_draw(ctx):
+            draw(ctx)
+            now = time.monotonic()
+            self.latencies.extend((now - t) * 1000 for t in self.handled)
+            self.handled = []
+        menu.handle_key, menu.draw = timed_handle_key, timed_draw
+
+    def _press(self):
+        key = 0xB7  # right arrow, then left, ...
+        end = time.monotonic() + NETWORK_S
+        while time.monotonic() < end:
+            self.fed.append(time.monotonic())
+            self.ctx.hal_input.feed([key])
+            key = 0xB4 if key == 0xB7 else 0xB7
+            time.sleep(KEY_EVERY_S)
+
+    def start(self):
+        threading.Thread(target=self._press, daemon=True).start()
+
+    def report(self, name):
+        lat = sorted(self.latencies)
+        if not lat:
+            print("{:<10} no keys drawn".format(name))
+            return
+        print("{:<10}{:>6}{:>10.1f}{:>10.1f}{:>10.1f}".format(
+            name, len(lat), sum(lat) / len(lat), lat[len(lat) // 2], lat[-1]))
+
+
+class StopClock:
+    """Platform clock that ends the run once `until` ms have passed"""
+
+    def __init__(self, clock, until):
+        self._clock = clock
+        self.until = until
+
+    def ticks_ms(self):
+        now = self._clock.ticks_ms()
+        if now >= self.until:
+            raise Stop
+        return now
+
+    def ticks_diff(self, ticks1, ticks2):
+        return self._clock.ticks_diff(ticks1, ticks2)
+
+    def sleep_ms(self, ms):
+        self._clock.sleep_ms(ms)
+
+
+def make_menu():
+    return IconMenu([{"name": "Clock", "app": ClockApp()},
+                     {"name": "Clock", "app": ClockApp()}])
+
+
+def run_blocking(ctx):
+    menu = make_menu()
+    probe = LatencyProbe(ctx, menu)
+    clock = ctx.hal_clock
+    until = clock.ticks_ms() + int(RUN_S * 1000)
+    probe.start()
+    blocking_connect()  # old main(): init_wifi() before the loop starts
+    ctx.hal_clock = StopClock(clock, until)
+    try:
+        AppManager(ctx, menu).run()
+    except Stop:
+        pass
+    ctx.hal_clock = clock
+    return probe
+
+
+def run_async(ctx):
+    menu = make_menu()
+    probe = LatencyProbe(ctx, menu)
+    manager = AsyncAppManager(ctx, menu)
+    manager.spawn(async_connect())
+    probe.start()
+    try:
+        asyncio.run(asyncio.wait_for(manager.main(), RUN_S))
+    except asyncio.TimeoutError:
+        pass
+    return probe
+
+
+class CountingInput:
+    """hal_input wrapper counting wait() calls"""
+
+    def __init__(self, hal_input):
+        self._input = hal_input
+        self.waits = 0
+
+    def wait(self, timeout_ms):
+        self.waits += 1
+        return self._input.wait(timeout_ms)
+
+    def __getattr__(self, name):
+        return getattr(self._input, name)
+
+
+def idle_waits(ctx, manager_class):
+    """Input wait() calls per second with the clock on screen, no keys"""
+    hal_input = ctx.hal_input
+    ctx.hal_input = CountingInput(hal_input)
+    manager = manager_class(ctx, ClockApp())
+    clock = ctx.hal_clock
+    try:
+        if manager_class is AsyncAppManager:
+            asyncio.run(asyncio.wait_for(manager.main(), IDLE_S))
+        else:
+            ctx.hal_clock = StopClock(clock, clock.ticks_ms() + int(IDLE_S * 1000))
+            manager.run()
+    except (asyncio.TimeoutError, Stop):
+        pass
+    waits = ctx.hal_input.waits
+    ctx.hal_input, ctx.hal_clock = hal_input, clock
+    return waits / IDLE_S
+
+
+class Broken(Exception):
+    pass
+
+
+class KeyFails(ClockApp):
+    def handle_key(self, ctx, k):
+        raise Broken("handle_key")
+
+
+class TickFails(ClockApp):
+    async def tick(self, ctx):
+        await asyncio.sleep(0.05)
+        raise Broken("tick")
+
+
+def error_raised(ctx, app):
+    """The exception that ended main(), or None if it kept running"""
+    manager = AsyncAppManager(ctx, app)
+    ctx.hal_input.feed([0xB7])
+    try:
+        asyncio.run(asyncio.wait_for(manager.main(), 1.0))
+    except Broken as e:
+        return e
+    except asyncio.TimeoutError:
+        pass
+    return None
+
+
+def main():
+    ctx = BenchContext(get_platform())
+    print("{:<10}{:>6}{:>10}{:>10}{:>10}".format("loop", "keys", "avg ms", "p50 ms", "max ms"))
+    run_blocking(ctx).report("blocking")
+    run_async(ctx).report("async")
+    print()
+    blocking = idle_waits(ctx, AppManager)
+    async_ = idle_waits(ctx, AsyncAppManager)
+    print("idle input waits/s: blocking {:.1f}, async {:.1f}".format(blocking, async_))
+    if async_ > 2 * blocking + 2:
+        print("FAIL: the async loop polls while idle")
+        sys.exit(1)
+    for app in (KeyFails(), TickFails()):
+        if error_raised(ctx, app) is None:
+            print("FAIL: {} error did not reach main()".format(type(app).__name__))
+            sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark for DisplaySim.blit
+
+Compares the old per-pixel set_at() loop with the buffer-at-a-time blit()
+for RGB888, RGB565 and P4 buffers at a few typical sizes.
+"""
+
+import os
+import sys
+import time
+
+# Set simulator mode, no window needed
+os.environ['SIM'] = '1'
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hal.sim.display import DisplaySim
+from hal.color import blit_size
+import pygame
+
+
+SIZES = [(32, 32), (128, 64), (240, 240)]
+FORMATS = ["RGB888", "RGB565", "P4"]
+
+
+def legacy_blit(display, x, y, buf, w, h):
+    """The previous DisplaySim.blit: one set_at() per pixel (RGB888 only)"""
+    surface = pygame.Surface((w, h))
+    for py in range(h):
+        for px in range(w):
+            idx = (py * w + px) * 3
+            if idx + 2 < len(buf):
+                color = (buf[idx], buf[idx+1], buf[idx+2])
+                surface.set_at((px, py), color)
+    display._framebuffer.blit(surface, (x, y))
+
+
+def time_ms(fn, min_runs=3, min_time=0.2):
+    """Average milliseconds per call"""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if runs >= min_runs and elapsed >= min_time:
+            return elapsed * 1000 / runs
+
+
+def main():
+    display = DisplaySim(240, 240, scale=1)
+    display.init()
+
+    print("{:<10} {:<8} {:>12} {:>12} {:>9}".format("size", "format", "legacy ms", "blit ms", "speedup"))
+    for w, h in SIZES:
+        for fmt in FORMATS:
+            buf = os.urandom(blit_size(fmt, w, h))
+            new = time_ms(lambda: display.blit(0, 0, buf, w, h, fmt))
+            if fmt == "RGB888":
+                old = time_ms(lambda: legacy_blit(display, 0, 0, buf, w, h))
+                print("{:<10} {:<8} {:>12.3f} {:>12.3f} {:>8.0f}x".format(
+                    "%dx%d" % (w, h), fmt, old, new, old / new))
+            else:
+                # Not supported before, only the new path is timed
+                print("{:<10} {:<8} {:>12} {:>12.3f} {:>9}".format(
+                    "%dx%d" % (w, h), fmt, "-", new, "-"))
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
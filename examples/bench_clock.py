@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Per-frame timing of the clock screen
+
+Times ClockApp.draw() (and draw() + update()) on the simulator display,
+or on the headless one with HEADLESS=1, and counts the display calls a
+frame makes (each one is a Python -> PicoGraphics round trip on the device).
+"""
+
+import os
+import sys
+import time
+
+# Set simulator mode, no window needed
+os.environ.setdefault('SIM', '1')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hal import get_platform
+from apps.clock import ClockApp
+
+
+class BenchContext:
+    """The few Context attributes ClockApp uses"""
+
+    def __init__(self, display):
+        self.d = display
+        self.W, self.H = 128, 64
+        self.INK, self.BG = 15, 0
+        self.settings = {"clock_24h": True}
+
+
+class CallCounter:
+    """Display wrapper that counts drawing calls"""
+
+    def __init__(self, display):
+        self._display = display
+        self.calls = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self._display, name)
+        if not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return attr(*args, **kwargs)
+        return counted
+
+
+def time_ms(fn, frames=500, repeats=9):
+    """Best average milliseconds per call over a few runs"""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(frames):
+            fn()
+        ms = (time.perf_counter() - start) * 1000 / frames
+        best = ms if best is None else min(best, ms)
+    return best
+
+
+def main():
+    display = get_platform().init_display(width=128, height=64, scale=1)
+    ctx = BenchContext(display)
+    app = ClockApp()
+    app.draw(ctx)
+
+    def frame():
+        app.draw(ctx)
+        display.update()
+
+    counter = CallCounter(display)
+    ctx.d = counter
+    app.draw(ctx)
+    ctx.d = display
+
+    print("backend:         {}".format(type(display).__name__))
+    print("display calls:   {}".format(counter.calls))
+    print("draw():          {:.3f} ms".format(time_ms(lambda: app.draw(ctx))))
+    print("draw()+update(): {:.3f} ms".format(time_ms(frame)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+List screens read through DataStore.cursor() as collections grow
+
+For 1k, 10k and 30k records per collection: writes the database, then
+boots a fresh DataStore and draws the Todos, Memos and Contacts list
+screens, which fetch only their visible rows from the offset indexes
+(agenda/<name>.<order>.idx). Reports the first frame (time and peak
+tracemalloc KiB) and later frames, against the same screen drawn from a
+loaded collection (parse + sort of every record). Also checks cursor
+pages, the contacts letter table and seek() against the loaded views.
+
+    python examples/bench_cursor.py [sizes...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Headless simulator, no window needed
+os.environ.setdefault('HEADLESS', '1')
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hal import get_platform
+from core.context import DataStore, ORDERS
+from apps.todos import TodoApp
+from apps.memos import MemosApp
+from apps.contacts import ContactsApp
+
+FRAMES = 50
+SCREENS = (("todos", TodoApp), ("memos", MemosApp), ("contacts", ContactsApp))
+
+
+class BenchContext:
+    """The few Context attributes the benchmarked apps use"""
+
+    def __init__(self, path):
+        platform = get_platform()
+        self.d = platform.init_display(width=128, height=64, scale=1)
+        self.ds = DataStore(path)
+        self.W, self.H = 128, 64
+        self.INK, self.BG = 15, 0
+
+
+def make_db(path, n):
+    now = 1700000000
+    ds = DataStore(path)
+    ds.save_todos([{"text": "Todo %d" % i, "completed": i % 3 == 0,
+                    "due_date": now + (i * 7919 % n) * 60 if i % 2 else None,
+                    "alarm": False, "timestamp": now - i} for i in range(n)])
+    ds.save_memos([{"text": "Memo %d " % i + "lorem ipsum " * 10,
+                    "timestamp": now - (i * 7919 % n)} for i in range(n)])
+    ds.save_contacts([{"name": "%s%s %d" % (chr(65 + i % 26), chr(97 + i * 7 % 26), i * 7919 % n),
+                       "phone": "555-%04d" % i} for i in range(n)])
+
+
+def first_frame(path, name, app_class, load):
+    """(ms, peak KiB, ctx, app) of the first frame on a fresh DataStore"""
+    ctx = BenchContext(path)
+    app = app_class()
+    tracemalloc.start()
+    start = time.perf_counter()
+    if load:
+        ctx.ds.view(name)  # what the screens did before cursor()
+    app.draw(ctx)
+    ms = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return ms, peak // 1024, ctx, app
+
+
+def frame_ms(ctx, app):
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        app.selected_index = i * 37
+        app.draw(ctx)
+    return (time.perf_counter() - start) * 1000 / FRAMES
+
+
+def check(path, n):
+    """Cursor pages from the files match the loaded views"""
+    disk = DataStore(path)
+    ram = DataStore(path)
+    for name in ORDERS:
+        view = ram.view(name)
+        if disk.count(name) != len(view):
+            return "{} count".format(name)
+        for start in (0, 1, n // 2, n - 3):
+            page = disk.cursor(name, None, start, 5)
+            if [r['id'] for r in page] != [r['id'] for r in view[start:start + 5]]:
+                return "{} page at {}".format(name, start)
+    if disk.table('contacts') != ram.view('contacts').table():
+        return "contacts letter table"
+    for prefix in ("mg", "a", "zz", "k"):
+        if disk.seek('contacts', prefix) != ram.seek('contacts', prefix):
+            return "seek " + prefix
+    if disk.stats()["loaded"] != []:
+        return "collections loaded: {}".format(disk.stats()["loaded"])
+    return None
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 10000, 30000]
+    print("{:<10}{:>8}{:>13}{:>10}{:>13}{:>10}{:>11}".format(
+        "screen", "records", "loaded 1st", "peak KiB", "cursor 1st", "peak KiB", "cursor ms"))
+    for n in sizes:
+        path = os.path.join(tempfile.mkdtemp(), "agenda.json")
+        make_db(path, n)
+        failed = check(path, n)
+        if failed:
+            print("FAIL: " + failed)
+            sys.exit(1)
+        for name, app_class in SCREENS:
+            load_ms, load_peak, _, _ = first_frame(path, name, app_class, True)
+            cur_ms, cur_peak, ctx, app = first_frame(path, name, app_class, False)
+            later = frame_ms(ctx, app)
+            if name in ctx.ds.stats()["loaded"]:
+                print("FAIL: {} loaded by its list screen".format(name))
+                sys.exit(1)
+            print("{:<10}{:>8}{:>13.1f}{:>10}{:>13.2f}{:>10}{:>11.2f}".format(
+                app_class.__name__[:-3], n, load_ms, load_peak, cur_ms, cur_peak, later))
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+DataStore file traffic of the list screens
+
+Draws the Todos, Calendar, Contacts and Memos screens on the headless
+display from a generated database and counts file parses and writes
+(DataStore.stats()), then toggles a todo a few times in a row to show the
+edits being coalesced into one write. Starts with the boot cost of
+loading the settings from one agenda.json (JsonFile) and from the
+per-collection files (ShardedFiles).
+
+    python examples/bench_datastore.py [records per collection]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Headless simulator, no window needed
+os.environ.setdefault('HEADLESS', '1')
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hal import get_platform
+from core.context import DataStore
+from core.storage import JsonFile, ShardedFiles
+from apps.todos import TodoApp
+from apps.calendar import CalendarApp
+from apps.contacts import ContactsApp
+from apps.memos import MemosApp
+
+FRAMES = 100
+
+
+class BenchContext:
+    """The few Context attributes the benchmarked apps use"""
+
+    def __init__(self, platform, path):
+        self.d = platform.init_display(width=128, height=64, scale=1)
+        self.hal_clock = platform.init_clock()
+        self.ds = DataStore(path, clock=self.hal_clock)
+        self.W, self.H = 128, 64
+        self.INK, self.BG = 15, 0
+        self.settings = self.ds.load_settings({"clock_24h": True})
+
+
+def make_db(n):
+    now = int(time.time())
+    return {
+        "settings": {},
+        "todos": [{"text": "Todo %d" % i, "completed": i % 3 == 0,
+                   "due_date": now + i * 3600 if i % 2 else None,
+                   "alarm": False, "timestamp": now - i} for i in range(n)],
+        "memos": [{"text": "Memo number %d" % i, "timestamp": now - i} for i in range(n)],
+        "contacts": [{"name": "Name %d" % i, "phone": "555-%04d" % i} for i in range(n)],
+    }
+
+
+def boot(name, engine):
+    """Time and peak memory of Context's load_settings() at startup"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    ds = DataStore(engine.path, engine=engine)
+    ds.load_settings({"clock_24h": True})
+    ms = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("{:<14}{:>10.2f}{:>10}{:>12}".format(name, ms, ds.stats()["parses"], peak // 1024))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    path = os.path.join(tempfile.mkdtemp(), "agenda.json")
+    with open(path, "w") as f:
+        json.dump(make_db(n), f)
+
+    print("{:<14}{:>10}{:>10}{:>12}".format("boot", "ms", "parses", "peak KiB"))
+    boot("JsonFile", JsonFile(path))
+    ShardedFiles(path).names()  # migrate agenda.json to agenda/
+    boot("ShardedFiles", ShardedFiles(path))
+    print()
+
+    ctx = BenchContext(get_platform(), path)
+    ds = ctx.ds
+    ds.flush()
+
+    print("{:<10}{:>10}{:>14}{:>10}".format("screen", "ms/frame", "parses/frame", "writes"))
+    for app in (TodoApp(), CalendarApp(), ContactsApp(), MemosApp()):
+        before = ds.stats()
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            app.draw(ctx)
+        ms = (time.perf_counter() - start) * 1000 / FRAMES
+        after = ds.stats()
+        print("{:<10}{:>10.2f}{:>14.2f}{:>10}".format(
+            type(app).__name__[:-3], ms,
+            (after["parses"] - before["parses"]) / FRAMES,
+            after["writes"] - before["writes"]))
+
+    todos = TodoApp()
+    before = ds.writes
+    for _ in range(10):
+        todos.handle_key(ctx, ord(' '))
+    print("10 toggles: {} writes before the flush".format(ds.writes - before), end="")
+    ds.flush()
+    print(", {} after".format(ds.writes - before))
+    print(ds.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Main loop wakeups on idle screens
+
+Runs AppManager on the headless display for a few seconds per screen,
+without touching the keyboard, and reports how often the loop woke up
+and redrew. The old loop polled every 5 ms: ~200 wakeups/s on any screen.
+
+    python examples/bench_idle.py [seconds per screen]
+"""
+
+import os
+import sys
+import time
+
+# Headless simulator, no window needed
+os.environ.setdefault('HEADLESS', '1')
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hal import get_platform
+from apps.base import AppManager, IconMenu
+from apps.clock import ClockApp
+from apps.calculator import CalculatorApp
+
+
+class Stop(Exception):
+    pass
+
+
+class StopClock:
+    """Platform clock that ends the run once `until` ms have passed"""
+
+    def __init__(self, clock, until):
+        self._clock = clock
+        self.until = until
+
+    def ticks_ms(self):
+        now = self._clock.ticks_ms()
+        if now >= self.until:
+            raise Stop
+        return now
+
+    def ticks_diff(self, ticks1, ticks2):
+        return self._clock.ticks_diff(ticks1, ticks2)
+
+    def sleep_ms(self, ms):
+        self._clock.sleep_ms(ms)
+
+
+class BenchContext:
+    """The few Context attributes the benchmarked apps use"""
+
+    def __init__(self, platform):
+        self.d = platform.init_display(width=128, height=64, scale=1)
+        self.hal_input = platform.init_input()
+        self.W, self.H = 128, 64
+        self.INK, self.BG = 15, 0
+        self.settings = {"clock_24h": True}
+
+
+def idle(ctx, app, seconds):
+    """Run the main loop on one screen, return (wakeups/s, draws/s, cpu %)"""
+    clock = ctx.hal_clock
+    clock.until = clock._clock.ticks_ms() + int(seconds * 1000)
+    manager = AppManager(ctx, app)
+    cpu = time.process_time()
+    try:
+        manager.run()
+    except Stop:
+        pass
+    cpu = time.process_time() - cpu
+    stats = manager.stats()
+    return stats["wakeups"] / seconds, stats["draws"] / seconds, 100 * cpu / seconds
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    platform = get_platform()
+    ctx = BenchContext(platform)
+    ctx.hal_clock = StopClock(platform.init_clock(), 0)
+
+    screens = [
+        ("menu", IconMenu([{"name": "Clock", "app": ClockApp()}])),
+        ("clock", ClockApp()),
+        ("calculator", CalculatorApp()),
+    ]
+    print("{:<12}{:>12}{:>10}{:>8}".format("screen", "wakeups/s", "draws/s", "cpu"))
+    for name, app in screens:
+        wakeups, draws, cpu = idle(ctx, app, seconds)
+        print("{:<12}{:>12.1f}{:>10.1f}{:>7.1f}%".format(name, wakeups, draws, cpu))
+
+
+if __name__ == "__main__":
+    main()
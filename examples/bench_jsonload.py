@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Peak RAM of loading collections: json.load() against core/jsonstream.py
+
+Writes a database of about 200 KB (memos, todos and contacts) both as one
+agenda.json and as per-collection files, then loads each collection with
+json.load() of the whole file and with the streaming reader the engines
+now use, which reads 512-byte chunks and builds one record at a time.
+Peak allocation is measured with tracemalloc, the CPython stand-in for
+watching gc.mem_alloc() on the Pico, and the load time in a separate run.
+
+    python examples/bench_jsonload.py [KB]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Headless simulator, no window needed
+os.environ.setdefault('HEADLESS', '1')
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import jsonstream
+from core.context import DataStore
+from core.storage import ShardedFiles
+
+WORDS = "call bob about the dentist buy milk and bread project meeting at ten".split()
+
+
+def make_db(kb):
+    """About kb KiB of JSON: half memos, the rest todos and contacts"""
+    db = {"settings": {"theme": "amber"}, "memos": [], "todos": [], "contacts": []}
+    now = 1700000000
+    size = 0
+    i = 0
+    while size < kb * 1024:
+        text = " ".join(WORDS[(i + k) % len(WORDS)] for k in range(40 + i % 30))
+        db["memos"].append({"text": text, "timestamp": now - i * 60})
+        db["todos"].append({"text": " ".join(WORDS[i % 7:i % 7 + 4]), "completed": i % 3 == 0,
+                            "due_date": now + i * 3600 if i % 2 else None, "alarm": False,
+                            "timestamp": now - i})
+        db["contacts"].append({"name": "Name %d" % i, "phone": "555-%04d" % i})
+        size += len(text) + 200
+        i += 1
+    return db
+
+
+def measure(fn):
+    """(peak KiB allocated, ms, result) of fn(), timed without tracemalloc"""
+    start = time.perf_counter()
+    fn()
+    ms = (time.perf_counter() - start) * 1000
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak // 1024, ms, result
+
+
+def json_load(path, name=None):
+    with open(path, "r") as f:
+        value = json.load(f)
+    return value if name is None else value[name]
+
+
+def stream_load(path, name=None):
+    with open(path, "rb") as f:
+        return jsonstream.load(f) if name is None else jsonstream.load_key(f, name)
+
+
+def row(label, path, name=None):
+    old_peak, old_ms, old = measure(lambda: json_load(path, name))
+    new_peak, new_ms, new = measure(lambda: stream_load(path, name))
+    if old != new:
+        print("FAIL: {} differs".format(label))
+        sys.exit(1)
+    print("{:<22}{:>10}{:>10}{:>12.1f}{:>10.1f}".format(label, old_peak, new_peak, old_ms, new_ms))
+
+
+def main():
+    kb = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    path = os.path.join(tempfile.mkdtemp(), "agenda.json")
+    db = make_db(kb)
+    with open(path, "w") as f:
+        json.dump(db, f)
+    print("agenda.json: {} KiB, {} memos, {} todos, {} contacts".format(
+        os.path.getsize(path) // 1024, len(db["memos"]), len(db["todos"]), len(db["contacts"])))
+    del db
+
+    print()
+    print("{:<22}{:>10}{:>10}{:>12}{:>10}".format("", "peak KiB", "", "ms", ""))
+    print("{:<22}{:>10}{:>10}{:>12}{:>10}".format("load", "json", "stream", "json", "stream"))
+    for name in ("contacts", "memos", "todos"):
+        row("agenda.json " + name, path, name)
+
+    ShardedFiles(path).names()  # split into agenda/
+    shards = path[:-5]
+    for name in ("contacts", "memos", "todos"):
+        row("agenda/{}.json".format(name), os.path.join(shards, name + ".json"))
+
+    # What the apps see: a fresh DataStore loading one collection
+    print()
+    for name in ("contacts", "memos", "todos"):
+        peak, ms, records = measure(lambda: DataStore(path).collection(name, []))
+        print("DataStore {:<12}{:>6} records, peak {} KiB, {:.1f} ms".format(name, len(records), peak, ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+JSON shards against the binary record format of core/records.py
+
+For 100, 1k and 10k records per collection: writes todos, memos and
+contacts with ShardedFiles as JSON (agenda/<name>.json) and as records
+(agenda/<name>.bin, binary=...), then reports the file sizes, the save
+time and the load time on a fresh engine. Also checks that the format is
+lossless (odd records included), that convert() moves a collection
+between the formats, and that DataStore.cursor() pages read the same
+records from either file.
+
+    python examples/bench_records.py [sizes...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Headless simulator, no window needed
+os.environ.setdefault('HEADLESS', '1')
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import records
+from core.context import DataStore
+from core.storage import ShardedFiles
+
+NAMES = ("todos", "memos", "contacts")
+RUNS = 3
+
+# Records the fixed layout cannot hold, which go to the JSON extras
+ODD = [
+    {},
+    {"text": "café ✓", "id": 7, "completed": True, "due_date": None},
+    {"text": None, "timestamp": 1700000000.25, "id": -1, "alarm": 1},
+    {"name": "x" * 20000, "phone": 5551234, "tags": ["a", {"b": None}]},
+    {"id": True, "completed": "yes", "due_date": 2 ** 40},
+]
+
+
+def make_db(n):
+    now = 1700000000
+    return {
+        "todos": [{"text": "Todo %d buy milk" % i, "completed": i % 3 == 0,
+                   "due_date": now + i * 3600 if i % 2 else None, "alarm": i % 5 == 0,
+                   "timestamp": now - i, "id": i + 1} for i in range(n)],
+        "memos": [{"text": "Memo %d " % i + "call bob about the dentist " * 4,
+                   "timestamp": now - i * 60, "id": i + 1} for i in range(n)],
+        "contacts": [{"name": "Name %d" % i, "phone": "555-%04d" % (i % 10000),
+                      "id": i + 1} for i in range(n)],
+    }
+
+
+def best_ms(fn):
+    best = None
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        fn()
+        ms = (time.perf_counter() - start) * 1000
+        best = ms if best is None else min(best, ms)
+    return best
+
+
+def check_lossless():
+    for name in NAMES:
+        if records.loads(records.dumps(name, ODD)) != ODD:
+            return "{} round trip".format(name)
+    path = os.path.join(tempfile.mkdtemp(), "agenda.json")
+    db = make_db(50)
+    ShardedFiles(path).write(db, NAMES)
+    engine = ShardedFiles(path, binary=NAMES)
+    for name in NAMES:
+        if not engine.convert(name) or not os.path.exists(path[:-5] + "/" + name + ".bin"):
+            return "convert {} to records".format(name)
+        if os.path.exists(path[:-5] + "/" + name + ".json"):
+            return "{}.json left behind".format(name)
+        if ShardedFiles(path).load(name) != db[name]:
+            return "{} after convert".format(name)
+    back = ShardedFiles(path)
+    for name in NAMES:
+        back.convert(name)
+    if sorted(os.listdir(path[:-5])) != ["contacts.json", "memos.json", "todos.json"]:
+        return "convert back to JSON"
+    return None
+
+
+def check_cursor(n):
+    """cursor() pages from .bin shards match the loaded views"""
+    path = os.path.join(tempfile.mkdtemp(), "agenda.json")
+    ds = DataStore(path, engine=ShardedFiles(path, binary=NAMES))
+    db = make_db(n)
+    ds.save_todos(db["todos"])
+    ds.save_memos(db["memos"])
+    ds.save_contacts(db["contacts"])
+    disk = DataStore(path, engine=ShardedFiles(path, binary=NAMES))
+    ram = DataStore(path, engine=ShardedFiles(path, binary=NAMES))
+    for name in NAMES:
+        view = ram.view(name)
+        for start in (0, n // 2, n - 3):
+            if disk.cursor(name, None, start, 5) != view[start:start + 5]:
+                return "{} page at {}".format(name, start)
+    if disk.stats()["loaded"] != []:
+        return "collections loaded: {}".format(disk.stats()["loaded"])
+    return None
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [100, 1000, 10000]
+    failed = check_lossless() or check_cursor(min(sizes[-1], 2000))
+    if failed:
+        print("FAIL: " + failed)
+        sys.exit(1)
+    print("{:<10}{:>8}{:>11}{:>11}{:>10}{:>10}{:>10}{:>10}".format(
+        "", "records", "json KiB", "bin KiB", "save ms", "", "load ms", ""))
+    print("{:<10}{:>8}{:>11}{:>11}{:>10}{:>10}{:>10}{:>10}".format(
+        "", "", "", "", "json", "bin", "json", "bin"))
+    for n in sizes:
+        db = make_db(n)
+        root = tempfile.mkdtemp()
+        paths = {False: os.path.join(root, "json.json"), True: os.path.join(root, "bin.json")}
+        for name in NAMES:
+            sizes_kb, save, load = {}, {}, {}
+            for binary, path in paths.items():
+                engine = ShardedFiles(path, binary=NAMES if binary else ())
+                save[binary] = best_ms(lambda: engine.write(db, [name]))
+                load[binary] = best_ms(lambda: ShardedFiles(path).load(name))
+                shard = path[:-5] + "/" + name + (".bin" if binary else ".json")
+                sizes_kb[binary] = os.path.getsize(shard) / 1024
+                if ShardedFiles(path).load(name) != db[name]:
+                    print("FAIL: {} {} differs".format(name, "bin" if binary else "json"))
+                    sys.exit(1)
+            print("{:<10}{:>8}{:>11.1f}{:>11.1f}{:>10.1f}{:>10.1f}{:>10.1f}{:>10.1f}".format(
+                name, n, sizes_kb[False], sizes_kb[True], save[False], save[True],
+                load[False], load[True]))
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Query latency of the search index
+
+Builds a 5k-record corpus (memos, todos and contacts of random words),
+indexes it, then times DataStore.search() for word, prefix and two-word
+queries against a scan of every record, and checks both give the same
+records. Also reports the index file size, the RAM the index keeps
+(directory entries, pending postings, tracemalloc peak of a query) and
+the cost of an edit followed by the flush that merges it into the file,
+checks that a run of deletes keeps the pending postings under
+max_delta, and that an edit whose flush lost power before the merge is
+still found after a reboot.
+
+    python examples/bench_search.py [records] [seed]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Simulator mode (core imports machine otherwise)
+os.environ.setdefault('SIM', '1')
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import textpack
+from core.context import DataStore
+from core.search import NAMES, tokens, record_matches
+
+QUERIES = ["meeting", "mee", "pa", "call bob", "zz", "42", "buy milk", "proj"]
+RUNS = 20
+
+
+class Clock:
+    """Write-back DataStore clock (flushes are explicit here)"""
+
+    def ticks_ms(self):
+        return int(time.monotonic() * 1000)
+
+    def ticks_diff(self, a, b):
+        return a - b
+
+
+def make_words(rng, n):
+    syllables = ["ba", "ko", "mi", "ta", "ne", "ro", "su", "li", "pa", "de", "gu", "fe"]
+    words = ["meeting", "call", "bob", "buy", "milk", "project", "dentist", "pay", "rent", "42"]
+    while len(words) < n:
+        words.append("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return words
+
+
+def text(rng, words, n):
+    return " ".join(rng.choice(words) for _ in range(n))
+
+
+def make_db(ds, rng, n):
+    words = make_words(rng, 2000)
+    now = int(time.time())
+    ds.save_memos([{"text": text(rng, words, 12), "timestamp": now - i * 60}
+                   for i in range(n * 2 // 5)])
+    ds.save_todos([{"text": text(rng, words, 5), "completed": False, "due_date": None,
+                    "alarm": False, "timestamp": now - i * 90} for i in range(n * 2 // 5)])
+    ds.save_contacts([{"name": text(rng, words, 2).title(), "phone": "555-%04d" % i}
+                      for i in range(n - 2 * (n * 2 // 5))])
+    return words
+
+
+def scan(ds, query):
+    """The same search without the index: every record of every collection"""
+    words = tokens(query)
+    hits = []
+    for name in NAMES:
+        for record in ds.collection(name, []):
+            if record_matches(name, record, words):
+                hits.append((record.get('timestamp', 0), record['id'] * 4, name, record))
+    return hits
+
+
+def ms(fn, runs=RUNS):
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = fn()
+    return (time.perf_counter() - start) * 1000 / runs, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(int(sys.argv[2]) if len(sys.argv) > 2 else 1)
+    path = os.path.join(tempfile.mkdtemp(), "agenda.json")
+    ds = DataStore(path, clock=Clock())
+    words = make_db(ds, rng, n)
+    ds.flush()
+
+    start = time.perf_counter()
+    ds.search("x")  # first search: indexes the records
+    print("{} records indexed in {:.0f} ms".format(n, (time.perf_counter() - start) * 1000))
+
+    # A fresh store: only the index file, nothing in RAM yet
+    ds = DataStore(path, clock=Clock())
+    ds.load()
+    index = ds.search_index()
+    start = time.perf_counter()
+    ds.search("meeting")
+    print("first query after boot: {:.2f} ms".format((time.perf_counter() - start) * 1000))
+
+    print()
+    print("{:<12}{:>8}{:>12}{:>12}".format("query", "hits", "index ms", "scan ms"))
+    for query in QUERIES:
+        index_ms, found = ms(lambda: ds.search(query, limit=1000000))
+        scan_ms, expected = ms(lambda: scan(ds, query), 3)
+        if sorted(id(r) for _, r in found) != sorted(id(h[3]) for h in expected):
+            print("FAIL: '{}' found {} records, the scan {}".format(query, len(found), len(expected)))
+            sys.exit(1)
+        print("{:<12}{:>8}{:>12.2f}{:>12.2f}".format(query, len(found), index_ms, scan_ms))
+
+    tracemalloc.start()
+    ds.search("mee")
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    stats = index.stats()
+    print()
+    print("index file {} KiB, directory {} entries, query peak {} KiB".format(
+        stats["file_bytes"] // 1024, stats["directory"], peak // 1024))
+
+    # Edits stay in RAM until the flush merges them into the file
+    memos = ds.load_memos()
+    edit_ms, _ = ms(lambda: ds.update_record('memos', rng.choice(memos),
+                                             {"text": text(rng, words, 12)}), 100)
+    pending = index.stats()["pending"]
+    flush_ms, _ = ms(ds.flush, 1)
+    print("edit {:.3f} ms, {} postings pending, flush (merge) {:.0f} ms".format(
+        edit_ms, pending, flush_ms))
+    memo = rng.choice(memos)
+    ds.update_record('memos', memo, {"text": "quokka " + memo["text"]})
+    if [r for _, r in ds.search("quokka")] != [memo]:
+        print("FAIL: edited memo not found")
+        sys.exit(1)
+
+    # A long run of deletes merges as it goes: pending stays bounded
+    most = 0
+    doomed = ds.load_todos()[:index.max_delta + n // 10]
+    for todo in doomed:
+        ds.remove_record('todos', todo)
+        most = max(most, index.stats()["pending"])
+    print("{} deletes: at most {} postings pending (max_delta {}), {} merges".format(
+        len(doomed), most, index.max_delta, index.stats()["merges"]))
+    if most > index.max_delta:
+        print("FAIL: pending grew past max_delta")
+        sys.exit(1)
+    for query in QUERIES:
+        found = ds.search(query, limit=1000000)
+        if sorted(id(r) for _, r in found) != sorted(id(h[3]) for h in scan(ds, query)):
+            print("FAIL: '{}' after the deletes".format(query))
+            sys.exit(1)
+
+    # Power cut after the collections were written, before the merge: the
+    # edit keeps the record count and id sum, so only the marker tells
+    ds.flush()
+    memo = ds.load_memos()[0]
+    old = tokens(textpack.text(memo))[0]
+    ds.update_record('memos', memo, {"text": "zebra"})
+    ds.search_index().merge = lambda: None
+    ds.flush()
+    ds = DataStore(path, clock=Clock())
+    if [r.get("text") for _, r in ds.search("zebra")] != ["zebra"]:
+        print("FAIL: edit lost from the index after a power cut")
+        sys.exit(1)
+    if [r for _, r in ds.search(old) if r.get("text") == "zebra"]:
+        print("FAIL: old words of the edit still found")
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
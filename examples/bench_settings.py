@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Settings writes while holding a key
+
+Boots a DataStore on an existing settings file, then holds 'l' in the
+brightness screen (a key repeat every 50 ms for 1.5 s) and leaves it.
+Counts the settings file writes (DataStore.stats()["collection_writes"])
+with write-through saves and with the debounced write-back store.
+
+    python examples/bench_settings.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+# Simulator mode (core imports machine otherwise)
+os.environ.setdefault('SIM', '1')
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.context import DataStore
+from apps.w_brightness import WBrightnessApp
+
+REPEAT_MS = 50
+HOLD_MS = 1500
+
+
+class FakeClock:
+    """ticks_ms() that only moves when the benchmark says so"""
+
+    def __init__(self):
+        self.now = 0
+
+    def ticks_ms(self):
+        return self.now
+
+    def ticks_diff(self, a, b):
+        return a - b
+
+
+class Theme:
+    def apply(self):
+        pass
+
+
+class BenchContext:
+    """The few Context attributes WBrightnessApp uses"""
+
+    def __init__(self, ds):
+        self.ds = ds
+        self.settings = ds.load_settings({"theme": "amber", "w_brightness": 0})
+        self.theme = Theme()
+
+
+def settings_writes(ds):
+    return ds.stats()["collection_writes"].get("settings", 0)
+
+
+def hold_key(path, clock):
+    ds = DataStore(path, clock=clock)
+    ctx = BenchContext(ds)
+    boot = settings_writes(ds)
+    app = WBrightnessApp()
+    for _ in range(HOLD_MS // REPEAT_MS):
+        app.handle_key(ctx, ord('l'))
+        if clock is not None:
+            clock.now += REPEAT_MS
+            ds.flush_if_due(clock.now)
+    held = settings_writes(ds)
+    ds.flush()  # AppManager.pop() on leaving the screen
+    return boot, held, settings_writes(ds), ctx.settings["w_brightness"]
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), "agenda.json")
+    with open(path, "w") as f:
+        json.dump({"settings": {"theme": "amber", "w_brightness": 0}}, f)
+
+    print("{:<14}{:>6}{:>12}{:>12}".format("store", "boot", "while held", "after exit"))
+    for name, clock in (("write-through", None), ("write-back", FakeClock())):
+        boot, held, total, value = hold_key(path, clock)
+        print("{:<14}{:>6}{:>12}{:>12}   (w_brightness {})".format(name, boot, held, total, value))
+        DataStore(path).update_settings({"w_brightness": 0})
+
+
+if __name__ == "__main__":
+    main()
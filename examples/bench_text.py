@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark for DisplaySim.text
+
+Compares the old pygame SysFont path (one font.render() per call) with
+the glyph atlas renderer, per call with new strings (text cache off) and
+per frame of a text-heavy list screen redrawn with the same strings
+(text cache on).
+"""
+
+import os
+import sys
+import time
+
+# Set simulator mode, no window needed
+os.environ['SIM'] = '1'
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hal.sim.display import DisplaySim
+from hal.fonts import FONTS
+import pygame
+
+# A todo list screen: 12 rows and a help line
+SCREEN = ["[ ] Todo %d buy milk and bread" % i for i in range(12)] + ["n=new  Space=check  q=quit"]
+STRINGS = ["Meeting %05d with Bob" % i for i in range(2000)]
+
+
+class LegacyText:
+    """The previous DisplaySim.text: FontRenderer (SysFont 'courier')"""
+
+    def __init__(self, display):
+        self.display = display
+        self.font = pygame.font.SysFont('courier', 8)
+
+    def text(self, string, x, y, width=None, scale=1):
+        surface = self.font.render(str(string), True, (255, 255, 255))
+        self.display._framebuffer.blit(surface, (x, y))
+        self.display._damage.add(x, y, surface.get_width(), surface.get_height())
+
+
+def best_us(fn, count, runs=3):
+    """Best of a few runs, in microseconds per item"""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        us = (time.perf_counter() - start) * 1e6 / count
+        best = us if best is None else min(best, us)
+    return best
+
+
+def per_call(draw):
+    return best_us(lambda: [draw(s, 0, 0) for s in STRINGS], len(STRINGS))
+
+
+def per_frame(draw):
+    def frame():
+        for _ in range(200):
+            for i, s in enumerate(SCREEN):
+                draw(s, 2, i * 9, 236)
+    return best_us(frame, 200) / 1000
+
+
+def main():
+    uncached = DisplaySim(240, 240, scale=1, text_cache_bytes=0)
+    cached = DisplaySim(240, 240, scale=1)
+    legacy = LegacyText(cached)
+
+    print("{:<18} {:>12} {:>12} {:>9}".format("new strings", "legacy us", "atlas us", "speedup"))
+    for font in FONTS:
+        uncached.set_font(font)
+        old, new = per_call(legacy.text), per_call(uncached.text)
+        print("{:<18} {:>12.1f} {:>12.1f} {:>8.2f}x".format(font, old, new, old / new))
+
+    print()
+    print("{:<18} {:>12} {:>12} {:>9}".format("list screen", "legacy ms", "atlas ms", "speedup"))
+    for font in FONTS:
+        cached.set_font(font)
+        old, new = per_frame(legacy.text), per_frame(cached.text)
+        print("{:<18} {:>12.3f} {:>12.3f} {:>8.2f}x".format(font, old, new, old / new))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Long memos stored compressed (core/textpack.py)
+
+Writes 500 memos of 200 to 2000 characters through DataStore, with and
+without compression (DataStore packs the "memos" collection, PACKED), and
+reports the size of agenda/memos.json and agenda/memos.bin, the RAM the
+loaded collection takes (tracemalloc) and the time to inflate one memo
+when it is opened. Also checks that the list screen draws from the plain
+previews ("p"), that a packed memo has no cut-down "text", that the memo
+view and edit screens see the whole text, and that search finds words
+past the preview.
+
+    python examples/bench_textpack.py [count]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Headless simulator, no window needed
+os.environ.setdefault('HEADLESS', '1')
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hal import get_platform
+from core import context, textpack
+from core.context import DataStore
+from core.storage import ShardedFiles
+from apps.memos import MemosApp
+
+SYLLABLES = "ka lo mi re the an to in bo da ser vi con tra ple mo ri na ta ge lu".split()
+LENGTHS = (200, 500, 1000, 2000)
+
+
+class BenchContext:
+    """The few Context attributes MemosApp uses"""
+
+    def __init__(self, ds):
+        platform = get_platform()
+        self.d = platform.init_display(width=128, height=64, scale=1)
+        self.ds = ds
+        self.W, self.H = 128, 64
+        self.INK, self.BG = 15, 0
+
+
+def memo_text(i, length):
+    """Made-up words, about as compressible as English prose"""
+    rng = random.Random(i)
+    words = []
+    size = 0
+    while size < length:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3)))
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+
+def make_db(path, n, packed, binary):
+    saved = context.PACKED
+    context.PACKED = ("memos",) if packed else ()
+    try:
+        engine = ShardedFiles(path, binary=("memos",) if binary else ())
+        ds = DataStore(path, engine=engine)
+        ds.save_memos([{"text": memo_text(i, LENGTHS[i % len(LENGTHS)]),
+                        "timestamp": 1700000000 - i} for i in range(n)])
+        ds.flush()
+    finally:
+        context.PACKED = saved
+    return path[:-5] + "/memos" + (".bin" if binary else ".json")
+
+
+def loaded_kib(path):
+    tracemalloc.start()
+    memos = DataStore(path).load_memos()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size // 1024, memos
+
+
+def check(path, n):
+    ds = DataStore(path)
+    ctx = BenchContext(ds)
+    app = MemosApp()
+    app.draw(ctx)
+    if ds.stats()["loaded"] not in ([], ["schema"]):
+        return "list screen loaded {}".format(ds.stats()["loaded"])
+    i = 3  # a 2000-character memo
+    app.selected_index = i
+    app.handle_key(ctx, 13)
+    text = memo_text(i, LENGTHS[i % len(LENGTHS)])
+    if app.memo_lines()[0] != text or not textpack.text(app.selected_memo) == text:
+        return "memo view text"
+    app.draw(ctx)
+    app.handle_key(ctx, ord('e'))
+    if "".join(app.edit_buffer) != text:
+        return "edit buffer"
+    app.handle_key(ctx, ord('!'))
+    app.handle_key(ctx, 13)
+    if textpack.text(app.selected_memo) != text + "!" or 'z' not in app.selected_memo:
+        return "edited memo not packed"
+    if 'text' in app.selected_memo or app.selected_memo['p'] != text[:textpack.PREVIEW]:
+        return "packed memo keeps a cut-down text"
+    tail = text.split()[-2]
+    hits = [r for name, r in ds.search(tail) if name == "memos"]
+    if app.selected_memo not in hits:
+        return "search for '{}' past the preview".format(tail)
+    ds.flush()
+    if textpack.text(DataStore(path).live('memos', ds.cursor('memos', None, i, 1)[0])) != text + "!":
+        return "edit after reload"
+    return None
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    if not textpack.available():
+        print("no compressor here")
+        sys.exit(1)
+    root = tempfile.mkdtemp()
+    print("{} memos of {} characters".format(n, "/".join(str(k) for k in LENGTHS)))
+    print("{:<18}{:>11}{:>11}{:>14}".format("", "file KiB", "", "loaded KiB"))
+    print("{:<18}{:>11}{:>11}{:>14}".format("", "json", "bin", ""))
+    for packed in (False, True):
+        sizes = []
+        for binary in (False, True):
+            path = os.path.join(root, "%d%d.json" % (packed, binary))
+            sizes.append(os.path.getsize(make_db(path, n, packed, binary)) / 1024)
+        kib, memos = loaded_kib(os.path.join(root, "%d0.json" % packed))
+        print("{:<18}{:>11.1f}{:>11.1f}{:>14}".format(
+            "compressed" if packed else "plain", sizes[0], sizes[1], kib))
+
+    start = time.perf_counter()
+    for memo in memos:
+        textpack.text(memo)
+    print("inflate on open: {:.3f} ms per memo".format((time.perf_counter() - start) * 1000 / n))
+
+    failed = check(os.path.join(root, "10.json"), n)
+    if failed:
+        print("FAIL: " + failed)
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Frame hash of hal/damage.py: changed frames are never skipped
+
+DamageTracker skips the push of a frame whose draw calls hash the same as
+the last pushed frame. The hash must not depend on how the runtime hashes
+tuples (MicroPython adds up the element hashes) or strings (it keeps 8 to
+16 bits of them), so frames with the same coordinate sum, or texts that
+differ in one character, must all be pushed, and only a repeated frame
+skipped.
+
+    python examples/damage_hash.py
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hal.damage import DamageTracker, _mix, _FNV_OFFSET
+
+W, H = 128, 64
+
+# Pairs of frames whose ops have equal element sums (one tuple-hash
+# collision each on MicroPython), as (name, x, y, w, h, pen) draw calls
+FRAMES = [
+    ("pixel moves along x + y", [("pixel", 11, 20, 1, 1, 15)], [("pixel", 10, 21, 1, 1, 15)]),
+    ("line end moves along x + y", [("line", 0, 0, 31, 9, 15)], [("line", 0, 0, 30, 10, 15)]),
+    ("two rows swap pens", [("rectangle", 0, 10, 128, 8, 15), ("rectangle", 0, 18, 128, 8, 0)],
+     [("rectangle", 0, 10, 128, 8, 0), ("rectangle", 0, 18, 128, 8, 15)]),
+    ("same calls, other order", [("text", 2, 2, 10, 7, "ab"), ("text", 2, 2, 10, 7, "ba")],
+     [("text", 2, 2, 10, 7, "ba"), ("text", 2, 2, 10, 7, "ab")]),
+]
+
+# Only the string changes: a clock ticking, and every text of a 16-bit
+# hash space, which a truncated string hash cannot keep apart
+TEXTS = ["12:%02d:%02d" % (m, s) for m in range(60) for s in range(60)]
+TEXTS += ["%05d" % i for i in range(65536 + 1)]
+
+# The hash of an op is the same on every runtime and run (CPython seeds
+# its string hash per process, MicroPython truncates it)
+KNOWN = [
+    (("text", 40, 28, 48, 7, "12:00:00"), 2382469251),
+    (("bitmap", 0, 0, 8, 2, (b"\x01\x02", 8, 2, None)), 1173387365),
+]
+
+
+def draw(tracker, calls):
+    for name, x, y, w, h, arg in calls:
+        tracker.add(x, y, w, h, (name, x, y, w, h, arg))
+    return tracker.take()
+
+
+def main():
+    for label, first, second in FRAMES:
+        tracker = DamageTracker(W, H)
+        if not draw(tracker, first):
+            print("FAIL: {}: first frame skipped".format(label))
+            sys.exit(1)
+        if not draw(tracker, second):
+            print("FAIL: {}: changed frame skipped".format(label))
+            sys.exit(1)
+        if draw(tracker, second):
+            print("FAIL: {}: repeated frame pushed".format(label))
+            sys.exit(1)
+        print("{:<28} pushed {} skipped {}".format(label, tracker.pushed, tracker.skipped))
+    for op, expected in KNOWN:
+        if _mix(_FNV_OFFSET, op) != expected:
+            print("FAIL: {} hashes to {}, not {}".format(op[0], _mix(_FNV_OFFSET, op), expected))
+            sys.exit(1)
+    tracker = DamageTracker(W, H)
+    for t in TEXTS:
+        if not draw(tracker, [("text", 40, 28, 48, 7, t)]):
+            print("FAIL: text '{}' skipped".format(t))
+            sys.exit(1)
+    print("{:<28} pushed {} skipped {}".format("text only", tracker.pushed, tracker.skipped))
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Crash-recovery check for the journal storage engine
+
+Records a random sequence of edits through DataStore + JournalFile, then
+simulates power loss by truncating the journal at random offsets. Every
+truncated journal must load as exactly the database after the last
+complete edit, and keep accepting edits afterwards. Also checks that a
+crash between writing a snapshot and removing the old journal does not
+replay edits twice, and that a crash inside a FAT rename (the old file
+removed, the new one still at its .tmp name) loses no data, for a
+snapshot and for a ShardedFiles shard.
+
+    python examples/journal_recovery.py [cuts] [seed]
+
+Exits with status 1 on the first mismatch.
+"""
+
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+# Simulator mode (core imports machine otherwise)
+os.environ.setdefault('SIM', '1')
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.journal import JournalFile
+from core.storage import ShardedFiles
+from core.context import DataStore
+
+EDITS = 300
+
+
+def edit(ds, rng, n):
+    """One random app-style edit"""
+    todos = ds.load_todos()
+    r = rng.random()
+    if r < 0.4 or not todos:
+        todos.append({"text": "todo %d" % n, "completed": False, "due_date": None,
+                      "alarm": False, "timestamp": n})
+        ds.save_todos(todos)
+    elif r < 0.6:
+        t = rng.choice(todos)
+        t["completed"] = not t["completed"]
+        ds.save_todos(todos)
+    elif r < 0.75:
+        todos.pop(rng.randrange(len(todos)))
+        ds.save_todos(todos)
+    elif r < 0.9:
+        memos = ds.load_memos()
+        memos.insert(0, {"text": "memo %d é" % n, "timestamp": n})
+        ds.save_memos(memos)
+    else:
+        ds.update_settings({"w_brightness": rng.randrange(256), "theme": rng.choice(["amber", "hielo"])})
+
+
+def snapshot(db):
+    return json.loads(json.dumps(db))
+
+
+def copy_state(src_dir, dst_dir, log_bytes=None):
+    """Copy snapshot and journal, keeping only log_bytes of the journal"""
+    os.makedirs(dst_dir)
+    for name in os.listdir(src_dir):
+        shutil.copy(os.path.join(src_dir, name), os.path.join(dst_dir, name))
+    if log_bytes is not None:
+        log = os.path.join(dst_dir, "agenda.json.log")
+        with open(log, "rb") as f:
+            data = f.read(log_bytes)
+        with open(log, "wb") as f:
+            f.write(data)
+
+
+def fail(msg):
+    print("FAIL:", msg)
+    sys.exit(1)
+
+
+def main():
+    cuts = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = random.Random(int(sys.argv[2]) if len(sys.argv) > 2 else 1)
+    root = tempfile.mkdtemp()
+    base = os.path.join(root, "base")
+    os.makedirs(base)
+    path = os.path.join(base, "agenda.json")
+
+    # Record the edits, write-through so every edit is one append
+    ds = DataStore(path, engine=JournalFile(path, compact_bytes=1 << 30))
+    states = [(0, snapshot(ds.load()))]
+    ds.load_settings({"theme": "amber"})
+    states.append((os.path.getsize(path + ".log"), snapshot(ds.load())))
+    for n in range(EDITS):
+        edit(ds, rng, n)
+        states.append((os.path.getsize(path + ".log"), snapshot(ds.load())))
+    size = states[-1][0]
+    print("journal: {} edits, {} records, {} bytes".format(EDITS, ds.engine.appends, size))
+
+    # Power loss at random offsets
+    dropped = 0
+    for i in range(cuts):
+        cut = rng.randrange(size + 1)
+        expected = [db for end, db in states if end <= cut][-1]
+        work = os.path.join(root, "cut%d" % i)
+        copy_state(base, work, cut)
+        wpath = os.path.join(work, "agenda.json")
+        engine = JournalFile(wpath)
+        ds2 = DataStore(wpath, engine=engine)
+        if ds2.load() != expected:
+            fail("cut at {} does not match the last complete edit".format(cut))
+        dropped += engine.dropped_bytes
+        if os.path.getsize(wpath + ".log") > cut:
+            fail("cut at {}: journal grew during recovery".format(cut))
+        # The recovered store keeps working
+        edit(ds2, rng, EDITS + i)
+        after = snapshot(ds2.load())
+        if DataStore(wpath, engine=JournalFile(wpath)).load() != after:
+            fail("cut at {}: edit after recovery was not persisted".format(cut))
+        shutil.rmtree(work)
+    print("truncation: {} cuts ok, {} torn bytes dropped".format(cuts, dropped))
+
+    # Crash after the new snapshot, before the old journal is removed
+    work = os.path.join(root, "compact")
+    copy_state(base, work)
+    wpath = os.path.join(work, "agenda.json")
+    ds3 = DataStore(wpath, engine=JournalFile(wpath))
+    expected = snapshot(ds3.load())
+    shutil.copy(wpath + ".log", wpath + ".log.keep")
+    ds3.engine.compact()
+    os.rename(wpath + ".log.keep", wpath + ".log")
+    if DataStore(wpath, engine=JournalFile(wpath)).load() != expected:
+        fail("journal left over from compaction was replayed twice")
+    print("compaction crash: ok")
+
+    # FAT rename: the old snapshot is gone, the new one is still .tmp (the
+    # journal holds only the edits since an earlier compaction: none here)
+    os.rename(wpath, wpath + ".tmp")
+    os.remove(wpath + ".log")
+    if DataStore(wpath, engine=JournalFile(wpath)).load() != expected:
+        fail("snapshot left at its .tmp name was not loaded")
+    if not os.path.exists(wpath) or os.path.exists(wpath + ".tmp"):
+        fail("snapshot move was not finished")
+    spath = os.path.join(root, "sharded", "agenda.json")
+    os.makedirs(os.path.dirname(spath))
+    ds4 = DataStore(spath, engine=ShardedFiles(spath))
+    ds4.save_todos(expected.get("todos", []))
+    shard = spath[:-5] + "/todos.json"
+    os.rename(shard, shard + ".tmp")
+    if DataStore(spath, engine=ShardedFiles(spath)).load_todos() != expected.get("todos", []):
+        fail("shard left at its .tmp name was not loaded")
+    print("FAT rename crash: ok")
+    shutil.rmtree(root)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
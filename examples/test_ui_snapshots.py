@@ -206,6 +206,19 @@ def test_shapes(display, screenshot_dir):
     print(f"  ✓ Saved: {filename}")
 
 
+def test_window_close(display, screenshot_dir):
+    """Test that closing the window exits cleanly (run last)"""
+    print("Testing window close...")
+    
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    try:
+        display.update()
+    except SystemExit as e:
+        print(f"  ✓ Exited with status {e.code}")
+        return
+    raise AssertionError("update() ignored the QUIT event")
+
+
 def compare_images(img1_path, img2_path):
     """
     Compare two images pixel by pixel
@@ -255,6 +268,7 @@ def main():
         test_layout_grid,
         test_text_rendering,
         test_shapes,
+        test_window_close,
     ]
     
     for test_func in tests:
@@ -1,13 +1,16 @@
 # Hardware Abstraction Layer (HAL)
 # This module provides platform-independent interfaces for hardware access
 
-from .platform import get_platform, is_simulator
+from .platform import get_platform, is_simulator, is_headless
 from .color import rgb565_to_rgb888, rgb888_to_rgb565
+from .bitmap import pack_rows
 
 __all__ = [
     'get_platform',
     'is_simulator',
+    'is_headless',
     'rgb565_to_rgb888',
     'rgb888_to_rgb565',
+    'pack_rows',
 ]
 
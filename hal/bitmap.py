@@ -0,0 +1,45 @@
+# 1-bpp bitmap helpers
+#
+# Packed bitmaps are stored row by row, (w + 7) // 8 bytes per row,
+# most significant bit = leftmost pixel (same layout as the icon literals).
+
+
+def pack_rows(rows, w):
+    """Pack a list of integer bit rows (MSB = leftmost pixel) into bytes"""
+    stride = (w + 7) // 8
+    pad = stride * 8 - w
+    buf = bytearray(stride * len(rows))
+    i = 0
+    for bits in rows:
+        bits <<= pad
+        for b in range(stride - 1, -1, -1):
+            buf[i + b] = bits & 0xFF
+            bits >>= 8
+        i += stride
+    return bytes(buf)
+
+
+def row_spans(rows, w, h, invert=False):
+    """Decode a packed bitmap into horizontal runs of lit pixels
+
+    Returns:
+        List of (row, start_col, length) tuples
+    """
+    stride = (w + 7) // 8
+    spans = []
+    for r in range(h):
+        base = r * stride
+        start = -1
+        for c in range(w):
+            lit = (rows[base + (c >> 3)] >> (7 - (c & 7))) & 1
+            if invert:
+                lit ^= 1
+            if lit:
+                if start < 0:
+                    start = c
+            elif start >= 0:
+                spans.append((r, start, c - start))
+                start = -1
+        if start >= 0:
+            spans.append((r, start, w - start))
+    return spans
@@ -1,5 +1,20 @@
 # Color conversion helpers
 
+# Pixel formats accepted by DisplayInterface.blit()
+FMT_RGB888 = "RGB888"  # 3 bytes per pixel, R G B
+FMT_RGB565 = "RGB565"  # 2 bytes per pixel, big-endian (display wire order)
+FMT_P4 = "P4"          # 4-bit palette index, 2 pixels per byte (high nibble first)
+
+
+def blit_size(fmt, w, h):
+    """Number of bytes a w x h buffer takes in the given format"""
+    if fmt == FMT_RGB565:
+        return w * h * 2
+    if fmt == FMT_P4:
+        return ((w + 1) // 2) * h
+    return w * h * 3
+
+
 def rgb565_to_rgb888(color565):
     """Convert RGB565 to RGB888 tuple (r, g, b)"""
     r = ((color565 >> 11) & 0x1F) << 3
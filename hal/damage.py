@@ -0,0 +1,162 @@
+# Damaged-region tracking shared by the display backends
+
+import binascii
+
+_FNV_PRIME = 16777619
+_FNV_OFFSET = 2166136261
+
+
+def _mix(h, op):
+    """FNV-1a step of the frame hash over each element of op, in order
+
+    Runtime hashes cannot be used: MicroPython adds up the element hashes
+    of a tuple, so ("pixel", x + 1, y) and ("pixel", x, y + 1) would
+    collide, and keeps only 8 to 16 bits of a string hash, so two texts
+    would often collide too. Strings and bytes go in as their CRC-32,
+    computed in C by binascii on both runtimes, then their length.
+    """
+    for e in op:
+        if isinstance(e, tuple):
+            h = _mix(h, e)
+            continue
+        if isinstance(e, str):
+            e = e.encode()
+        if isinstance(e, (bytes, bytearray)):
+            h = ((h ^ binascii.crc32(e)) * _FNV_PRIME) & 0xFFFFFFFF
+            v = len(e)
+        elif isinstance(e, int):
+            v = e
+        elif e is None:
+            v = 0x5A5A5A5A
+        else:
+            v = hash(e)
+        h = ((h ^ (v & 0xFFFFFFFF)) * _FNV_PRIME) & 0xFFFFFFFF
+    # Op boundary, so ("a", 1) + ("b",) differs from ("a",) + (1, "b")
+    return ((h ^ len(op)) * _FNV_PRIME) & 0xFFFFFFFF
+
+
+class DamageTracker:
+    """Accumulates damaged rectangles between two flushes
+
+    Drawing calls report the area they touched with add(); update() calls
+    take() to get the merged list of (x, y, w, h) rectangles to push.
+
+    Each call can also pass `op`, a hashable tuple describing the command
+    (name, arguments, pen). These are folded into an order-sensitive
+    FNV-1a hash of the frame. Drawing overwrites pixels, so replaying the command stream of
+    the last pushed frame leaves the framebuffer unchanged; take() then
+    returns no rectangles and the flush is skipped. Calls without `op`
+    always force a push.
+    """
+
+    def __init__(self, width, height, max_rects=8):
+        """
+        Args:
+            width: Display width in pixels
+            height: Display height in pixels
+            max_rects: Above this many rectangles, collapse to their bounding box
+        """
+        self._width = width
+        self._height = height
+        self._max_rects = max_rects
+        self._rects = []  # (x0, y0, x1, y1), end-exclusive
+        self._full = False
+        self._hash = _FNV_OFFSET
+        self._last_hash = None
+        self._forced = False
+
+        # Stats
+        self.frames = 0
+        self.total_pixels = 0
+        self.last_rects = 0
+        self.last_pixels = 0
+        self.pushed = 0
+        self.skipped = 0
+
+    def _note(self, op):
+        if op is None:
+            self._forced = True
+        else:
+            self._hash = _mix(self._hash, op)
+
+    def add(self, x, y, w, h, op=None):
+        """Mark a rectangle as damaged (clipped to the display)"""
+        self._note(op)
+        if self._full:
+            return
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = min(self._width, x + w)
+        y1 = min(self._height, y + h)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        # Merge with every rectangle it overlaps or touches
+        rects = self._rects
+        i = 0
+        while i < len(rects):
+            r = rects[i]
+            if x0 <= r[2] and r[0] <= x1 and y0 <= r[3] and r[1] <= y1:
+                x0 = min(x0, r[0])
+                y0 = min(y0, r[1])
+                x1 = max(x1, r[2])
+                y1 = max(y1, r[3])
+                rects.pop(i)
+                i = 0
+                continue
+            i += 1
+        rects.append((x0, y0, x1, y1))
+
+        if len(rects) > self._max_rects:
+            self._rects = [(
+                min(r[0] for r in rects), min(r[1] for r in rects),
+                max(r[2] for r in rects), max(r[3] for r in rects),
+            )]
+        if (x1 - x0) * (y1 - y0) == self._width * self._height:
+            self._rects = [(0, 0, self._width, self._height)]
+            self._full = True
+
+    def add_all(self, op=None):
+        """Mark the whole display as damaged"""
+        self._note(op)
+        self._rects = [(0, 0, self._width, self._height)]
+        self._full = True
+
+    def take(self):
+        """Return damaged rectangles as (x, y, w, h) and reset for the next frame
+
+        Returns an empty list when the frame hash matches the last pushed frame.
+        """
+        rects = [(r[0], r[1], r[2] - r[0], r[3] - r[1]) for r in self._rects]
+        if rects:
+            if not self._forced and self._hash == self._last_hash:
+                self.skipped += 1
+                rects = []
+            else:
+                self.pushed += 1
+                self._last_hash = self._hash
+        self._rects = []
+        self._full = False
+        self._hash = _FNV_OFFSET
+        self._forced = False
+
+        pixels = 0
+        for r in rects:
+            pixels += r[2] * r[3]
+        self.frames += 1
+        self.last_rects = len(rects)
+        self.last_pixels = pixels
+        self.total_pixels += pixels
+        return rects
+
+    def stats(self):
+        """Damage statistics since the display was created"""
+        return {
+            "frames": self.frames,
+            "last_rects": self.last_rects,
+            "last_pixels": self.last_pixels,
+            "total_pixels": self.total_pixels,
+            "screen_pixels": self._width * self._height,
+            "pushed": self.pushed,
+            "skipped": self.skipped,
+        }
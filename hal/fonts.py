@@ -0,0 +1,247 @@
+# Bitmap fonts for the software-rendered display backends
+#
+# Glyphs are the classic 5x8 LCD font (printable ASCII 0x20-0x7E), stored as
+# 5 column bytes per character, LSB = top row. They are drawn in a 6px cell,
+# which is the advance the apps assume when centering text (len(s) * 6).
+
+from hal.bitmap import pack_rows
+import binascii
+
+_FIRST = 0x20
+_LAST = 0x7E
+
+_GLYPHS = bytes((
+    0x00, 0x00, 0x00, 0x00, 0x00,  # ' '
+    0x00, 0x00, 0x5F, 0x00, 0x00,  # '!'
+    0x00, 0x07, 0x00, 0x07, 0x00,  # '"'
+    0x14, 0x7F, 0x14, 0x7F, 0x14,  # '#'
+    0x24, 0x2A, 0x7F, 0x2A, 0x12,  # '$'
+    0x23, 0x13, 0x08, 0x64, 0x62,  # '%'
+    0x36, 0x49, 0x56, 0x20, 0x50,  # '&'
+    0x00, 0x08, 0x07, 0x03, 0x00,  # "'"
+    0x00, 0x1C, 0x22, 0x41, 0x00,  # '('
+    0x00, 0x41, 0x22, 0x1C, 0x00,  # ')'
+    0x2A, 0x1C, 0x7F, 0x1C, 0x2A,  # '*'
+    0x08, 0x08, 0x3E, 0x08, 0x08,  # '+'
+    0x00, 0x80, 0x70, 0x30, 0x00,  # ','
+    0x08, 0x08, 0x08, 0x08, 0x08,  # '-'
+    0x00, 0x00, 0x60, 0x60, 0x00,  # '.'
+    0x20, 0x10, 0x08, 0x04, 0x02,  # '/'
+    0x3E, 0x51, 0x49, 0x45, 0x3E,  # '0'
+    0x00, 0x42, 0x7F, 0x40, 0x00,  # '1'
+    0x72, 0x49, 0x49, 0x49, 0x46,  # '2'
+    0x21, 0x41, 0x49, 0x4D, 0x33,  # '3'
+    0x18, 0x14, 0x12, 0x7F, 0x10,  # '4'
+    0x27, 0x45, 0x45, 0x45, 0x39,  # '5'
+    0x3C, 0x4A, 0x49, 0x49, 0x31,  # '6'
+    0x41, 0x21, 0x11, 0x09, 0x07,  # '7'
+    0x36, 0x49, 0x49, 0x49, 0x36,  # '8'
+    0x46, 0x49, 0x49, 0x29, 0x1E,  # '9'
+    0x00, 0x00, 0x14, 0x00, 0x00,  # ':'
+    0x00, 0x40, 0x34, 0x00, 0x00,  # ';'
+    0x00, 0x08, 0x14, 0x22, 0x41,  # '<'
+    0x14, 0x14, 0x14, 0x14, 0x14,  # '='
+    0x00, 0x41, 0x22, 0x14, 0x08,  # '>'
+    0x02, 0x01, 0x59, 0x09, 0x06,  # '?'
+    0x3E, 0x41, 0x5D, 0x59, 0x4E,  # '@'
+    0x7C, 0x12, 0x11, 0x12, 0x7C,  # 'A'
+    0x7F, 0x49, 0x49, 0x49, 0x36,  # 'B'
+    0x3E, 0x41, 0x41, 0x41, 0x22,  # 'C'
+    0x7F, 0x41, 0x41, 0x41, 0x3E,  # 'D'
+    0x7F, 0x49, 0x49, 0x49, 0x41,  # 'E'
+    0x7F, 0x09, 0x09, 0x09, 0x01,  # 'F'
+    0x3E, 0x41, 0x41, 0x51, 0x73,  # 'G'
+    0x7F, 0x08, 0x08, 0x08, 0x7F,  # 'H'
+    0x00, 0x41, 0x7F, 0x41, 0x00,  # 'I'
+    0x20, 0x40, 0x41, 0x3F, 0x01,  # 'J'
+    0x7F, 0x08, 0x14, 0x22, 0x41,  # 'K'
+    0x7F, 0x40, 0x40, 0x40, 0x40,  # 'L'
+    0x7F, 0x02, 0x1C, 0x02, 0x7F,  # 'M'
+    0x7F, 0x04, 0x08, 0x10, 0x7F,  # 'N'
+    0x3E, 0x41, 0x41, 0x41, 0x3E,  # 'O'
+    0x7F, 0x09, 0x09, 0x09, 0x06,  # 'P'
+    0x3E, 0x41, 0x51, 0x21, 0x5E,  # 'Q'
+    0x7F, 0x09, 0x19, 0x29, 0x46,  # 'R'
+    0x26, 0x49, 0x49, 0x49, 0x32,  # 'S'
+    0x03, 0x01, 0x7F, 0x01, 0x03,  # 'T'
+    0x3F, 0x40, 0x40, 0x40, 0x3F,  # 'U'
+    0x1F, 0x20, 0x40, 0x20, 0x1F,  # 'V'
+    0x3F, 0x40, 0x38, 0x40, 0x3F,  # 'W'
+    0x63, 0x14, 0x08, 0x14, 0x63,  # 'X'
+    0x03, 0x04, 0x78, 0x04, 0x03,  # 'Y'
+    0x61, 0x59, 0x49, 0x4D, 0x43,  # 'Z'
+    0x00, 0x7F, 0x41, 0x41, 0x41,  # '['
+    0x02, 0x04, 0x08, 0x10, 0x20,  # '\\'
+    0x00, 0x41, 0x41, 0x41, 0x7F,  # ']'
+    0x04, 0x02, 0x01, 0x02, 0x04,  # '^'
+    0x40, 0x40, 0x40, 0x40, 0x40,  # '_'
+    0x00, 0x03, 0x07, 0x08, 0x00,  # '`'
+    0x20, 0x54, 0x54, 0x78, 0x40,  # 'a'
+    0x7F, 0x28, 0x44, 0x44, 0x38,  # 'b'
+    0x38, 0x44, 0x44, 0x44, 0x28,  # 'c'
+    0x38, 0x44, 0x44, 0x28, 0x7F,  # 'd'
+    0x38, 0x54, 0x54, 0x54, 0x18,  # 'e'
+    0x00, 0x08, 0x7E, 0x09, 0x02,  # 'f'
+    0x18, 0xA4, 0xA4, 0x9C, 0x78,  # 'g'
+    0x7F, 0x08, 0x04, 0x04, 0x78,  # 'h'
+    0x00, 0x44, 0x7D, 0x40, 0x00,  # 'i'
+    0x20, 0x40, 0x40, 0x3D, 0x00,  # 'j'
+    0x7F, 0x10, 0x28, 0x44, 0x00,  # 'k'
+    0x00, 0x41, 0x7F, 0x40, 0x00,  # 'l'
+    0x7C, 0x04, 0x78, 0x04, 0x78,  # 'm'
+    0x7C, 0x08, 0x04, 0x04, 0x78,  # 'n'
+    0x38, 0x44, 0x44, 0x44, 0x38,  # 'o'
+    0xFC, 0x18, 0x24, 0x24, 0x18,  # 'p'
+    0x18, 0x24, 0x24, 0x18, 0xFC,  # 'q'
+    0x7C, 0x08, 0x04, 0x04, 0x08,  # 'r'
+    0x48, 0x54, 0x54, 0x54, 0x24,  # 's'
+    0x04, 0x04, 0x3F, 0x44, 0x24,  # 't'
+    0x3C, 0x40, 0x40, 0x20, 0x7C,  # 'u'
+    0x1C, 0x20, 0x40, 0x20, 0x1C,  # 'v'
+    0x3C, 0x40, 0x30, 0x40, 0x3C,  # 'w'
+    0x44, 0x28, 0x10, 0x28, 0x44,  # 'x'
+    0x4C, 0x90, 0x90, 0x90, 0x7C,  # 'y'
+    0x44, 0x64, 0x54, 0x4C, 0x44,  # 'z'
+    0x00, 0x08, 0x36, 0x41, 0x00,  # '{'
+    0x00, 0x00, 0x77, 0x00, 0x00,  # '|'
+    0x00, 0x41, 0x36, 0x08, 0x00,  # '}'
+    0x02, 0x01, 0x02, 0x04, 0x02,  # '~'
+))
+
+GLYPH_W = 5
+GLYPH_H = 8
+GLYPH_COUNT = _LAST - _FIRST + 1
+GLYPH_CHARS = "".join(chr(c) for c in range(_FIRST, _LAST + 1))  # atlas order
+
+# font name -> (glyph scale, advance, line height), unscaled by text() scale
+#
+# Only bitmap8 has the device's glyph size. There is one glyph table, so
+# bitmap6 is the same 5x8 glyphs on a 7px line (PicoGraphics draws 6px
+# glyphs) and bitmap14_outline is them doubled, not outlined. Layout
+# matches the device within a few pixels, not pixel for pixel.
+FONTS = {
+    "bitmap6": (1, 6, 7),
+    "bitmap8": (1, 6, 8),
+    "bitmap14_outline": (2, 12, 16),
+}
+DEFAULT_FONT = "bitmap8"
+
+_glyph_cache = {}
+
+
+def font_metrics(font):
+    """Return (glyph scale, advance, line height) for a font name"""
+    return FONTS.get(font) or FONTS[DEFAULT_FONT]
+
+
+def text_extent(string, font=DEFAULT_FONT, scale=1):
+    """Size (w, h) of the pixels one line of text can light up
+
+    The width leaves out the gap after the last glyph, the height the
+    blank rows under the glyphs of string (descenders count), so centering
+    on it centers the ink.
+    """
+    if not string:
+        return (0, 0)
+    s, advance, _ = font_metrics(font)
+    rows = 0
+    for ch in string:
+        base = glyph_index(ch) * GLYPH_W
+        for c in range(GLYPH_W):
+            rows |= _GLYPHS[base + c]
+    h = 0
+    while rows >> h:
+        h += 1
+    return (((len(string) - 1) * advance + GLYPH_W * s) * scale, h * s * scale)
+
+
+def glyph_index(ch):
+    """Position of a character in the glyph table; unknown characters map to '?'"""
+    code = ord(ch)
+    if code < _FIRST or code > _LAST:
+        code = ord("?")
+    return code - _FIRST
+
+
+def glyph_data_id():
+    """Checksum of the glyph table, changes whenever a glyph is edited"""
+    return binascii.crc32(_GLYPHS) & 0xFFFFFFFF
+
+
+def _glyph_row_bits(index, r, s):
+    """Row r of glyph `index` as an int, each column repeated s times"""
+    base = index * GLYPH_W
+    bits = 0
+    for c in range(GLYPH_W):
+        lit = (_GLYPHS[base + c] >> r) & 1
+        for _ in range(s):
+            bits = (bits << 1) | lit
+    return bits
+
+
+def atlas_bitmap(font):
+    """Every glyph of a font side by side in one packed 1-bpp strip
+
+    Glyph i starts at x = i * GLYPH_W * glyph scale.
+
+    Returns:
+        (rows, w, h) ready for blit_bitmap()
+    """
+    s = font_metrics(font)[0]
+    gw = GLYPH_W * s
+    rows = []
+    for r in range(GLYPH_H):
+        bits = 0
+        for i in range(GLYPH_COUNT):
+            bits = (bits << gw) | _glyph_row_bits(i, r, s)
+        for _ in range(s):
+            rows.append(bits)
+    w = gw * GLYPH_COUNT
+    return pack_rows(rows, w), w, GLYPH_H * s
+
+
+def glyph_bitmap(font, ch, scale=1):
+    """Packed 1-bpp bitmap for a character
+
+    Returns:
+        (rows, w, h) ready for blit_bitmap(); unknown characters render as '?'
+    """
+    key = (font, ch, scale)
+    glyph = _glyph_cache.get(key)
+    if glyph is not None:
+        return glyph
+
+    index = glyph_index(ch)
+    s = font_metrics(font)[0] * scale
+
+    rows = []
+    for r in range(GLYPH_H):
+        bits = _glyph_row_bits(index, r, s)
+        for _ in range(s):
+            rows.append(bits)
+
+    glyph = (pack_rows(rows, GLYPH_W * s), GLYPH_W * s, GLYPH_H * s)
+    _glyph_cache[key] = glyph
+    return glyph
+
+
+def wrap_lines(string, width, font=DEFAULT_FONT, scale=1):
+    """Split text into lines the way GFX Pack text() word-wraps them
+
+    Words move to the next line when they would pass `width` pixels
+    (measured from the text origin); explicit newlines are honored.
+    """
+    advance = font_metrics(font)[1] * scale
+    max_chars = max(1, width // advance) if width else 1 << 30
+    lines = []
+    for para in str(string).split("\n"):
+        line = ""
+        for word in para.split(" "):
+            candidate = line + " " + word if line else word
+            if len(candidate) <= max_chars or not line:
+                line = candidate
+            else:
+                lines.append(line)
+                line = word
+        lines.append(line)
+    return lines
@@ -0,0 +1,11 @@
+# Headless hardware implementation (no window, no pygame) for CI and benchmarks
+
+from .display import DisplayHeadless
+from .input import InputHeadless
+from .storage import StorageMemory
+
+__all__ = [
+    'DisplayHeadless',
+    'InputHeadless',
+    'StorageMemory',
+]
@@ -0,0 +1,319 @@
+# Headless display: in-memory 4-bit framebuffer, no window, no pygame
+
+from hal.interfaces import DisplayInterface
+from hal.bitmap import row_spans
+from hal.color import rgb565_to_rgb888, blit_size, FMT_RGB565, FMT_P4
+from hal.damage import DamageTracker
+from hal.fonts import DEFAULT_FONT, FONTS, font_metrics, glyph_bitmap, wrap_lines
+from hal.text_cache import TextCache
+import struct
+import zlib
+
+
+class DisplayHeadless(DisplayInterface):
+    """Display backend that only renders into a packed framebuffer
+
+    Two pixels per byte (high nibble = even x), pen values 0-15 are stored
+    as-is. Frames can be dumped as PGM or PNG for snapshots and CI.
+    """
+
+    def __init__(self, width=240, height=240, text_cache_bytes=65536):
+        """
+        Args:
+            width: Display width in pixels
+            height: Display height in pixels
+            text_cache_bytes: Byte budget for rendered text
+        """
+        self._width = width
+        self._height = height
+        self._stride = (width + 1) // 2
+        self._framebuffer = bytearray(self._stride * height)
+        self._current_pen = 15
+        self._current_font = DEFAULT_FONT
+        self._span_cache = {}  # (rows, w, h, invert) -> [(row, col, len), ...]
+        self._damage = DamageTracker(width, height)
+        # Rendered strings: (font, string, pen, scale, width) -> (spans, w, h)
+        self._text_cache = TextCache(text_cache_bytes)
+        self.frames = 0
+
+    def _pen_value(self, pen):
+        """Convert a pen (index or RGB tuple) to a 0-15 gray level"""
+        if isinstance(pen, int):
+            return pen & 0x0F
+        return ((pen[0] + pen[1] + pen[2]) // 3) >> 4
+
+    def _set(self, x, y, v):
+        if 0 <= x < self._width and 0 <= y < self._height:
+            i = y * self._stride + (x >> 1)
+            if x & 1:
+                self._framebuffer[i] = (self._framebuffer[i] & 0xF0) | v
+            else:
+                self._framebuffer[i] = (self._framebuffer[i] & 0x0F) | (v << 4)
+
+    def _hspan(self, x, y, w, v):
+        """Fill a clipped horizontal run of pixels"""
+        if y < 0 or y >= self._height:
+            return
+        x0 = max(0, x)
+        x1 = min(self._width, x + w)
+        if x0 >= x1:
+            return
+        fb = self._framebuffer
+        row = y * self._stride
+        if x0 & 1:
+            fb[row + (x0 >> 1)] = (fb[row + (x0 >> 1)] & 0xF0) | v
+            x0 += 1
+        if x1 & 1 and x0 < x1:
+            x1 -= 1
+            fb[row + (x1 >> 1)] = (fb[row + (x1 >> 1)] & 0x0F) | (v << 4)
+        if x0 < x1:
+            n = (x1 - x0) >> 1
+            start = row + (x0 >> 1)
+            fb[start:start + n] = bytes((v << 4 | v,)) * n
+
+    def _fill_rect(self, x, y, w, h, v):
+        for yy in range(max(0, y), min(self._height, y + h)):
+            self._hspan(x, yy, w, v)
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def height(self):
+        return self._height
+
+    def init(self):
+        """Initialize display"""
+        self.fill(0)
+        self.update()
+
+    def fill(self, color):
+        """Fill entire display with color"""
+        v = self._pen_value(color)
+        self._framebuffer[:] = bytes((v << 4 | v,)) * len(self._framebuffer)
+        self._damage.add_all(("fill", color))
+
+    def pixel(self, x, y, color=None):
+        """Set a single pixel"""
+        if color is None:
+            color = self._current_pen
+        self._set(x, y, self._pen_value(color))
+        self._damage.add(x, y, 1, 1, ("pixel", x, y, color))
+
+    def get_pixel(self, x, y):
+        """Read back a pixel's 0-15 value"""
+        b = self._framebuffer[y * self._stride + (x >> 1)]
+        return b & 0x0F if x & 1 else b >> 4
+
+    def rect(self, x, y, w, h, color, fill=False):
+        """Draw a rectangle"""
+        v = self._pen_value(color)
+        if fill:
+            self._fill_rect(x, y, w, h, v)
+        elif w > 0 and h > 0:
+            self._hspan(x, y, w, v)
+            self._hspan(x, y + h - 1, w, v)
+            self._fill_rect(x, y, 1, h, v)
+            self._fill_rect(x + w - 1, y, 1, h, v)
+        self._damage.add(x, y, w, h, ("rect", x, y, w, h, color, fill))
+
+    def line(self, x0, y0, x1, y1, color=None):
+        """Draw a line (Bresenham)"""
+        if color is None:
+            color = self._current_pen
+        v = self._pen_value(color)
+        self._damage.add(min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1,
+                         ("line", x0, y0, x1, y1, color))
+        if y0 == y1:
+            self._hspan(min(x0, x1), y0, abs(x1 - x0) + 1, v)
+            return
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        while True:
+            self._set(x0, y0, v)
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x0 += sx
+            if e2 <= dx:
+                err += dx
+                y0 += sy
+
+    def text(self, string, x, y, width=None, scale=1):
+        """Draw text (GFX Pack compatible signature)"""
+        if width is None:
+            width = self._width
+        string = str(string)
+        font = self._current_font if self._current_font in FONTS else DEFAULT_FONT
+        key = (font, string, self._current_pen, scale, width)
+        rendered = self._text_cache.get(key)
+        if rendered is None:
+            rendered = self._render_text(font, string, scale, width)
+            # Sized like the equivalent packed 1-bpp bitmap
+            self._text_cache.put(key, rendered, ((rendered[1] + 7) // 8) * rendered[2])
+        spans, w, h = rendered
+        v = self._pen_value(self._current_pen)
+        hspan = self._hspan
+        for r, c, n in spans:
+            hspan(x + c, y + r, n, v)
+        self._damage.add(x, y, w, h, ("text", x, y) + key)
+
+    def _render_text(self, font, string, scale, width):
+        """Lay out a string as spans relative to the text origin"""
+        _, advance, line_h = font_metrics(font)
+        advance *= scale
+        line_h *= scale
+
+        spans = []
+        max_w = 0
+        lines = wrap_lines(string, width, font, scale)
+        for n, line in enumerate(lines):
+            cx = 0
+            cy = n * line_h
+            for ch in line:
+                if ch != " ":
+                    rows, w, h = glyph_bitmap(font, ch, scale)
+                    for r, c, run in self._spans(rows, w, h, False):
+                        spans.append((cy + r, cx + c, run))
+                cx += advance
+            max_w = max(max_w, cx)
+        # bitmap6 glyphs are taller than its line height, keep the last row
+        glyph_h = glyph_bitmap(font, "?", scale)[2]
+        return spans, max_w, (len(lines) - 1) * line_h + max(line_h, glyph_h)
+
+    def blit(self, x, y, buf, w, h, fmt="RGB888"):
+        """Blit an RGB888, RGB565 or P4 buffer (converted to gray levels)"""
+        if not isinstance(buf, (bytes, bytearray, memoryview)):
+            return
+        buf = memoryview(buf).cast("B")
+        if len(buf) < blit_size(fmt, w, h):
+            return
+        stride = (w + 1) // 2
+        for py in range(h):
+            for px in range(w):
+                if fmt == FMT_P4:
+                    b = buf[py * stride + (px >> 1)]
+                    v = b & 0x0F if px & 1 else b >> 4
+                elif fmt == FMT_RGB565:
+                    idx = (py * w + px) * 2
+                    v = self._pen_value(rgb565_to_rgb888((buf[idx] << 8) | buf[idx + 1]))
+                else:
+                    idx = (py * w + px) * 3
+                    v = self._pen_value(buf[idx:idx + 3])
+                self._set(x + px, y + py, v)
+        self._damage.add(x, y, w, h, ("blit", x, y, w, h, fmt, bytes(buf)))
+
+    def blit_bitmap(self, x, y, rows, w, h, invert=False):
+        """Draw a packed 1-bpp bitmap as horizontal runs"""
+        self._blit_spans(x, y, rows, w, h, invert)
+        self._damage.add(x, y, w, h, ("bitmap", x, y, bytes(rows), w, h, invert, self._current_pen))
+
+    def _blit_spans(self, x, y, rows, w, h, invert):
+        v = self._pen_value(self._current_pen)
+        hspan = self._hspan
+        for r, c, n in self._spans(rows, w, h, invert):
+            hspan(x + c, y + r, n, v)
+
+    def _spans(self, rows, w, h, invert):
+        key = (bytes(rows), w, h, invert)
+        spans = self._span_cache.get(key)
+        if spans is None:
+            spans = row_spans(key[0], w, h, invert)
+            if len(self._span_cache) >= 512:
+                self._span_cache.clear()
+            self._span_cache[key] = spans
+        return spans
+
+    def update(self):
+        """Finish a frame (nothing to push, only counts it)"""
+        self._damage.take()
+        self.frames += 1
+
+    def damage_stats(self):
+        """Damaged-region statistics (see DamageTracker.stats)"""
+        return self._damage.stats()
+
+    def text_cache_stats(self):
+        """Rendered-text cache statistics (see TextCache.stats)"""
+        return self._text_cache.stats()
+
+    # Compatibility methods
+    def set_pen(self, color):
+        """Set drawing color"""
+        self._current_pen = color
+
+    def clear(self):
+        """Clear display"""
+        self.fill(self._current_pen)
+
+    def rectangle(self, x, y, w, h):
+        """Draw filled rectangle with current pen"""
+        self._fill_rect(x, y, w, h, self._pen_value(self._current_pen))
+        self._damage.add(x, y, w, h, ("rectangle", x, y, w, h, self._current_pen))
+
+    def circle(self, cx, cy, r):
+        """Draw filled circle with current pen"""
+        v = self._pen_value(self._current_pen)
+        rr = r * r
+        dx = r
+        for dy in range(r + 1):
+            while dx > 0 and dx * dx + dy * dy > rr:
+                dx -= 1
+            self._hspan(cx - dx, cy - dy, 2 * dx + 1, v)
+            if dy:
+                self._hspan(cx - dx, cy + dy, 2 * dx + 1, v)
+        self._damage.add(cx - r, cy - r, 2 * r + 1, 2 * r + 1, ("circle", cx, cy, r, self._current_pen))
+
+    def set_font(self, font):
+        """Set font"""
+        self._current_font = font
+
+    def get_bounds(self):
+        """Get display bounds"""
+        return (self._width, self._height)
+
+    # Frame dumps
+    def to_gray8(self):
+        """Framebuffer as 8-bit grayscale bytes (one byte per pixel)"""
+        out = bytearray(self._width * self._height)
+        i = 0
+        for y in range(self._height):
+            row = y * self._stride
+            for x in range(self._width):
+                b = self._framebuffer[row + (x >> 1)]
+                out[i] = (b & 0x0F if x & 1 else b >> 4) * 17
+                i += 1
+        return bytes(out)
+
+    def to_pgm(self):
+        """Encode the current frame as binary PGM (P5)"""
+        header = "P5\n{} {}\n255\n".format(self._width, self._height).encode()
+        return header + self.to_gray8()
+
+    def to_png(self):
+        """Encode the current frame as 8-bit grayscale PNG"""
+        gray = self.to_gray8()
+        raw = bytearray()
+        for y in range(self._height):
+            raw.append(0)  # filter: none
+            raw += gray[y * self._width:(y + 1) * self._width]
+
+        def chunk(tag, data):
+            body = tag + data
+            return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+        ihdr = struct.pack(">IIBBBBB", self._width, self._height, 8, 0, 0, 0, 0)
+        return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) +
+                chunk(b"IDAT", zlib.compress(bytes(raw))) + chunk(b"IEND", b""))
+
+    def save_screenshot(self, filename):
+        """Save current framebuffer as PNG (or PGM for *.pgm)"""
+        data = self.to_pgm() if filename.lower().endswith(".pgm") else self.to_png()
+        with open(filename, "wb") as f:
+            f.write(data)
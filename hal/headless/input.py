@@ -0,0 +1,33 @@
+# Headless input: keys are fed programmatically (tests, benchmarks)
+
+from hal.interfaces import InputInterface
+import time
+
+
+class InputHeadless(InputInterface):
+    """Input backend backed by a queue of scripted key codes"""
+    
+    def __init__(self):
+        self._key_buffer = []
+    
+    def feed(self, keys):
+        """Queue key codes (ints or a string of characters)"""
+        for k in keys:
+            self._key_buffer.append(ord(k) if isinstance(k, str) else k)
+    
+    def poll(self):
+        """Pending key events (not consumed, read_key() pops them)"""
+        return [{'type': 'keydown', 'key': k} for k in self._key_buffer]
+    
+    def read_key(self):
+        """Read a single queued key"""
+        if self._key_buffer:
+            return self._key_buffer.pop(0)
+        return None
+    
+    def wait(self, timeout_ms):
+        """True at once if keys are queued, otherwise sleep the timeout"""
+        if self._key_buffer:
+            return True
+        time.sleep(timeout_ms / 1000.0)
+        return False
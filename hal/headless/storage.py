@@ -0,0 +1,189 @@
+# In-RAM storage: a simulated flash filesystem for benchmarks and CI
+
+from hal.interfaces import StorageInterface
+import errno
+import io
+
+
+def _norm(path):
+    while path.startswith("./"):
+        path = path[2:]
+    return path.rstrip("/")
+
+
+def _parent(path):
+    i = path.rfind("/")
+    return path[:i] if i > 0 else ""
+
+
+class _Commit:
+    """File contents reach the storage when the file is closed"""
+
+    def close(self):
+        if not self.closed:
+            data = self.getvalue()
+            if isinstance(data, str):
+                data = data.encode()
+            self._storage._commit(self._path, data, self._start)
+        super().close()
+
+
+class _BytesFile(_Commit, io.BytesIO):
+    pass
+
+
+class _TextFile(_Commit, io.StringIO):
+    pass
+
+
+class StorageMemory(StorageInterface):
+    """Files kept in a dict, with optional flash timing and wear counters
+
+    Nothing sleeps: each operation adds its simulated cost to `busy_us`,
+    so runs are deterministic. Writes are counted in `block_size` blocks
+    (a rewrite programs every block of the file again, an append only the
+    blocks it touches) per path, which is what wears the flash.
+    """
+
+    def __init__(self, op_us=0, read_us_per_kb=0, write_us_per_kb=0, block_size=4096):
+        """
+        Args:
+            op_us: Fixed cost of every open, rename, remove and listdir
+            read_us_per_kb: Read cost per KiB
+            write_us_per_kb: Program cost per KiB written
+            block_size: Flash block size for the wear counters
+        """
+        self.op_us = op_us
+        self.read_us_per_kb = read_us_per_kb
+        self.write_us_per_kb = write_us_per_kb
+        self.block_size = block_size
+        self.files = {}  # path -> bytes
+        self.dirs = set()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Zero the counters (the files stay)"""
+        self.busy_us = 0
+        self.reads = 0
+        self.bytes_read = 0
+        self.writes = 0
+        self.bytes_written = 0
+        self.blocks_written = 0
+        self.renames = 0
+        self.removes = 0
+        self.wear = {}  # path -> blocks written
+
+    def _missing(self, path):
+        return OSError(errno.ENOENT, "No such file", path)
+
+    def _check_parent(self, path):
+        parent = _parent(path)
+        if parent and parent not in self.dirs:
+            raise self._missing(parent)
+
+    def _commit(self, path, data, start):
+        self.files[path] = data
+        written = len(data) - start
+        # Blocks from the one holding `start` to the end of the file
+        blocks = (len(data) + self.block_size - 1) // self.block_size - start // self.block_size
+        self.writes += 1
+        self.bytes_written += written
+        self.blocks_written += blocks
+        self.wear[path] = self.wear.get(path, 0) + blocks
+        self.busy_us += written * self.write_us_per_kb // 1024
+
+    def read(self, path):
+        """Read data from file"""
+        with self.open(path, "rb") as f:
+            return f.read()
+
+    def write(self, path, data):
+        """Write data to file"""
+        with self.open(path, "wb") as f:
+            f.write(data)
+
+    def exists(self, path):
+        """Check if file or directory exists"""
+        path = _norm(path)
+        return path in self.files or path in self.dirs
+
+    def remove(self, path):
+        """Remove a file (nothing if it does not exist)"""
+        path = _norm(path)
+        if self.files.pop(path, None) is not None:
+            self.removes += 1
+            self.busy_us += self.op_us
+
+    def open(self, path, mode="rb"):
+        """File object for streaming"""
+        path = _norm(path)
+        self.busy_us += self.op_us
+        text = "b" not in mode
+        if "r" in mode:
+            data = self.files.get(path)
+            if data is None:
+                raise self._missing(path)
+            self.reads += 1
+            self.bytes_read += len(data)
+            self.busy_us += len(data) * self.read_us_per_kb // 1024
+            return io.StringIO(data.decode()) if text else io.BytesIO(data)
+        self._check_parent(path)
+        start = len(self.files.get(path, b"")) if "a" in mode else 0
+        if text:
+            f = _TextFile(self.files.get(path, b"").decode() if start else "")
+        else:
+            f = _BytesFile(self.files.get(path, b"") if start else b"")
+        f.seek(0, 2)
+        f._storage, f._path, f._start = self, path, start
+        return f
+
+    def rename(self, src, dst):
+        """Move src to dst, atomically replacing an existing dst"""
+        src, dst = _norm(src), _norm(dst)
+        if src not in self.files:
+            raise self._missing(src)
+        self._check_parent(dst)
+        self.files[dst] = self.files.pop(src)
+        if src in self.wear:
+            self.wear[dst] = self.wear.get(dst, 0) + self.wear.pop(src)
+        self.renames += 1
+        self.busy_us += self.op_us
+
+    def listdir(self, path):
+        """Names of the entries of a directory"""
+        path = _norm(path)
+        if path and path not in self.dirs:
+            raise self._missing(path)
+        self.busy_us += self.op_us
+        prefix = path + "/" if path else ""
+        names = []
+        for name in list(self.files) + list(self.dirs):
+            if name.startswith(prefix) and "/" not in name[len(prefix):]:
+                names.append(name[len(prefix):])
+        return names
+
+    def mkdir(self, path):
+        """Create a directory (nothing if it exists)"""
+        path = _norm(path)
+        self._check_parent(path)
+        self.dirs.add(path)
+
+    def size(self, path):
+        """File size in bytes, 0 if it does not exist"""
+        return len(self.files.get(_norm(path), b""))
+
+    def stats(self):
+        """Simulated I/O since the last reset_stats()"""
+        return {
+            "busy_us": self.busy_us,
+            "reads": self.reads,
+            "bytes_read": self.bytes_read,
+            "writes": self.writes,
+            "bytes_written": self.bytes_written,
+            "blocks_written": self.blocks_written,
+            "max_wear": max(self.wear.values()) if self.wear else 0,
+            "renames": self.renames,
+            "removes": self.removes,
+            "files": len(self.files),
+            "bytes_stored": sum(len(d) for d in self.files.values()),
+        }
@@ -37,14 +37,36 @@ class DisplayInterface:
         """Draw text (GFX Pack compatible: string, x, y, width, scale)"""
         raise NotImplementedError
     
-    def blit(self, x, y, buf, w, h):
-        """Blit a buffer to screen"""
-        raise NotImplementedError
+    def blit(self, x, y, buf, w, h, fmt="RGB888"):
+        """Blit a buffer to screen (fmt: RGB888, RGB565 or P4, see hal.color)"""
+        raise NotImplementedError
+    
+    def blit_bitmap(self, x, y, rows, w, h, invert=False):
+        """Draw a packed 1-bpp bitmap with the current pen
+        
+        rows holds (w + 7) // 8 bytes per row, MSB = leftmost pixel (see
+        hal.bitmap.pack_rows). Clear bits are transparent; invert swaps them.
+        """
+        stride = (w + 7) // 8
+        for r in range(h):
+            base = r * stride
+            for c in range(w):
+                lit = (rows[base + (c >> 3)] >> (7 - (c & 7))) & 1
+                if lit != invert:
+                    self.pixel(x + c, y + r)
     
     def update(self):
         """Update/refresh the display (flush framebuffer)"""
         raise NotImplementedError
     
+    def damage_stats(self):
+        """Damaged-region stats: frames, last_rects, last_pixels, total_pixels, screen_pixels, pushed, skipped"""
+        raise NotImplementedError
+    
+    def text_cache_stats(self):
+        """Rendered-text cache stats: hits, misses, evictions, entries, bytes, budget"""
+        raise NotImplementedError
+    
     # Additional methods for compatibility with existing code
     def set_pen(self, color):
         """Set drawing color (pen)"""
@@ -81,6 +103,15 @@ class InputInterface:
     def read_key(self):
         """Read a single key (CardKB style). Returns key code or None."""
         raise NotImplementedError
+    
+    def wait(self, timeout_ms):
+        """Block until input arrives or timeout_ms elapses.
+        
+        Returns True if a key (or another event that may need a redraw,
+        e.g. the simulator window being exposed) arrived, False on timeout.
+        wait(0) checks for pending input without blocking.
+        """
+        raise NotImplementedError
 
 
 class ClockInterface:
@@ -115,7 +146,35 @@ class StorageInterface:
         raise NotImplementedError
     
     def remove(self, path):
-        """Remove a file"""
+        """Remove a file (nothing if it does not exist)"""
+        raise NotImplementedError
+    
+    def open(self, path, mode="rb"):
+        """File object for streaming ("r", "w", "a", with or without "b")
+        
+        Raises OSError if a file opened for reading does not exist.
+        """
+        raise NotImplementedError
+    
+    def rename(self, src, dst):
+        """Move src to dst, replacing an existing dst
+        
+        Atomic where the filesystem allows (LittleFS, a desktop OS). On FAT
+        dst is removed first, so a power cut in between leaves only src;
+        core.storage readers then finish the move (see _recover()).
+        """
+        raise NotImplementedError
+    
+    def listdir(self, path):
+        """Names of the entries of a directory (OSError if missing)"""
+        raise NotImplementedError
+    
+    def mkdir(self, path):
+        """Create a directory (nothing if it exists)"""
+        raise NotImplementedError
+    
+    def size(self, path):
+        """File size in bytes, 0 if it does not exist"""
         raise NotImplementedError
 
 
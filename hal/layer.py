@@ -0,0 +1,114 @@
+# Offscreen 1-bpp layers for static artwork
+#
+# A Layer takes the same drawing calls as the display (set_pen, pixel, line,
+# rectangle, circle, text) but only records lit/clear bits. Its `rows` are a
+# packed bitmap in the hal.bitmap layout, so a layer drawn once can be put on
+# screen every frame with a single display.blit_bitmap() call.
+
+from hal.bitmap import row_spans
+from hal.fonts import DEFAULT_FONT, FONTS, font_metrics, glyph_bitmap, wrap_lines
+
+
+class Layer:
+    """Monochrome offscreen canvas
+
+    Pen 0 clears bits, any other pen sets them.
+    """
+
+    def __init__(self, width, height):
+        """
+        Args:
+            width: Layer width in pixels
+            height: Layer height in pixels
+        """
+        self.width = width
+        self.height = height
+        self._stride = (width + 7) // 8
+        self.rows = bytearray(self._stride * height)
+        self._pen = 1
+        self._font = DEFAULT_FONT
+
+    def set_pen(self, color):
+        """Set drawing color (0 = clear, anything else = set)"""
+        self._pen = 1 if color else 0
+
+    def set_font(self, font):
+        """Set font (see hal.fonts)"""
+        self._font = font if font in FONTS else DEFAULT_FONT
+
+    def clear(self):
+        """Fill the whole layer with the current pen"""
+        v = 0xFF if self._pen else 0
+        for i in range(len(self.rows)):
+            self.rows[i] = v
+
+    def _hspan(self, x, y, n):
+        if y < 0 or y >= self.height:
+            return
+        x0 = max(0, x)
+        x1 = min(self.width, x + n)
+        base = y * self._stride
+        rows = self.rows
+        for c in range(x0, x1):
+            mask = 0x80 >> (c & 7)
+            if self._pen:
+                rows[base + (c >> 3)] |= mask
+            else:
+                rows[base + (c >> 3)] &= ~mask
+
+    def pixel(self, x, y):
+        """Set a single pixel with the current pen"""
+        self._hspan(x, y, 1)
+
+    def rectangle(self, x, y, w, h):
+        """Draw filled rectangle with current pen"""
+        for yy in range(y, y + h):
+            self._hspan(x, yy, w)
+
+    def line(self, x0, y0, x1, y1):
+        """Draw a line (Bresenham)"""
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        while True:
+            self._hspan(x0, y0, 1)
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x0 += sx
+            if e2 <= dx:
+                err += dx
+                y0 += sy
+
+    def circle(self, cx, cy, r):
+        """Draw filled circle with current pen"""
+        rr = r * r
+        dx = r
+        for dy in range(r + 1):
+            while dx > 0 and dx * dx + dy * dy > rr:
+                dx -= 1
+            self._hspan(cx - dx, cy - dy, 2 * dx + 1)
+            if dy:
+                self._hspan(cx - dx, cy + dy, 2 * dx + 1)
+
+    def text(self, string, x, y, width=None, scale=1):
+        """Draw text with the hal.fonts bitmap fonts (GFX Pack compatible signature)"""
+        if width is None:
+            width = self.width
+        font = self._font
+        _, advance, line_h = font_metrics(font)
+        advance *= scale
+        line_h *= scale
+        for n, line in enumerate(wrap_lines(str(string), width, font, scale)):
+            cx = x
+            cy = y + n * line_h
+            for ch in line:
+                if ch != " ":
+                    rows, w, h = glyph_bitmap(font, ch, scale)
+                    for r, c, run in row_spans(rows, w, h):
+                        self._hspan(cx + c, cy + r, run)
+                cx += advance
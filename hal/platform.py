@@ -4,12 +4,21 @@ import os
 import sys
 
 
+def is_headless():
+    """Check if running the simulator without a window (HEADLESS=1)"""
+    try:
+        return os.environ.get('HEADLESS', '0') == '1'
+    except AttributeError:
+        # MicroPython - no os.environ
+        return False
+
+
 def is_simulator():
     """Check if running in simulator mode"""
-    # Check for SIM environment variable
+    # Check for SIM environment variable (HEADLESS=1 implies it)
     # MicroPython doesn't have os.environ, so if it's missing, we're on real hardware
     try:
-        return os.environ.get('SIM', '0') == '1'
+        return os.environ.get('SIM', '0') == '1' or is_headless()
     except AttributeError:
         # MicroPython - no os.environ, so not in simulator
         return False
@@ -25,6 +34,7 @@ class Platform:
     
     def __init__(self):
         self._sim_mode = is_simulator()
+        self._headless = is_headless()
         self._display = None
         self._input = None
         self._clock = None
@@ -34,23 +44,40 @@ class Platform:
         self._i2c = None
         self._rtc = None
     
-    def init_display(self, width=240, height=240, scale=3, gfx_pack=None):
-        """Initialize display interface"""
-        if self._sim_mode:
+    def init_display(self, width=240, height=240, scale=3, gfx_pack=None, headless=None,
+                     text_cache_bytes=None):
+        """Initialize display interface
+        
+        Args:
+            headless: Use the windowless framebuffer backend (defaults to HEADLESS env var)
+            text_cache_bytes: Byte budget of the rendered-text cache (backend default if None)
+        """
+        if headless is None:
+            headless = self._headless
+        kwargs = {}
+        if text_cache_bytes is not None:
+            kwargs["text_cache_bytes"] = text_cache_bytes
+        if headless:
+            from hal.headless import DisplayHeadless
+            self._display = DisplayHeadless(width, height, **kwargs)
+        elif self._sim_mode:
             from hal.sim import DisplaySim
-            self._display = DisplaySim(width, height, scale)
+            self._display = DisplaySim(width, height, scale, **kwargs)
         else:
             from hal.real import DisplayReal
             if gfx_pack is None:
                 raise ValueError("gfx_pack required for real hardware")
-            self._display = DisplayReal(gfx_pack.display)
+            self._display = DisplayReal(gfx_pack.display, **kwargs)
         
         self._display.init()
         return self._display
     
     def init_input(self, i2c=None):
         """Initialize input interface"""
-        if self._sim_mode:
+        if self._headless:
+            from hal.headless import InputHeadless
+            self._input = InputHeadless()
+        elif self._sim_mode:
             from hal.sim import InputSim
             self._input = InputSim()
         else:
@@ -72,9 +99,17 @@ class Platform:
         
         return self._clock
     
-    def init_storage(self):
-        """Initialize storage interface"""
-        if self._sim_mode:
+    def init_storage(self, memory=False, **kwargs):
+        """Initialize storage interface
+        
+        Args:
+            memory: Keep files in RAM (hal.headless StorageMemory, takes
+                its latency and block size keyword arguments)
+        """
+        if memory:
+            from hal.headless import StorageMemory
+            self._storage = StorageMemory(**kwargs)
+        elif self._sim_mode:
             from hal.sim import StorageSim
             self._storage = StorageSim()
         else:
@@ -118,6 +153,9 @@ class Platform:
     
     def is_simulator(self):
         return self._sim_mode
+    
+    def is_headless(self):
+        return self._headless
 
 
 # Global singleton instance
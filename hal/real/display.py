@@ -1,19 +1,35 @@
 # Real display implementation using Pimoroni GFX Pack
 
 from hal.interfaces import DisplayInterface
+from hal.bitmap import row_spans
+from hal.damage import DamageTracker
+from hal.text_cache import TextCache
+
+# Glyph heights of the PicoGraphics bitmap fonts (unscaled)
+FONT_HEIGHTS = {"bitmap6": 6, "bitmap8": 8, "bitmap14_outline": 14}
 
 
 class DisplayReal(DisplayInterface):
     """Real display implementation for Pimoroni GFX Pack (ST7789)"""
     
-    def __init__(self, gfx_display):
+    def __init__(self, gfx_display, text_cache_bytes=2048):
         """
         Args:
             gfx_display: The Pimoroni GFX Pack display object
+            text_cache_bytes: Byte budget for measured text extents
         """
         self._display = gfx_display
         self._width, self._height = gfx_display.get_bounds()
         self._current_pen = 15  # Default pen color
+        self._span_cache = {}  # (rows, w, h, invert) -> [(row, col, len), ...]
+        self._font = "bitmap8"
+        self._font_height = 8
+        self._damage = DamageTracker(self._width, self._height)
+        # PicoGraphics rasterizes text itself, so only the measured extents
+        # are cached (pen does not change them): (font, string, scale, width) -> (w, h)
+        self._text_cache = TextCache(text_cache_bytes)
+        # Only some PicoGraphics drivers can push a sub-region of the panel
+        self._partial_update = getattr(gfx_display, "partial_update", None)
     
     @property
     def width(self):
@@ -31,16 +47,18 @@ class DisplayReal(DisplayInterface):
         """Fill entire display with color"""
         self.set_pen(color)
         self._display.clear()
+        self._damage.add_all(("fill", color))
     
     def pixel(self, x, y, color=None):
         """Set a single pixel"""
         if color is not None:
-            self._display.set_pen(color)
+            self.set_pen(color)
         self._display.pixel(x, y)
+        self._damage.add(x, y, 1, 1, ("pixel", x, y, self._current_pen))
     
     def rect(self, x, y, w, h, color, fill=False):
         """Draw a rectangle"""
-        self._display.set_pen(color)
+        self.set_pen(color)
         if fill:
             self._display.rectangle(x, y, w, h)
         else:
@@ -49,29 +67,85 @@ class DisplayReal(DisplayInterface):
             self._display.rectangle(x, y + h - 1, w, 1)  # Bottom
             self._display.rectangle(x, y, 1, h)  # Left
             self._display.rectangle(x + w - 1, y, 1, h)  # Right
+        self._damage.add(x, y, w, h, ("rect", x, y, w, h, color, fill))
     
     def line(self, x0, y0, x1, y1, color=None):
         """Draw a line"""
         if color is not None:
-            self._display.set_pen(color)
+            self.set_pen(color)
         self._display.line(x0, y0, x1, y1)
+        self._damage.add(min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1,
+                         ("line", x0, y0, x1, y1, self._current_pen))
     
     def text(self, string, x, y, width=None, scale=1):
         """Draw text (GFX Pack compatible signature)"""
         # GFX Pack text() uses current pen, so just pass through
         if width is None:
             width = self._width
-        self._display.text(str(string), x, y, width, scale)
-    
-    def blit(self, x, y, buf, w, h):
+        string = str(string)
+        self._display.text(string, x, y, width, scale)
+        
+        key = (self._font, string, scale, width)
+        extent = self._text_cache.get(key)
+        if extent is None:
+            extent = self._measure(string, width, scale)
+            # String plus a small tuple, roughly what the entry costs in RAM
+            self._text_cache.put(key, extent, len(string) + 32)
+        self._damage.add(x, y, extent[0], extent[1], ("text", x, y, self._current_pen) + key)
+    
+    def _measure(self, string, width, scale):
+        """Width and height of the area text() draws into"""
+        line_h = self._font_height * scale
+        try:
+            text_w = self._display.measure_text(string, scale)
+        except AttributeError:
+            text_w = len(string) * 6 * scale
+        if text_w > width:
+            # Wrapped onto more lines, damage the rest of the column
+            return (width, self._height)
+        return (text_w, line_h)
+    
+    def blit(self, x, y, buf, w, h, fmt="RGB888"):
         """Blit a buffer to screen (not directly supported by GFX Pack)"""
         # This would need custom implementation for image data
         # For now, we'll skip or implement later if needed
         pass
     
+    def blit_bitmap(self, x, y, rows, w, h, invert=False):
+        """Draw a packed 1-bpp bitmap as horizontal rectangle runs"""
+        key = (bytes(rows), w, h, invert)
+        spans = self._span_cache.get(key)
+        if spans is None:
+            spans = row_spans(key[0], w, h, invert)
+            if len(self._span_cache) >= 32:
+                self._span_cache.clear()
+            self._span_cache[key] = spans
+        rectangle = self._display.rectangle
+        for r, c, n in spans:
+            rectangle(x + c, y + r, n, 1)
+        self._damage.add(x, y, w, h, ("bitmap", x, y, self._current_pen) + key)
+    
     def update(self):
-        """Update display - GFX Pack auto-updates, so this is a no-op"""
-        self._display.update()
+        """Push damaged regions to the panel
+        
+        Nothing drawn, or the same frame as last time -> no transfer.
+        """
+        rects = self._damage.take()
+        if not rects:
+            return
+        if self._partial_update is not None and self._damage.last_pixels < self._width * self._height:
+            for x, y, w, h in rects:
+                self._partial_update(x, y, w, h)
+        else:
+            self._display.update()
+    
+    def damage_stats(self):
+        """Damaged-region statistics (see DamageTracker.stats)"""
+        return self._damage.stats()
+    
+    def text_cache_stats(self):
+        """Text-extent cache statistics (see TextCache.stats)"""
+        return self._text_cache.stats()
     
     # Compatibility methods with existing GFX Pack API
     def set_pen(self, color):
@@ -82,18 +156,23 @@ class DisplayReal(DisplayInterface):
     def clear(self):
         """Clear display"""
         self._display.clear()
+        self._damage.add_all(("fill", self._current_pen))
     
     def rectangle(self, x, y, w, h):
         """Draw filled rectangle with current pen"""
         self._display.rectangle(x, y, w, h)
+        self._damage.add(x, y, w, h, ("rectangle", x, y, w, h, self._current_pen))
     
     def circle(self, cx, cy, r):
         """Draw filled circle with current pen"""
         self._display.circle(cx, cy, r)
+        self._damage.add(cx - r, cy - r, 2 * r + 1, 2 * r + 1, ("circle", cx, cy, r, self._current_pen))
     
     def set_font(self, font):
         """Set font"""
         self._display.set_font(font)
+        self._font = font
+        self._font_height = FONT_HEIGHTS.get(font, 8)
     
     def get_bounds(self):
         """Get display bounds"""
@@ -1,9 +1,16 @@
 # Real input implementation using CardKB over I2C
 
 from hal.interfaces import InputInterface
+import time
 
 CARDKB_ADDR = 0x5F
 
+# CardKB has no interrupt line, so wait() polls it: fast right after a key
+# (same latency as the old 5 ms loop), slower once the keyboard has been idle
+POLL_FAST_MS = 5
+POLL_IDLE_MS = 20
+IDLE_AFTER_MS = 2000
+
 
 class InputReal(InputInterface):
     """Real input implementation for CardKB"""
@@ -15,6 +22,8 @@ class InputReal(InputInterface):
         """
         self._i2c = i2c
         self._last_key = None
+        self._pending = None  # key read by wait(), returned by read_key()
+        self._last_key_ms = time.ticks_ms()
     
     def poll(self):
         """Poll for input events"""
@@ -23,8 +32,7 @@ class InputReal(InputInterface):
             return [{'type': 'keydown', 'key': key}]
         return []
     
-    def read_key(self):
-        """Read a single key from CardKB"""
+    def _read(self):
         try:
             b = self._i2c.readfrom(CARDKB_ADDR, 1)
             if not b:
@@ -33,4 +41,35 @@ class InputReal(InputInterface):
             return None if v == 0 else v
         except OSError:
             return None
-
+    
+    def read_key(self):
+        """Read a single key from CardKB"""
+        key = self._pending
+        if key is not None:
+            self._pending = None
+            return key
+        key = self._read()
+        if key is not None:
+            self._last_key_ms = time.ticks_ms()
+        return key
+    
+    def wait(self, timeout_ms):
+        """Poll the CardKB with an adaptive interval until a key or timeout"""
+        if self._pending is not None:
+            return True
+        start = time.ticks_ms()
+        while True:
+            key = self._read()
+            now = time.ticks_ms()
+            if key is not None:
+                self._pending = key
+                self._last_key_ms = now
+                return True
+            left = timeout_ms - time.ticks_diff(now, start)
+            if left <= 0:
+                return False
+            if time.ticks_diff(now, self._last_key_ms) < IDLE_AFTER_MS:
+                step = POLL_FAST_MS
+            else:
+                step = POLL_IDLE_MS
+            time.sleep_ms(min(step, left))
@@ -26,6 +26,46 @@ class StorageReal(StorageInterface):
             return False
     
     def remove(self, path):
-        """Remove a file"""
-        os.remove(path)
-
+        """Remove a file (nothing if it does not exist)"""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
+    def open(self, path, mode="rb"):
+        """File object for streaming"""
+        return open(path, mode)
+    
+    def rename(self, src, dst):
+        """Move src to dst, replacing an existing dst
+        
+        Atomic on LittleFS. FAT cannot replace a file, so dst is removed
+        first and a power cut before the rename leaves only src.
+        """
+        try:
+            # LittleFS replaces dst in one step
+            os.rename(src, dst)
+        except OSError:
+            # FAT does not: remove dst first (not atomic, see above)
+            if not self.exists(src):
+                raise
+            self.remove(dst)
+            os.rename(src, dst)
+    
+    def listdir(self, path):
+        """Names of the entries of a directory"""
+        return os.listdir(path)
+    
+    def mkdir(self, path):
+        """Create a directory (nothing if it exists)"""
+        try:
+            os.mkdir(path)
+        except OSError:
+            pass  # already there
+    
+    def size(self, path):
+        """File size in bytes, 0 if it does not exist"""
+        try:
+            return os.stat(path)[6]
+        except OSError:
+            return 0
@@ -1,11 +1,16 @@
 # Simulated hardware implementation for PC testing
 
-from .display import DisplaySim
-from .input import InputSim
 from .clock import ClockSim
 from .storage import StorageSim
 from .backlight import BacklightSim
 
+try:
+    from .display import DisplaySim
+    from .input import InputSim
+except ImportError:
+    # pygame not installed: only the headless display/input can be used
+    pass
+
 __all__ = [
     'DisplaySim',
     'InputSim',
@@ -1,47 +1,50 @@
 # Simulated display using pygame
 
 from hal.interfaces import DisplayInterface
-from hal.color import rgb565_to_rgb888
+from hal.color import rgb565_to_rgb888, blit_size, FMT_RGB565, FMT_P4
+from hal.damage import DamageTracker
+from hal.fonts import DEFAULT_FONT, FONTS, GLYPH_CHARS, GLYPH_COUNT, font_metrics, wrap_lines
+from hal.sim.glyph_atlas import load_atlas
+from hal.text_cache import TextCache
 import pygame
 import sys
 
 
-# Font data for bitmap fonts (simple 8x8 monospace)
-class FontRenderer:
-    """Simple font renderer for simulator"""
-    
-    def __init__(self, size=8):
-        self.size = size
-        # Try to load a monospace font
-        try:
-            self.font = pygame.font.SysFont('courier', size)
-        except:
-            self.font = pygame.font.Font(None, size)
-    
-    def get_size(self, text):
-        """Get text size"""
-        return self.font.size(text)
-    
-    def render(self, text, color):
-        """Render text to surface"""
-        return self.font.render(text, True, color)
+# Byte -> 8 palette indices (0/1), used to expand packed 1-bpp bitmaps
+_BIT_EXPAND = [bytes((b >> (7 - i)) & 1 for i in range(8)) for b in range(256)]
+_BIT_INVERT = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+# Translation tables for blit(): each maps one source byte to one output
+# channel, so whole buffers convert with bytes.translate() and slice copies.
+# RGB565 big-endian: hi = RRRRRGGG, lo = GGGBBBBB, expanded like rgb565_to_rgb888()
+_565_R = bytes(rgb565_to_rgb888(hi << 8)[0] for hi in range(256))
+_565_G_HI = bytes(rgb565_to_rgb888((hi & 0x07) << 8)[1] for hi in range(256))
+_565_G_LO = bytes(rgb565_to_rgb888(lo & 0xE0)[1] for lo in range(256))
+_565_B = bytes(rgb565_to_rgb888(lo)[2] for lo in range(256))
+# P4: high nibble = left pixel
+_P4_LEFT = bytes(b >> 4 for b in range(256))
+_P4_RIGHT = bytes(b & 0x0F for b in range(256))
+
+# Events that mean the window has to be repainted from scratch
+_EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, getattr(pygame, "WINDOWEXPOSED", pygame.VIDEOEXPOSE))
 
 
 class DisplaySim(DisplayInterface):
     """Simulated display using pygame"""
     
-    def __init__(self, width=240, height=240, scale=3):
+    def __init__(self, width=240, height=240, scale=3, text_cache_bytes=262144):
         """
         Args:
             width: Display width in pixels
             height: Display height in pixels
             scale: Scaling factor for display window
+            text_cache_bytes: Byte budget for rendered text surfaces
         """
         self._width = width
         self._height = height
         self._scale = scale
         self._current_pen = 15
-        self._current_font = "bitmap8"
+        self._current_font = DEFAULT_FONT
         
         # Initialize pygame
         pygame.init()
@@ -52,18 +55,19 @@ class DisplaySim(DisplayInterface):
         self._framebuffer = pygame.Surface((width, height))
         self._framebuffer.fill((0, 0, 0))
         
-        # Font renderers for different sizes
-        self._fonts = {
-            "bitmap6": FontRenderer(6),
-            "bitmap8": FontRenderer(8),
-            "bitmap14_outline": FontRenderer(14),
-            "sans": FontRenderer(12),
-            "cursive": FontRenderer(12),
-        }
-        self._current_font_renderer = self._fonts["bitmap8"]
+        # Glyph atlases: (font, scale) -> (palettized surface, {char: source rect})
+        self._atlases = {}
+        # Rendered strings: (font, string, pen, scale, width) -> surface
+        self._text_cache = TextCache(text_cache_bytes)
         
         # Color palette (16 colors, similar to GFX Pack)
         self._palette = self._create_palette()
+        
+        # Expanded 1-bpp bitmaps: (rows, w, h, invert) -> palettized surface
+        self._bitmap_cache = {}
+        
+        # Regions drawn since the last update()
+        self._damage = DamageTracker(width, height)
     
     def _create_palette(self):
         """Create a 16-color palette"""
@@ -91,12 +95,14 @@ class DisplaySim(DisplayInterface):
     def init(self):
         """Initialize display"""
         self._framebuffer.fill((0, 0, 0))
+        self._damage.add_all()
         self.update()
     
     def fill(self, color):
         """Fill entire display with color"""
         rgb = self._pen_to_rgb(color)
         self._framebuffer.fill(rgb)
+        self._damage.add_all(("fill", color))
     
     def pixel(self, x, y, color=None):
         """Set a single pixel"""
@@ -105,6 +111,7 @@ class DisplaySim(DisplayInterface):
         if 0 <= x < self._width and 0 <= y < self._height:
             rgb = self._pen_to_rgb(color)
             self._framebuffer.set_at((x, y), rgb)
+            self._damage.add(x, y, 1, 1, ("pixel", x, y, color))
     
     def rect(self, x, y, w, h, color, fill=False):
         """Draw a rectangle"""
@@ -113,6 +120,7 @@ class DisplaySim(DisplayInterface):
             pygame.draw.rect(self._framebuffer, rgb, (x, y, w, h))
         else:
             pygame.draw.rect(self._framebuffer, rgb, (x, y, w, h), 1)
+        self._damage.add(x, y, w, h, ("rect", x, y, w, h, color, fill))
     
     def line(self, x0, y0, x1, y1, color=None):
         """Draw a line"""
@@ -120,42 +128,185 @@ class DisplaySim(DisplayInterface):
             color = self._current_pen
         rgb = self._pen_to_rgb(color)
         pygame.draw.line(self._framebuffer, rgb, (x0, y0), (x1, y1))
+        self._damage.add(min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1,
+                         ("line", x0, y0, x1, y1, color))
     
     def text(self, string, x, y, width=None, scale=1):
-        """Draw text (GFX Pack compatible signature)"""
-        # Use current pen color
-        rgb = self._pen_to_rgb(self._current_pen)
-        text_surface = self._current_font_renderer.render(str(string), rgb)
-        self._framebuffer.blit(text_surface, (x, y))
-    
-    def blit(self, x, y, buf, w, h):
-        """Blit a buffer to screen"""
-        # buf should be a bytes object or list of RGB values
-        if isinstance(buf, (bytes, bytearray)):
-            # Create surface from buffer
-            surface = pygame.Surface((w, h))
-            for py in range(h):
-                for px in range(w):
-                    idx = (py * w + px) * 3
-                    if idx + 2 < len(buf):
-                        color = (buf[idx], buf[idx+1], buf[idx+2])
-                        surface.set_at((px, py), color)
-            self._framebuffer.blit(surface, (x, y))
+        """Draw text (GFX Pack compatible signature)
+        
+        Strings are rendered once from the font's glyph atlas, word-wrapped
+        at `width` pixels like the GFX Pack bitmap fonts, and kept in the
+        text cache so redrawing the same text is a single blit.
+        """
+        if width is None:
+            width = self._width
+        string = str(string)
+        font = self._current_font if self._current_font in FONTS else DEFAULT_FONT
+        key = (font, string, self._current_pen, scale, width)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            surface = self._render_text(font, string, scale, width)
+            surface.set_palette_at(1, self._pen_to_rgb(self._current_pen))
+            self._text_cache.put(key, surface, surface.get_width() * surface.get_height())
+        self._framebuffer.blit(surface, (x, y))
+        self._damage.add(x, y, surface.get_width(), surface.get_height(), ("text", x, y) + key)
+    
+    def _render_text(self, font, string, scale, width):
+        """Compose a string into an 8-bit surface (index 0 transparent)"""
+        _, advance, line_h = font_metrics(font)
+        advance *= scale
+        line_h *= scale
+        atlas, areas = self._atlas(font, scale)
+        if "\n" in string or len(string) * advance > width:
+            lines = wrap_lines(string, width, font, scale)
+        else:
+            lines = (string,)
+        
+        blits = []
+        max_w = 0
+        missing = areas["?"]
+        for n, line in enumerate(lines):
+            cy = n * line_h
+            blits += [(atlas, (i * advance, cy), areas.get(ch, missing))
+                      for i, ch in enumerate(line) if ch != " "]
+            max_w = max(max_w, len(line) * advance)
+        
+        # Same two-color palette as the atlas, so glyph indices copy as-is
+        # bitmap6 glyphs are taller than its line height, keep the last row
+        h = (len(lines) - 1) * line_h + max(line_h, missing.height)
+        surface = pygame.Surface((max_w, h), 0, 8)
+        surface.set_palette([(0, 0, 0), (255, 255, 255)])
+        surface.fill(0)
+        surface.blits(blits, False)
+        surface.set_colorkey(0)
+        return surface
+    
+    def _atlas(self, font, scale):
+        """Atlas surface for a font at a text scale, built on first use"""
+        key = (font, scale)
+        entry = self._atlases.get(key)
+        if entry is None:
+            rows, w, h = load_atlas(font)
+            surface = self._bitmap_surface(rows, w, h, False)
+            if scale != 1:
+                surface = pygame.transform.scale(surface, (w * scale, h * scale))
+                surface.set_colorkey(0)
+            gw = (w // GLYPH_COUNT) * scale
+            areas = {}
+            for i in range(GLYPH_COUNT):
+                areas[GLYPH_CHARS[i]] = pygame.Rect(i * gw, 0, gw, h * scale)
+            entry = (surface, areas)
+            self._atlases[key] = entry
+        return entry
+    
+    def blit(self, x, y, buf, w, h, fmt="RGB888"):
+        """Blit a buffer to screen
+        
+        buf may be bytes, bytearray or memoryview in RGB888, RGB565
+        (big-endian) or P4 (4-bit palette index) format, see hal.color.
+        Pixels are converted a whole buffer at a time, never one by one.
+        """
+        if not isinstance(buf, (bytes, bytearray, memoryview)):
+            return
+        buf = memoryview(buf).cast("B")[:blit_size(fmt, w, h)]
+        if len(buf) < blit_size(fmt, w, h):
+            return
+        if fmt == FMT_RGB565:
+            surface = self._surface_from_rgb565(buf, w, h)
+        elif fmt == FMT_P4:
+            surface = self._surface_from_p4(buf, w, h)
+        else:
+            surface = pygame.image.frombuffer(buf, (w, h), "RGB")
+        self._framebuffer.blit(surface, (x, y))
+        self._damage.add(x, y, w, h, ("blit", x, y, w, h, fmt, bytes(buf)))
+    
+    def _surface_from_rgb565(self, buf, w, h):
+        """24-bit surface from big-endian RGB565 pixels"""
+        hi = bytes(buf[0::2])
+        lo = bytes(buf[1::2])
+        n = w * h
+        # Green is split across both bytes; the two halves use disjoint bits
+        g = (int.from_bytes(hi.translate(_565_G_HI), "big") |
+             int.from_bytes(lo.translate(_565_G_LO), "big")).to_bytes(n, "big")
+        rgb = bytearray(n * 3)
+        rgb[0::3] = hi.translate(_565_R)
+        rgb[1::3] = g
+        rgb[2::3] = lo.translate(_565_B)
+        return pygame.image.frombuffer(rgb, (w, h), "RGB")
+    
+    def _surface_from_p4(self, buf, w, h):
+        """8-bit palettized surface from packed 4-bit indices"""
+        packed = bytes(buf)
+        stride = (w + 1) // 2
+        data = bytearray(len(packed) * 2)
+        data[0::2] = packed.translate(_P4_LEFT)
+        data[1::2] = packed.translate(_P4_RIGHT)
+        if w & 1:
+            # Drop the padding nibble at the end of every row
+            data = b"".join(data[r * stride * 2:r * stride * 2 + w] for r in range(h))
+        surface = pygame.image.frombytes(bytes(data), (w, h), "P")
+        surface.set_palette(self._palette)
+        return surface
+    
+    def blit_bitmap(self, x, y, rows, w, h, invert=False):
+        """Draw a packed 1-bpp bitmap with the current pen"""
+        key = (bytes(rows), w, h, invert)
+        surface = self._bitmap_cache.get(key)
+        if surface is None:
+            surface = self._bitmap_surface(key[0], w, h, invert)
+            if len(self._bitmap_cache) >= 64:
+                self._bitmap_cache.clear()
+            self._bitmap_cache[key] = surface
+        surface.set_palette_at(1, self._pen_to_rgb(self._current_pen))
+        self._framebuffer.blit(surface, (x, y))
+        self._damage.add(x, y, w, h, ("bitmap", x, y) + key + (self._current_pen,))
+    
+    def _bitmap_surface(self, rows, w, h, invert):
+        """Expand a packed bitmap into an 8-bit surface (index 0 transparent)"""
+        stride = (w + 7) // 8
+        data = b"".join(
+            b"".join(_BIT_EXPAND[b] for b in rows[r * stride:(r + 1) * stride])[:w]
+            for r in range(h)
+        )
+        if invert:
+            data = data.translate(_BIT_INVERT)
+        surface = pygame.image.frombytes(data, (w, h), "P")
+        surface.set_palette([(0, 0, 0), (255, 255, 255)])
+        surface.set_colorkey(0)
+        return surface
     
     def update(self):
-        """Update display window"""
-        # Scale framebuffer to window
-        scaled = pygame.transform.scale(self._framebuffer, 
-                                       (self._width * self._scale, 
-                                        self._height * self._scale))
-        self._window.blit(scaled, (0, 0))
-        pygame.display.flip()
+        """Update display window (only the regions drawn since last update)
         
-        # Process pygame events to keep window responsive
-        for event in pygame.event.get():
+        Frames identical to the last pushed one are not scaled or flipped.
+        """
+        # Process pygame events to keep window responsive (key presses
+        # are left in the queue for InputSim)
+        for event in pygame.event.get(exclude=pygame.KEYDOWN):
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit(0)
+            elif event.type in _EXPOSE_EVENTS:
+                # Window contents were lost, repaint everything in this push
+                self._damage.add_all()
+        
+        scale = self._scale
+        dirty = []
+        for x, y, w, h in self._damage.take():
+            dest = pygame.Rect(x * scale, y * scale, w * scale, h * scale)
+            region = self._framebuffer.subsurface((x, y, w, h))
+            self._window.blit(pygame.transform.scale(region, dest.size), dest)
+            dirty.append(dest)
+        if dirty:
+            pygame.display.update(dirty)
+    
+    def damage_stats(self):
+        """Damaged-region statistics (see DamageTracker.stats)"""
+        return self._damage.stats()
+    
+    def text_cache_stats(self):
+        """Rendered-text cache statistics (see TextCache.stats)"""
+        return self._text_cache.stats()
     
     # Compatibility methods
     def set_pen(self, color):
@@ -166,22 +317,23 @@ class DisplaySim(DisplayInterface):
         """Clear display"""
         rgb = self._pen_to_rgb(self._current_pen)
         self._framebuffer.fill(rgb)
+        self._damage.add_all(("fill", self._current_pen))
     
     def rectangle(self, x, y, w, h):
         """Draw filled rectangle with current pen"""
         rgb = self._pen_to_rgb(self._current_pen)
         pygame.draw.rect(self._framebuffer, rgb, (x, y, w, h))
+        self._damage.add(x, y, w, h, ("rectangle", x, y, w, h, self._current_pen))
     
     def circle(self, cx, cy, r):
         """Draw filled circle with current pen"""
         rgb = self._pen_to_rgb(self._current_pen)
         pygame.draw.circle(self._framebuffer, rgb, (cx, cy), r)
+        self._damage.add(cx - r, cy - r, 2 * r + 1, 2 * r + 1, ("circle", cx, cy, r, self._current_pen))
     
     def set_font(self, font):
         """Set font"""
         self._current_font = font
-        if font in self._fonts:
-            self._current_font_renderer = self._fonts[font]
     
     def get_bounds(self):
         """Get display bounds"""
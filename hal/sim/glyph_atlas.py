@@ -0,0 +1,71 @@
+# On-disk cache of the pre-rasterized glyph atlases used by DisplaySim.text()
+#
+# Each font is stored as one packed 1-bpp strip (see hal.fonts.atlas_bitmap).
+# The file header records the glyph table checksum, so editing a glyph in
+# hal/fonts.py rebuilds the cache automatically.
+
+from hal.fonts import FONTS, DEFAULT_FONT, atlas_bitmap, glyph_data_id
+import os
+import struct
+
+# Override with GLYPH_CACHE_DIR, defaults to ~/.cache/lcd-gfx
+CACHE_DIR = os.environ.get("GLYPH_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "lcd-gfx")
+
+_MAGIC = b"GLYA"
+_VERSION = 1
+_HEADER = ">4sBIHH"  # magic, version, glyph table checksum, w, h
+_HEADER_SIZE = struct.calcsize(_HEADER)
+
+
+def _cache_path(font):
+    return os.path.join(CACHE_DIR, "atlas-{}.bin".format(font))
+
+
+def _read(font, data_id):
+    try:
+        with open(_cache_path(font), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < _HEADER_SIZE:
+        return None
+    magic, version, file_id, w, h = struct.unpack(_HEADER, data[:_HEADER_SIZE])
+    rows = data[_HEADER_SIZE:]
+    if magic != _MAGIC or version != _VERSION or file_id != data_id:
+        return None
+    if len(rows) != ((w + 7) // 8) * h:
+        return None
+    return rows, w, h
+
+
+def _write(font, data_id, rows, w, h):
+    try:
+        if not os.path.isdir(CACHE_DIR):
+            os.makedirs(CACHE_DIR)
+        tmp = _cache_path(font) + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(struct.pack(_HEADER, _MAGIC, _VERSION, data_id, w, h))
+            f.write(rows)
+        os.replace(tmp, _cache_path(font))
+    except OSError:
+        # Read-only home or similar: the atlas is simply rebuilt next time
+        pass
+
+
+def load_atlas(font):
+    """Glyph atlas for a font, from the disk cache or freshly built
+
+    Unknown fonts (e.g. "sans") fall back to the default bitmap font.
+
+    Returns:
+        (rows, w, h) packed 1-bpp strip, glyph i at x = i * w // GLYPH_COUNT
+    """
+    if font not in FONTS:
+        font = DEFAULT_FONT
+    data_id = glyph_data_id()
+    atlas = _read(font, data_id)
+    if atlas is None:
+        atlas = atlas_bitmap(font)
+        _write(font, data_id, *atlas)
+    return atlas
@@ -2,6 +2,7 @@
 
 from hal.interfaces import InputInterface
 import pygame
+import time
 
 
 # Key mapping from PC keyboard to CardKB codes
@@ -57,6 +58,13 @@ KEY_MAP = {
     pygame.K_EQUALS: ord('='),
 }
 
+# Non-key events that wake wait(): the display handles them on update()
+_WAKE_EVENTS = (
+    pygame.QUIT,
+    pygame.VIDEOEXPOSE,
+    getattr(pygame, "WINDOWEXPOSED", pygame.VIDEOEXPOSE),
+)
+
 
 class InputSim(InputInterface):
     """Simulated input using pygame keyboard"""
@@ -65,25 +73,55 @@ class InputSim(InputInterface):
         self._key_buffer = []
         self._last_key = None
     
+    def _on_keydown(self, event):
+        """Buffer a KEYDOWN event as a CardKB code, returns it (or None)"""
+        if event.key not in KEY_MAP:
+            return None
+        key_code = KEY_MAP[event.key]
+        
+        # Handle shift modifier for uppercase
+        if event.mod & pygame.KMOD_SHIFT:
+            if ord('a') <= key_code <= ord('z'):
+                key_code = key_code - 32  # Convert to uppercase
+        
+        self._key_buffer.append(key_code)
+        return key_code
+    
     def poll(self):
         """Poll for input events"""
         events = []
         
         # Process pygame events
         for event in pygame.event.get(pygame.KEYDOWN):
-            if event.key in KEY_MAP:
-                key_code = KEY_MAP[event.key]
-                
-                # Handle shift modifier for uppercase
-                if event.mod & pygame.KMOD_SHIFT:
-                    if ord('a') <= key_code <= ord('z'):
-                        key_code = key_code - 32  # Convert to uppercase
-                
-                self._key_buffer.append(key_code)
+            key_code = self._on_keydown(event)
+            if key_code is not None:
                 events.append({'type': 'keydown', 'key': key_code})
         
         return events
     
+    def wait(self, timeout_ms):
+        """Sleep in pygame.event.wait() until a key or window event arrives
+        
+        Mouse motion and other events the simulator does not use are
+        dropped so they do not wake the main loop. Quit and expose events
+        are put back in the queue for DisplaySim.update().
+        """
+        if self._key_buffer:
+            return True
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        while True:
+            left = int((deadline - time.monotonic()) * 1000)
+            # wait(0) only looks at the events already queued
+            event = pygame.event.wait(left) if left > 0 else pygame.event.poll()
+            if event.type == pygame.NOEVENT:
+                return False
+            if event.type == pygame.KEYDOWN:
+                if self._on_keydown(event) is not None:
+                    return True
+            elif event.type in _WAKE_EVENTS:
+                pygame.event.post(event)
+                return True
+    
     def read_key(self):
         """Read a single key (CardKB style)"""
         # Poll for new keys
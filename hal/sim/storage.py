@@ -27,7 +27,30 @@ class StorageSim(StorageInterface):
         return os.path.exists(path)
     
     def remove(self, path):
-        """Remove a file"""
+        """Remove a file (nothing if it does not exist)"""
         if os.path.exists(path):
             os.remove(path)
-
+    
+    def open(self, path, mode="rb"):
+        """File object for streaming"""
+        return open(path, mode)
+    
+    def rename(self, src, dst):
+        """Move src to dst, atomically replacing an existing dst"""
+        os.replace(src, dst)
+    
+    def listdir(self, path):
+        """Names of the entries of a directory"""
+        return os.listdir(path)
+    
+    def mkdir(self, path):
+        """Create a directory (nothing if it exists)"""
+        if not os.path.isdir(path):
+            os.makedirs(path)
+    
+    def size(self, path):
+        """File size in bytes, 0 if it does not exist"""
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
@@ -0,0 +1,84 @@
+# Bounded LRU cache for rendered text, shared by the display backends
+
+
+class TextCache:
+    """Least-recently-used cache with a byte budget
+
+    Backends store whatever a text() call produced (a surface, a list of
+    spans, a measured width) together with its approximate size in bytes.
+    Oldest entries are evicted once the total goes over the budget.
+    Keys are usually (font, string, pen, scale, width).
+    """
+
+    def __init__(self, budget=16384):
+        """
+        Args:
+            budget: Maximum total size of the cached entries, in bytes
+        """
+        self.budget = budget
+        self._entries = {}  # key -> [value, size, last use]
+        self._bytes = 0
+        self._clock = 0
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Cached value for key, or None (counts a hit or a miss)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._clock += 1
+        entry[2] = self._clock
+        return entry[0]
+
+    def put(self, key, value, size):
+        """Store a value, evicting least recently used entries to fit"""
+        if size > self.budget:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        while self._bytes + size > self.budget:
+            self._evict()
+        self._clock += 1
+        self._entries[key] = [value, size, self._clock]
+        self._bytes += size
+
+    def _evict(self):
+        # Linear scan for the oldest entry: caches are small and this keeps
+        # working on MicroPython, where dicts do not keep insertion order
+        oldest = None
+        oldest_use = 0
+        for key, entry in self._entries.items():
+            if oldest is None or entry[2] < oldest_use:
+                oldest = key
+                oldest_use = entry[2]
+        self._bytes -= self._entries.pop(oldest)[1]
+        self.evictions += 1
+
+    def resize(self, budget):
+        """Change the byte budget, evicting entries if it shrank"""
+        self.budget = budget
+        while self._bytes > budget:
+            self._evict()
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        self._entries = {}
+        self._bytes = 0
+
+    def stats(self):
+        """Cache statistics since the display was created"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "budget": self.budget,
+        }
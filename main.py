@@ -3,9 +3,9 @@
 
 from core import Context
 from apps import (
-    AppManager, IconMenu,
+    AsyncAppManager, IconMenu,
     ClockApp, SettingsApp, CalculatorApp, CalendarApp,
-    ContactsApp, MemosApp, GamesApp, MoonPhaseApp, TodoApp
+    ContactsApp, MemosApp, GamesApp, MoonPhaseApp, TodoApp, SearchApp
 )
 from secrets import secrets
 
@@ -24,29 +24,30 @@ def make_menu(ctx):
         {"name": "Calc", "app": CalculatorApp()},
         {"name": "Memos", "app": MemosApp()},
         {"name": "Tel", "app": ContactsApp()},
+        {"name": "Find", "app": SearchApp()},
         {"name": "Games", "app": GamesApp()},
         {"name": "Config", "app": SettingsApp()},
     ]
     return IconMenu(entries)
 
-def init_wifi(ctx):
+async def init_wifi(ctx):
+    """Connect and sync the clock in the background, the UI stays usable"""
     if ctx.settings.get("wifi_auto_connect", True) and ctx.wifi.is_available() and SSID:
         print("Auto-connecting to WiFi...")
-        if ctx.wifi.connect(SSID, PWD):
+        if await ctx.wifi.connect_async(SSID, PWD):
             print("WiFi connected successfully!")
             
             if ctx.settings.get("ntp_auto_sync", True):
                 print("Auto-syncing time from NTP...")
-                ctx.ntp.sync_time()
+                await ctx.ntp.sync_time_async()
         else:
             print("WiFi auto-connect failed")
 
 def main():
     ctx = Context()
     
-    init_wifi(ctx)
-    
-    manager = AppManager(ctx, make_menu(ctx))
+    manager = AsyncAppManager(ctx, make_menu(ctx))
+    manager.spawn(init_wifi(ctx))
     manager.run()
 
 